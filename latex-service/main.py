@@ -1,39 +1,350 @@
-import subprocess
+import asyncio
+import hashlib
+import os
+import re
+import shutil
 import tempfile
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import Response
 from pydantic import BaseModel
 
-app = FastAPI(title="Tectonic LaTeX Service")
+# Admission control: at most COMPILE_CONCURRENCY Tectonic processes run at
+# once and COMPILE_QUEUE_DEPTH more wait; anything beyond is refused with a
+# fast 503 instead of spawning processes until the container OOMs.
+#
+# A request waits at most COMPILE_QUEUE_TIMEOUT for a worker (then 503) and
+# its Tectonic runs get COMPILE_TIMEOUT between them, so the sum must stay
+# under the backend's client timeout (310 s, services/http_clients.py) —
+# otherwise the backend gives up on compiles the sidecar still runs.
+COMPILE_CONCURRENCY = int(os.getenv("COMPILE_CONCURRENCY", "2"))
+COMPILE_QUEUE_DEPTH = int(os.getenv("COMPILE_QUEUE_DEPTH", "8"))
+COMPILE_QUEUE_TIMEOUT = float(os.getenv("COMPILE_QUEUE_TIMEOUT", "5"))
+COMPILE_TIMEOUT = float(os.getenv("COMPILE_TIMEOUT", "300"))
+
+# Preamble formats: most compiles reuse one of a handful of preambles (the
+# shipped templates, md_to_latex's article preamble). Once one of those has
+# compiled FORMAT_BUILD_AFTER times it is dumped into a TeX format file, and
+# later compiles load that format and typeset only from \begin{document} on.
+# Any failure of the format path falls back to a full compile.
+#
+# Only preambles in FORMAT_PREAMBLES get a format: a user's own preamble
+# would otherwise take a slot (and a .fmt on disk) for one person's
+# documents. Lines that carry the resume owner's details (moderncv's \name,
+# \email, \phone, ...) are left out of the key and the format, and replayed
+# ahead of the body on a warm compile — so every moderncv resume shares one
+# format and no format holds personal data.
+FORMAT_DIR = Path(
+    os.getenv("FORMAT_CACHE_DIR", Path(tempfile.gettempdir()) / "latex-formats")
+)
+FORMAT_CACHE_ENTRIES = int(os.getenv("FORMAT_CACHE_ENTRIES", "16"))
+FORMAT_BUILD_AFTER = int(os.getenv("FORMAT_BUILD_AFTER", "2"))
+_SIGHTINGS_MAX = 256
+_UNSUPPORTED = -1
+
+_BEGIN_DOCUMENT = "\\begin{document}"
+_COMMENT_LINE_RE = re.compile(r"^[ \t]*%.*\n?", re.MULTILINE)
+_PERSONAL_LINE_RE = re.compile(
+    r"\\(?:name|firstname|familyname|title|author|date|address|phone|mobile"
+    r"|email|homepage|social|photo|quote|extrainfo|born)\b"
+)
+
+# _split_preamble keys of the templates/ preambles and md_to_latex's.
+# resume_generator_backend/tests/test_latex_formats.py recomputes them, so a
+# template edit that changes its preamble fails there until this is updated.
+FORMAT_PREAMBLES = frozenset(
+    {
+        "8c8c7666a37b8a12b614058369c88e99",  # md_to_latex article
+        "bc664f4722d7e3d65fe983bfbbebb47c",  # altacv-style
+        "bfc3984baad31d94279c736db8515072",  # awesome-style
+        "3095e65f070c58189739d50bfa0d66c2",  # deedy-style
+        "a2e554daa05c478ad08973a7f98a84aa",  # friggeri-style
+        "d52dec2d854b18f78f939ffaa03f8542",  # moderncv-classic
+    }
+)
+
+# Kernel load with \dump disabled, then the preamble, then the real \dump —
+# the same trick as the mylatexformat package.
+_FORMAT_SOURCE = """\\let\\resumelibredump\\dump
+\\let\\dump\\relax
+\\input tectonic-format-latex.tex
+\\let\\dump\\resumelibredump
+{preamble}
+\\dump
+"""
+
+_queue: asyncio.Queue | None = None
+_admitted = 0  # queued + running
+_running = 0
+_formats: OrderedDict[str, Path] = OrderedDict()  # preamble key -> .fmt, LRU
+_sightings: OrderedDict[str, int] = OrderedDict()  # preamble key -> compiles
+_rebuilt: set[str] = set()  # keys whose format failed once and was rebuilt
+_building: set[str] = set()  # keys with a format build in progress
 
 
 class CompileRequest(BaseModel):
     latex: str
 
 
-@app.post("/compile")
-def compile(req: CompileRequest) -> Response:
+def _split_preamble(latex: str) -> tuple[str, str, str] | None:
+    """(key, preamble, body) — body is the personal lines, then everything
+    from \\begin{document} on: what a warm compile typesets."""
+    idx = latex.find(_BEGIN_DOCUMENT)
+    if idx < 0:
+        return None
+    # Full-line comments and trailing whitespace never change the output, so
+    # they don't split one template into many formats.
+    lines = _COMMENT_LINE_RE.sub("", latex[:idx]).splitlines()
+    lines = [line.rstrip() for line in lines if line.strip()]
+    personal = [line for line in lines if _PERSONAL_LINE_RE.match(line.lstrip())]
+    preamble = "\n".join(line for line in lines if line not in personal)
+    key = hashlib.sha256(preamble.encode("utf-8")).hexdigest()[:32]
+    return key, preamble, "".join(line + "\n" for line in personal) + latex[idx:]
+
+
+async def _run_tectonic(
+    args: list[str], cwd: str, timeout: float = COMPILE_TIMEOUT
+) -> str:
+    """Run Tectonic to completion or `timeout`; returns stderr."""
+    proc = await asyncio.create_subprocess_exec(
+        "tectonic",
+        *args,
+        cwd=cwd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return f"Compilation timed out after {COMPILE_TIMEOUT:g}s"
+    return stderr.decode("utf-8", "replace")
+
+
+async def _tectonic(
+    latex: str, fmt: Path | None = None, timeout: float = COMPILE_TIMEOUT
+) -> tuple[bytes | None, str]:
+    """Compile one document; returns (pdf or None, stderr)."""
     with tempfile.TemporaryDirectory() as tmpdir:
         tex_path = Path(tmpdir) / "resume.tex"
-        tex_path.write_text(req.latex, encoding="utf-8")
-
-        result = subprocess.run(
-            ["tectonic", str(tex_path), "--outdir", tmpdir],
-            capture_output=True,
-            text=True,
-            timeout=300,
-            check=False,  # non-zero exit handled via pdf-exists check below
-        )
+        tex_path.write_text(latex, encoding="utf-8")
+
+        args = [str(tex_path), "--outdir", tmpdir]
+        if fmt is not None:
+            # Tectonic resolves --format names against the input directory.
+            # A hard link keeps the file alive if the format is evicted
+            # mid-compile; a FORMAT_CACHE_DIR on another filesystem gets a
+            # symlink instead.
+            link = Path(tmpdir) / fmt.name
+            try:
+                os.link(fmt, link)
+            except FileNotFoundError:
+                return None, "format evicted"
+            except OSError:
+                link.symlink_to(fmt)
+            args += ["--format", fmt.name]
+        stderr = await _run_tectonic(args, tmpdir, timeout=timeout)
 
+        # non-zero exit handled via pdf-exists check
         pdf_path = Path(tmpdir) / "resume.pdf"
         if not pdf_path.exists():
-            raise HTTPException(status_code=500, detail=result.stderr or "Compilation failed")
+            return None, stderr
+        return pdf_path.read_bytes(), ""
+
+
+async def _compile(latex: str) -> tuple[bytes | None, str, str, tuple | None]:
+    """Typeset from a cached preamble format when there is one.
+
+    Returns (pdf, stderr, "warm" | "cold", split) where split is the
+    (key, preamble, body) triple when this preamble is now due a format.
+    """
+    split = _split_preamble(latex)
+    if split is None or split[0] not in FORMAT_PREAMBLES:
+        pdf, stderr = await _tectonic(latex)
+        return pdf, stderr, "cold", None
+
+    key, _, body = split
+    fmt = _formats.get(key)
+    if fmt is not None:
+        # The fallback full compile only gets what the warm one left of
+        # COMPILE_TIMEOUT: together they are one request's compile time.
+        deadline = time.monotonic() + COMPILE_TIMEOUT
+        _formats.move_to_end(key)
+        pdf, stderr = await _tectonic(body, fmt)
+        if pdf is not None:
+            _rebuilt.discard(key)
+            return pdf, "", "warm", None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None, stderr, "warm", None
+        pdf, stderr = await _tectonic(latex, timeout=remaining)
+    else:
+        pdf, stderr = await _tectonic(latex)
+    if pdf is None:
+        return None, stderr, "cold", None
+    if fmt is not None and key in _formats:
+        # The full document compiles but the format path doesn't. Rebuild
+        # the format once (the file may be damaged or stale); if the rebuilt
+        # one fails too, the format is at fault for this preamble. Only
+        # then, or when the build itself fails, is it marked unsupported.
+        _drop_format(key)
+        if key in _rebuilt:
+            _sightings[key] = _UNSUPPORTED
+            return pdf, "", "cold", None
+        _rebuilt.add(key)
+        return pdf, "", "cold", split
+
+    seen = _sightings.pop(key, 0)
+    if seen != _UNSUPPORTED:
+        seen += 1
+    _sightings[key] = seen
+    while len(_sightings) > _SIGHTINGS_MAX:
+        _sightings.popitem(last=False)
+    # >=, not ==: a format evicted from the LRU is rebuilt on the next
+    # cold compile instead of never again.
+    due = seen >= FORMAT_BUILD_AFTER and key not in _formats and key not in _building
+    return pdf, "", "cold", split if due else None
+
+
+async def _build_format(key: str, preamble: str) -> None:
+    """Dump `preamble` into FORMAT_DIR/<key>.fmt; marks it unsupported on failure."""
+    if key in _building:
+        return
+    _building.add(key)
+    try:
+        await _dump_format(key, preamble)
+    finally:
+        _building.discard(key)
 
-        return Response(pdf_path.read_bytes(), media_type="application/pdf")
+
+async def _dump_format(key: str, preamble: str) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = Path(tmpdir) / f"{key}.tex"
+        src.write_text(_FORMAT_SOURCE.format(preamble=preamble), encoding="utf-8")
+        await _run_tectonic([str(src), "--outfmt", "fmt", "--outdir", tmpdir], tmpdir)
+        built = Path(tmpdir) / f"{key}.fmt"
+        if not built.exists():
+            _sightings[key] = _UNSUPPORTED
+            return
+        FORMAT_DIR.mkdir(parents=True, exist_ok=True)
+        dest = FORMAT_DIR / built.name
+        shutil.move(built, dest)
+
+    _formats[key] = dest
+    while len(_formats) > FORMAT_CACHE_ENTRIES:
+        evicted, _ = _formats.popitem(last=False)
+        _drop_format(evicted)
+
+
+def _drop_format(key: str) -> None:
+    _formats.pop(key, None)
+    (FORMAT_DIR / f"{key}.fmt").unlink(missing_ok=True)
+
+
+async def _worker(queue: asyncio.Queue) -> None:
+    global _running
+    while True:
+        latex, dequeued, future, enqueued = await queue.get()
+        try:
+            if future.cancelled():  # client gave up, or waited too long
+                continue
+            dequeued.set_result(None)
+            started = time.monotonic()
+            _running += 1
+            try:
+                pdf, stderr, mode, due = await _compile(latex)
+                if not future.cancelled():
+                    future.set_result((pdf, stderr, mode, started - enqueued, started))
+                if due is not None:
+                    # After answering, but still holding this worker's slot.
+                    key, preamble, _ = due
+                    await _build_format(key, preamble)
+            finally:
+                _running -= 1
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        finally:
+            queue.task_done()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _queue
+    # Formats left by a previous run may come from another Tectonic bundle.
+    shutil.rmtree(FORMAT_DIR, ignore_errors=True)
+    _queue = asyncio.Queue()
+    workers = [asyncio.create_task(_worker(_queue)) for _ in range(COMPILE_CONCURRENCY)]
+    yield
+    for worker in workers:
+        worker.cancel()
+
+
+app = FastAPI(title="Tectonic LaTeX Service", lifespan=lifespan)
+
+
+def _timing_headers(wait_s: float, compile_s: float, mode: str) -> dict:
+    return {
+        "X-Queue-Wait-ms": str(int(wait_s * 1000)),
+        "X-Compile-ms": str(int(compile_s * 1000)),
+        "X-Format": mode,
+    }
+
+
+@app.post("/compile")
+async def compile(req: CompileRequest) -> Response:
+    global _admitted
+    if _admitted >= COMPILE_CONCURRENCY + COMPILE_QUEUE_DEPTH:
+        raise HTTPException(
+            status_code=503,
+            detail="Compile queue is full — try again shortly",
+            headers={"Retry-After": "5"},
+        )
+
+    loop = asyncio.get_running_loop()
+    dequeued, future = loop.create_future(), loop.create_future()
+    _admitted += 1
+    try:
+        _queue.put_nowait((req.latex, dequeued, future, time.monotonic()))
+        try:
+            await asyncio.wait_for(asyncio.shield(dequeued), COMPILE_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            if not dequeued.done():
+                future.cancel()  # the worker skips it
+                raise HTTPException(
+                    status_code=503,
+                    detail="Compile queue wait exceeded — try again shortly",
+                    headers={"Retry-After": "5"},
+                ) from None
+        except asyncio.CancelledError:
+            future.cancel()  # client gave up while queued
+            raise
+        pdf, stderr, mode, wait_s, started = await future
+    finally:
+        _admitted -= 1
+    headers = _timing_headers(wait_s, time.monotonic() - started, mode)
+    if pdf is None:
+        raise HTTPException(
+            status_code=500,
+            detail=stderr or "Compilation failed",
+            headers=headers,
+        )
+    return Response(pdf, media_type="application/pdf", headers=headers)
 
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "running": _running,
+        "queued": _admitted - _running,
+        "concurrency": COMPILE_CONCURRENCY,
+        "queue_depth": COMPILE_QUEUE_DEPTH,
+        "queue_timeout_s": COMPILE_QUEUE_TIMEOUT,
+        "formats": len(_formats),
+    }
@@ -161,6 +161,8 @@ export default function ResumeEditor({ user }) {
           resume_text: resumeText,
           job_description: jobDescription || null,
           target_role: jobDescription ? null : targetRole || null,
+          // Keyword matching is local; this asks for advice on the gaps
+          suggestions: Boolean(jobDescription),
         }),
       })
       if (!resp.ok) {
@@ -0,0 +1,176 @@
+"""Bulk ATS audits: many uploads, one streamed NDJSON response.
+
+Career-center partners check thousands of resumes at once. A batch is a
+multipart of files, ZIP archives of them, or both; each document goes
+through the same cached analysis as /ats/check, at most
+ATS_POOL_WORKERS at a time so a batch never holds more than its share of
+the worker pool. Records are streamed in completion order:
+
+    {"index": 0, "filename": "a.pdf", "report": {...}}
+    {"index": 1, "filename": "b.pdf", "error": {"status": 400, "detail": "..."}}
+    ...
+    {"aggregate": {"files", "reported", "errors", "checks": {id: {status: n}}}}
+
+A file that fails (bad type, corrupt, over its CPU budget) yields an error
+record; the rest of the batch carries on. Nothing is read up front: the
+request body (capped at ATS_BATCH_MAX_BYTES by core.uploads) stays in
+Starlette's spooled temp files, and each document — top-level file or
+ZIP member — is read inside run()'s semaphore, so at most
+ATS_POOL_WORKERS documents are in memory at once. A file or member over
+MAX_FILE_BYTES is refused unread, and so is a ZIP over the batch
+ceiling.
+"""
+
+import asyncio
+import io
+import os
+import zipfile
+from collections import Counter, defaultdict
+
+from fastapi import HTTPException
+
+from ats import battery, input_handler
+from ats.thresholds import MAX_FILE_BYTES
+from core.uploads import BATCH_MAX_BYTES, BATCH_TOO_LARGE
+
+MAX_FILES = int(os.getenv("ATS_BATCH_MAX_FILES", "500"))
+BUSY_RETRIES = 5
+
+
+def _member_loader(archive, info):
+    def load():
+        if info.file_size > MAX_FILE_BYTES:
+            raise HTTPException(status_code=413, detail=input_handler.FILE_TOO_LARGE)
+        return archive.read(info)
+
+    return load
+
+
+def _file_loader(file):
+    def load():
+        file.seek(0)
+        data = file.read(MAX_FILE_BYTES + 1)
+        if len(data) > MAX_FILE_BYTES:
+            raise HTTPException(status_code=413, detail=input_handler.FILE_TOO_LARGE)
+        return data
+
+    return load
+
+
+def _size(file):
+    file.seek(0, io.SEEK_END)
+    size = file.tell()
+    file.seek(0)
+    return size
+
+
+def documents(uploads):
+    """(filename, loader) per document in the batch, ZIPs expanded.
+
+    `uploads` is [(filename, binary file)]; the files must stay open until
+    run() finishes. Raises 413 past MAX_FILES documents or for a ZIP over
+    BATCH_MAX_BYTES, and 400 for an unreadable ZIP.
+    """
+    entries = []
+    for filename, file in uploads:
+        if not (filename or "").lower().endswith(".zip"):
+            entries.append((filename, _file_loader(file)))
+            continue
+        if _size(file) > BATCH_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=BATCH_TOO_LARGE)
+        try:
+            archive = zipfile.ZipFile(file)
+        except zipfile.BadZipFile:
+            raise HTTPException(
+                status_code=400, detail=f"{filename} is not a readable ZIP archive."
+            )
+        for info in archive.infolist():
+            name = info.filename.rsplit("/", 1)[-1]
+            if info.is_dir() or info.filename.startswith("__MACOSX/") or not name:
+                continue
+            entries.append((name, _member_loader(archive, info)))
+        if len(entries) > MAX_FILES:
+            break
+    if len(entries) > MAX_FILES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many documents — a batch holds at most {MAX_FILES}.",
+        )
+    return entries
+
+
+class Aggregate:
+    """Per-check status counts across a batch."""
+
+    def __init__(self):
+        self.files = 0
+        self.errors = 0
+        self.checks = defaultdict(Counter)
+
+    def add(self, record):
+        self.files += 1
+        if "error" in record:
+            self.errors += 1
+            return
+        for check in record["report"]["checks"]:
+            self.checks[check["id"]][check["status"]] += 1
+
+    def to_dict(self):
+        return {
+            "files": self.files,
+            "reported": self.files - self.errors,
+            "errors": self.errors,
+            "checks": {
+                check_id: dict(counts) for check_id, counts in self.checks.items()
+            },
+        }
+
+
+async def _record(index, filename, load, analysis_fn, selected):
+    try:
+        data = load()
+        kind = input_handler.validate_upload(filename, data)
+        for attempt in range(BUSY_RETRIES + 1):
+            try:
+                analysis = await analysis_fn(data, kind, selected)
+                break
+            except HTTPException as e:
+                # The pool is shared with interactive users: wait out a
+                # full queue rather than failing the file.
+                if e.status_code != 503 or attempt == BUSY_RETRIES:
+                    raise
+                await asyncio.sleep(float(e.headers.get("Retry-After", "1")))
+        report = battery.build_check_report(filename, analysis, selected)
+        return {"index": index, "filename": filename, "report": report}
+    except HTTPException as e:
+        error = {"status": e.status_code, "detail": e.detail}
+    except Exception:
+        error = {"status": 400, "detail": "Could not read this file."}
+    return {"index": index, "filename": filename, "error": error}
+
+
+async def run(entries, analysis_fn, selected, concurrency):
+    """Yield one record per entry as each finishes, then the aggregate.
+
+    `analysis_fn(data, kind, selected)` is the router's cached analysis.
+    """
+    gate = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(index, filename, load):
+        async with gate:
+            return await _record(index, filename, load, analysis_fn, selected)
+
+    tasks = [
+        asyncio.create_task(one(index, filename, load))
+        for index, (filename, load) in enumerate(entries)
+    ]
+    aggregate = Aggregate()
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            record = await next_done
+            aggregate.add(record)
+            yield record
+        yield {"aggregate": aggregate.to_dict()}
+    finally:
+        for task in tasks:
+            task.cancel()
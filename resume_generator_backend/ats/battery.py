@@ -0,0 +1,150 @@
+"""The /ats/check battery as plain functions of (filename, bytes).
+
+Everything here is synchronous, CPU-bound and free of request state, so
+ats.pool can run it in a worker process: arguments and results are
+bytes, strings and plain dicts. Parse failures propagate as ordinary
+exceptions; the router turns them into a 400. Which checks exist, what
+they read and what they cost is declared in ats.registry.
+
+A PDF's page tree and encryption are read before any page is parsed:
+a user-password PDF fails right there, and only the first PAGE_BUDGET
+pages are analyzed. page-count fails from three pages, so pages past
+the budget would change no verdict, only the worst-case CPU and memory
+per upload. The analysis says how many pages were skipped.
+"""
+
+import os
+
+from ats import checks, extraction, input_handler, registry, report
+from ats.document import PdfDocument
+
+# The editor's auto-check uploads a synthesized blob under this name; the
+# filename check would nag about it on every compile, so it is skipped.
+SYNTHESIZED_FILENAME = "resume.pdf"
+
+PAGE_BUDGET = int(os.getenv("ATS_PAGE_BUDGET", "4"))
+
+
+def _pages(resolver):
+    meta = resolver.get("meta")
+    if meta["needs_pass"]:
+        raise ValueError("PDF needs a user password")
+    return {
+        "total": meta["page_count"],
+        "analyzed": meta["analyzed_pages"],
+        "skipped": meta["skipped_pages"],
+    }
+
+
+def _events(kind, context, selected):
+    resolver = registry.Resolver(registry.INPUTS[kind], context)
+    pages = _pages(resolver) if kind == "pdf" else None
+    text = resolver.get("text")
+    if kind == "pdf" and input_handler.is_scanned(text):
+        scanned = checks.scanned_pdf()
+        yield "check", scanned
+        yield (
+            "analysis",
+            {
+                "scanned": True,
+                "pages": pages,
+                "text": text,
+                "checks": [scanned],
+                "extracted": None,
+                "inputs_ms": resolver.inputs_ms,
+            },
+        )
+        return
+    results = []
+    specs = registry.by_cost(registry.specs(kind, selected))
+    for result in registry.iter_run(specs, resolver):
+        results.append(result)
+        yield "check", result
+    results.sort(key=registry.position)
+    yield (
+        "analysis",
+        {
+            "scanned": False,
+            "pages": pages,
+            "text": text,
+            "checks": results,
+            "extracted": {
+                field: result.model_dump()
+                for field, result in resolver.get("extracted").items()
+            },
+            "inputs_ms": resolver.inputs_ms,
+        },
+    )
+
+
+def stream_analysis(data, kind, selected=None):
+    """analyze(), incrementally: yields ("check", result) as each check
+    finishes (cheap ones first), then ("analysis", the analyze() dict)."""
+    context = {"size": len(data)}
+    if kind == "pdf":
+        with PdfDocument(data, page_budget=PAGE_BUDGET) as doc:
+            yield from _events(kind, {**context, "doc": doc}, selected)
+    else:
+        yield from _events(kind, {**context, "data": data}, selected)
+
+
+def analyze(data, kind, selected=None):
+    """Everything about one validated upload that its bytes determine.
+
+    A plain, JSON-safe dict so it can cross the process boundary and sit
+    in ats.cache: {"scanned", "pages", "text", "checks", "extracted",
+    "inputs_ms"} — PDF page counts ({"total", "analyzed", "skipped"}, None
+    for DOCX), the registry's checks (only the `selected` ids, if given, each with
+    its duration_ms), the best extracted text, the rules-extracted fields
+    (model_dump form) and per-input timings. Per-request checks (the
+    filename) are added by build_check_report().
+    """
+    for event, payload in stream_analysis(data, kind, selected):
+        if event == "analysis":
+            return payload
+
+
+def select(analysis, selected):
+    """A full analysis narrowed to the `selected` check ids."""
+    if selected is None or analysis["scanned"]:
+        return analysis
+    return {
+        **analysis,
+        "checks": [check for check in analysis["checks"] if check["id"] in selected],
+    }
+
+
+def fields(analysis):
+    """The analysis's rules-extracted fields as FieldResult models."""
+    return {
+        field: extraction.FieldResult.model_validate(value)
+        for field, value in (analysis["extracted"] or {}).items()
+    }
+
+
+def request_checks(filename, selected=None):
+    """Checks that depend on the request rather than the bytes (filename)."""
+    if filename == SYNTHESIZED_FILENAME:
+        return []
+    per_request = registry.specs(None, selected, per_request=True)
+    return registry.run(per_request, registry.Resolver({}, {"filename": filename}))
+
+
+def build_check_report(filename, analysis, selected=None):
+    """The /ats/check response for `analysis` uploaded as `filename`."""
+    timings = {"inputs_ms": analysis["inputs_ms"]}
+    pages = analysis["pages"]
+    if analysis["scanned"]:
+        return report.build_report(
+            filename, analysis["checks"], timings=timings, pages=pages
+        )
+    results = analysis["checks"] + request_checks(filename, selected)
+    results.sort(key=registry.position)
+    return report.build_report(
+        filename, results, fields(analysis), timings=timings, pages=pages
+    )
+
+
+def run_check(filename, data, kind, selected=None):
+    """Parseability report for one validated upload (all checks by default)."""
+    return build_check_report(filename, analyze(data, kind, selected), selected)
@@ -0,0 +1,81 @@
+"""Cache of ATS analyses, keyed by a SHA-256 of the upload bytes.
+
+The editor's auto-check re-uploads the same synthesized resume.pdf after
+every compile, and /ats/extract re-parses bytes /ats/check just parsed.
+battery.analyze() depends only on the bytes, so its result — texts,
+format and content checks, rules-extracted fields — is cached in:
+
+1. an in-process LRU (per uvicorn worker, bounded by bytes), then
+2. Redis (shared across workers, TTL'd, bounded by entry count).
+
+Both tiers hold an analysis for at most ATS_CACHE_TTL (the retention
+PRIVACY.md publishes): one promoted from Redis keeps only its remaining
+Redis lifetime in memory. Only the derived analysis is stored, as JSON; the uploaded document
+itself is never cached or written anywhere (PRIVACY.md). Cache failures
+never fail a request — a miss just runs the battery.
+"""
+
+import hashlib
+import json
+import os
+
+from services.cache import MemoryLRU, get_redis, get_with_ttl, put_bounded
+
+ATS_CACHE_TTL = int(os.getenv("ATS_CACHE_TTL", "3600"))
+MEMORY_MAX_BYTES = int(os.getenv("ATS_CACHE_MEMORY_MB", "16")) * 1024 * 1024
+REDIS_MAX_ENTRIES = int(os.getenv("ATS_CACHE_REDIS_ENTRIES", "500"))
+
+# Bump when checks or extraction change shape or verdicts, so Redis entries
+# written by the previous release are not served after a deploy.
+ANALYSIS_VERSION = 5
+
+_KEY_PREFIX = "ats:"
+_INDEX_KEY = "ats:index"
+
+_memory = MemoryLRU(MEMORY_MAX_BYTES, ttl=ATS_CACHE_TTL)
+_counters = {"memory_hits": 0, "redis_hits": 0, "misses": 0, "stores": 0}
+
+
+def upload_key(data: bytes, kind: str) -> str:
+    digest = hashlib.sha256(data).hexdigest()
+    return f"v{ANALYSIS_VERSION}:{kind}:{digest}"
+
+
+async def get_analysis(key: str) -> dict | None:
+    analysis = _memory.get(key)
+    if analysis is not None:
+        _counters["memory_hits"] += 1
+        return analysis
+
+    try:
+        raw, ttl = await get_with_ttl(get_redis(), _KEY_PREFIX + key)
+    except Exception:
+        raw = None
+    if raw is not None:
+        _counters["redis_hits"] += 1
+        analysis = json.loads(raw)
+        _memory.set(key, analysis, len(raw), ttl)
+        return analysis
+
+    _counters["misses"] += 1
+    return None
+
+
+async def put_analysis(key: str, analysis: dict) -> None:
+    raw = json.dumps(analysis, separators=(",", ":"))
+    _counters["stores"] += 1
+    _memory.set(key, analysis, len(raw))
+    await put_bounded(
+        _KEY_PREFIX, _INDEX_KEY, key, raw, ATS_CACHE_TTL, REDIS_MAX_ENTRIES
+    )
+
+
+def stats() -> dict:
+    """Hit/miss counters for this worker plus the memory tier's footprint."""
+    lookups = _counters["memory_hits"] + _counters["redis_hits"] + _counters["misses"]
+    hits = _counters["memory_hits"] + _counters["redis_hits"]
+    return {
+        **_counters,
+        "hit_ratio": hits / lookups if lookups else 0.0,
+        "memory": _memory.stats(),
+    }
@@ -6,12 +6,11 @@ drives the grouped report client-side. Explicitly no blended numeric score —
 a checklist is honest, a score is not.
 """
 
-import difflib
 import re
 
 # Canonical contact/section regexes live in ats.extraction so the checklist
 # and the field-extraction preview can never disagree.
-from ats import textstats
+from ats import similarity, textstats
 from ats.extraction import (
     EMAIL_RE as _EMAIL_RE,
 )
@@ -124,9 +123,7 @@ def detect_glued(text_a, text_b):
 
 
 def extraction_agreement(text_a, text_b, glued=False):
-    ratio = difflib.SequenceMatcher(
-        None, _normalize(text_a), _normalize(text_b)
-    ).ratio()
+    ratio = similarity.ratio(_normalize(text_a), _normalize(text_b))
     metric = {
         "kind": "ratio",
         "value": ratio,
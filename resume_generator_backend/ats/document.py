@@ -0,0 +1,162 @@
+"""One parsed PDF upload, shared by every extractor and layout pass.
+
+Each check used to reopen the raw bytes: pdfplumber four times and
+PyMuPDF three times per /ats/check, re-running extract_words() on the
+same pages along the way. PdfDocument opens each backend at most once
+(lazily — a DOCX-style early exit never pays for PyMuPDF) and memoizes
+every per-page product the checks ask for.
+
+Use it as a context manager; closing releases both backends and the
+memo. Like the bytes it wraps, it lives only for one request.
+
+With a `page_budget`, only the first that-many pages are analyzed:
+pdfplumber is opened on those pages alone and every pass iterates
+`analyzed_pages`, so a 40-page upload costs what a 4-page one does.
+`page_count` stays the true total, read from the PyMuPDF page tree
+without touching any page content.
+"""
+
+import io
+from dataclasses import dataclass
+from functools import cached_property
+
+import fitz  # PyMuPDF
+import pdfplumber
+
+
+@dataclass(frozen=True)
+class WordBoxes:
+    """One page's words as parallel columns, for the geometry passes."""
+
+    text: tuple[str, ...]
+    x0: tuple[float, ...]
+    x1: tuple[float, ...]
+    top: tuple[float, ...]
+    bottom: tuple[float, ...]
+
+
+class PdfDocument:
+    def __init__(self, data: bytes, page_budget: int | None = None):
+        self.data = data
+        self.page_budget = page_budget
+        self._memo = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if "plumber" in self.__dict__:
+            self.plumber.close()
+        if "fitz" in self.__dict__:
+            self.fitz.close()
+        self._memo.clear()
+
+    @cached_property
+    def plumber(self):
+        pages = None
+        if self.analyzed_pages < self.page_count:
+            pages = list(range(1, self.analyzed_pages + 1))
+        return pdfplumber.open(io.BytesIO(self.data), pages=pages)
+
+    @cached_property
+    def fitz(self):
+        return fitz.open(stream=self.data, filetype="pdf")
+
+    @property
+    def page_count(self) -> int:
+        return self.fitz.page_count
+
+    @property
+    def analyzed_pages(self) -> int:
+        """Pages the extractors and layout passes read: the first
+        page_budget of them, or all without a budget."""
+        if self.page_budget is None:
+            return self.page_count
+        return min(self.page_count, self.page_budget)
+
+    @property
+    def skipped_pages(self) -> int:
+        return self.page_count - self.analyzed_pages
+
+    @property
+    def plumber_pages(self):
+        return self.plumber.pages
+
+    def _cached(self, name, index, compute):
+        key = (name, index)
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    # ── pdfplumber, per page ──
+
+    def words(self, index):
+        return self._cached(
+            "words", index, lambda: self.plumber.pages[index].extract_words()
+        )
+
+    def boxes(self, index):
+        """The page's words() as WordBoxes columns, built once."""
+
+        def compute():
+            words = self.words(index)
+            return WordBoxes(
+                *(
+                    tuple(word[key] for word in words)
+                    for key in ("text", "x0", "x1", "top", "bottom")
+                )
+            )
+
+        return self._cached("boxes", index, compute)
+
+    def plumber_text(self, index):
+        return self._cached(
+            "plumber_text",
+            index,
+            lambda: self.plumber.pages[index].extract_text() or "",
+        )
+
+    def table_count(self, index):
+        return self._cached(
+            "tables", index, lambda: len(self.plumber.pages[index].find_tables())
+        )
+
+    # ── PyMuPDF, per page ──
+
+    def fitz_page(self, index):
+        return self._cached("fitz_page", index, lambda: self.fitz[index])
+
+    def fitz_text(self, index):
+        return self._cached(
+            "fitz_text", index, lambda: self.fitz_page(index).get_text()
+        )
+
+    def spans(self, index):
+        """Text spans ({"text", "size", "font", ...}) in reading order."""
+
+        def compute():
+            blocks = self.fitz_page(index).get_text("dict")["blocks"]
+            return [
+                span
+                for block in blocks
+                for line in block.get("lines", ())
+                for span in line["spans"]
+            ]
+
+        return self._cached("spans", index, compute)
+
+    def fonts(self, index):
+        return self._cached(
+            "fonts", index, lambda: self.fitz_page(index).get_fonts(full=True)
+        )
+
+    def images(self, index):
+        return self._cached(
+            "images", index, lambda: self.fitz_page(index).get_images(full=True)
+        )
+
+    def links(self, index):
+        return self._cached("links", index, lambda: self.fitz_page(index).get_links())
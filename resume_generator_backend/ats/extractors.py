@@ -1,13 +1,14 @@
 """Stage 1 — text extraction. PDFs get dual extraction (pdfplumber and
 PyMuPDF) so downstream checks can compare the two; DOCX has a single
-extractor and the agreement check auto-passes."""
+extractor and the agreement check auto-passes.
+
+PDF extractors take an ats.document.PdfDocument, so one upload is parsed
+once per backend no matter how many extractors run on it."""
 
 import io
 import re
 
 import docx
-import fitz  # PyMuPDF
-import pdfplumber
 
 from ats.thresholds import EDGE_PROXIMITY_FRACTION, TINY_FONT_PT
 
@@ -30,81 +31,94 @@ def _font_family(basefont: str) -> str:
     return _FONT_SIZE_SUFFIX_RE.sub("", name) or name
 
 
-def extract_pdf_pdfplumber(data):
-    with pdfplumber.open(io.BytesIO(data)) as pdf:
-        return "\n".join((page.extract_text() or "") for page in pdf.pages)
+def extract_pdf_pdfplumber(doc):
+    return "\n".join(doc.plumber_text(i) for i in range(len(doc.plumber_pages)))
+
 
+def extract_pdf_pymupdf(doc):
+    return "\n".join(doc.fitz_text(i) for i in range(doc.analyzed_pages))
 
-def extract_pdf_pymupdf(data):
-    with fitz.open(stream=data, filetype="pdf") as doc:
-        return "\n".join(page.get_text() for page in doc)
 
+def extract_pdf_links(doc):
+    """URI targets of every link annotation, across the analyzed pages."""
+    return [
+        link["uri"]
+        for i in range(doc.analyzed_pages)
+        for link in doc.links(i)
+        if link.get("uri")
+    ]
 
-def extract_pdf_links(data):
-    """URI targets of every link annotation, across all pages."""
-    with fitz.open(stream=data, filetype="pdf") as doc:
-        return [
-            link["uri"] for page in doc for link in page.get_links() if link.get("uri")
-        ]
 
+def pdf_meta(doc):
+    """What the PDF's trailer and page tree say, before any page is parsed.
 
-def pdf_stats(data):
+    Returns {page_count, analyzed_pages, skipped_pages, is_encrypted,
+    needs_pass}. Cheap at any size, so battery reads it first.
+    """
+    # Owner-password ("permissions") PDFs auto-authenticate with the
+    # empty user password, leaving is_encrypted/needs_pass False — the
+    # metadata encryption method string still exposes them.
+    is_encrypted = bool(
+        doc.fitz.is_encrypted
+        or doc.fitz.needs_pass
+        or (doc.fitz.metadata or {}).get("encryption")
+    )
+    return {
+        "page_count": doc.page_count,
+        "analyzed_pages": doc.analyzed_pages,
+        "skipped_pages": doc.skipped_pages,
+        "is_encrypted": is_encrypted,
+        "needs_pass": bool(doc.fitz.needs_pass),
+    }
+
+
+def pdf_stats(doc):
     """Document-shape stats for the extended check battery.
 
-    One pass over the PyMuPDF document (pages, fonts, glyph sizes, images)
-    plus one over pdfplumber (word bboxes near the page edges). Returns
-    {page_count, font_names, tiny_char_fraction, image_count, edge_text,
-    is_encrypted}.
+    PyMuPDF pages, fonts, glyph sizes and images, plus pdfplumber word
+    bboxes near the page edges — the words are the same memoized ones the
+    layout checks use, over the analyzed pages. Returns {font_names,
+    tiny_char_fraction, image_count, edge_text}.
     """
     font_names = set()
     image_xrefs = set()
     tiny_chars = 0
     total_chars = 0
-    with fitz.open(stream=data, filetype="pdf") as doc:
-        page_count = doc.page_count
-        # Owner-password ("permissions") PDFs auto-authenticate with the
-        # empty user password, leaving is_encrypted/needs_pass False — the
-        # metadata encryption method string still exposes them.
-        is_encrypted = bool(
-            doc.is_encrypted or doc.needs_pass or (doc.metadata or {}).get("encryption")
-        )
-        for page in doc:
-            for font in page.get_fonts(full=True):
-                basefont = font[3]
-                if basefont:
-                    font_names.add(_font_family(basefont))
-            for image in page.get_images(full=True):
-                image_xrefs.add(image[0])  # xref — same image reused counts once
-            for block in page.get_text("dict")["blocks"]:
-                for line in block.get("lines", ()):
-                    for span in line["spans"]:
-                        count = len(span["text"])
-                        total_chars += count
-                        if span["size"] < TINY_FONT_PT:
-                            tiny_chars += count
+    for i in range(doc.analyzed_pages):
+        for font in doc.fonts(i):
+            basefont = font[3]
+            if basefont:
+                font_names.add(_font_family(basefont))
+        for image in doc.images(i):
+            image_xrefs.add(image[0])  # xref — same image reused counts once
+        for span in doc.spans(i):
+            count = len(span["text"])
+            total_chars += count
+            if span["size"] < TINY_FONT_PT:
+                tiny_chars += count
 
     edge_text = False
-    with pdfplumber.open(io.BytesIO(data)) as pdf:
-        for page in pdf.pages:
-            margin_x = page.width * EDGE_PROXIMITY_FRACTION
-            margin_y = page.height * EDGE_PROXIMITY_FRACTION
-            if any(
-                word["x0"] < margin_x
-                or word["x1"] > page.width - margin_x
-                or word["top"] < margin_y
-                or word["bottom"] > page.height - margin_y
-                for word in page.extract_words()
-            ):
-                edge_text = True
-                break
+    for i, page in enumerate(doc.plumber_pages):
+        boxes = doc.boxes(i)
+        if not boxes.text:
+            continue
+        margin_x = page.width * EDGE_PROXIMITY_FRACTION
+        margin_y = page.height * EDGE_PROXIMITY_FRACTION
+        # Any word past a margin <=> the extreme word is.
+        if (
+            min(boxes.x0) < margin_x
+            or max(boxes.x1) > page.width - margin_x
+            or min(boxes.top) < margin_y
+            or max(boxes.bottom) > page.height - margin_y
+        ):
+            edge_text = True
+            break
 
     return {
-        "page_count": page_count,
         "font_names": font_names,
         "tiny_char_fraction": tiny_chars / total_chars if total_chars else 0.0,
         "image_count": len(image_xrefs),
         "edge_text": edge_text,
-        "is_encrypted": is_encrypted,
     }
 
 
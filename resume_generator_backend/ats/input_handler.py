@@ -5,6 +5,8 @@ from fastapi import HTTPException
 
 from ats.thresholds import MAX_FILE_BYTES, SCANNED_MIN_CHARS
 
+FILE_TOO_LARGE = "File too large — the limit is 5 MB."
+
 
 def validate_upload(filename, data):
     """Return "pdf" or "docx" for an acceptable upload, else raise 400/413.
@@ -24,10 +26,7 @@ def validate_upload(filename, data):
         )
 
     if len(data) > MAX_FILE_BYTES:
-        raise HTTPException(
-            status_code=413,
-            detail="File too large — the limit is 5 MB.",
-        )
+        raise HTTPException(status_code=413, detail=FILE_TOO_LARGE)
 
     if kind == "pdf" and not data.startswith(b"%PDF-"):
         raise HTTPException(
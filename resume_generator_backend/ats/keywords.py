@@ -0,0 +1,202 @@
+"""Job-description keyword extraction for the ATS keyword score.
+
+A pasted job description is reduced to a ranked keyword list locally, so
+matched/missing sets are computed deterministically and the LLM (when
+asked for suggestions at all) only sees the gap list, not 20k characters
+of resume and JD.
+
+Candidates come from three places:
+
+1. Taxonomy terms (ats.skills), counting ALIASES — "K8s" in the JD
+   becomes Kubernetes, which the resume may spell either way.
+2. Technical-looking tokens outside the taxonomy: digits, + # . /, or
+   inner capitals ("gRPC", "OAuth2", "Kotlin/Native").
+3. Phrases: runs of two or three content words between stopwords,
+   punctuation and posting boilerplate ("distributed systems",
+   "payment processing"). Longer runs contribute their bigrams.
+
+Each candidate is weighted BM25-style: IDF of its words times the
+saturated term frequency tf * (K1 + 1) / (tf + K1) — one mention counts,
+repeats count less each time. A plain word becomes a keyword on its own
+only when the posting repeats it.
+
+ponytail: there is no job-posting corpus in the repo, so the IDF table is
+tiered by hand — function words and posting boilerplate (idf 0, also
+phrase breaks), ordinary words, technical tokens, taxonomy terms. Swap in
+log(N / df) over a real corpus if the ranking needs to get finer.
+"""
+
+import re
+from collections import Counter
+from itertools import pairwise
+
+from ats.skills import TAXONOMY, SkillMatcher, find_keywords, keywords_in
+
+MAX_KEYWORDS = 30
+K1 = 1.2
+
+WORD_IDF = 1.0
+TECHNICAL_IDF = 2.0
+TAXONOMY_IDF = 3.0
+
+STOPWORDS = frozenset(
+    """
+    a about above across after again against all also am an and any are as
+    at be because been before being below between both but by can could did
+    do does doing down during each either etc e.g eg few for from further
+    had has have having he her here hers herself him himself his how i i.e
+    ie if in into is it its itself just me more most must my myself no nor
+    not of off on once only or other our ours ourselves out over own per
+    same she should so some such than that the their theirs them themselves
+    then there these they this those through to too under until up upon us
+    very via was we were what when where which while who whom why will with
+    within without would you your yours yourself yourselves
+    """.split()  # noqa: SIM905
+)
+
+# Words most postings use whatever the role. They carry no signal and
+# end a phrase run, so "experience with distributed systems" yields
+# "distributed systems".
+BOILERPLATE = frozenset(
+    """
+    ability able apply applicant applicants background benefits best bonus
+    build building candidate candidates collaborate collaborating company
+    competitive create culture customer customers day deep degree deliver
+    design designing develop developer developers developing development
+    drive employer engineer engineers engineering environment equal equity
+    excellent existing expect experience experienced expertise familiarity
+    familiar fast great help high hire hiring ideal ideally implement
+    improve including job join junior key knowledge lead leading level like
+    looking love maintain make manage member mission modern new nice offer
+    opportunity own ownership paced passion passionate plus position
+    preferred preferably problem problems product products proficiency
+    proficient qualifications related remote required requirements
+    responsibilities responsible role salary senior skill skills solid
+    solutions solve staff strong success successful support team teams
+    technical technologies technology tools understanding use using value
+    values we're well work working world year years you'll you're
+    """.split()  # noqa: SIM905
+)
+
+# Verbs that open a duty bullet ("Run workloads on...", "Own services
+# written in...") rather than name a skill.
+DUTY_VERBS = frozenset(
+    """
+    act assist consume consumed contribute define drive enable ensure
+    establish evolve focus focused get grow guide handle identify influence
+    manage managed mentor operate own owned participate partner power
+    powered process provide run running scale serve ship shipping take
+    written write writing
+    """.split()  # noqa: SIM905
+)
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9][\w+#./'-]*[\w+#]|[A-Za-z0-9]")
+_BREAK_RE = re.compile(r"[,;:()\[\]{}!?|\"•·*\n\r\t]|\.(?=\s|$)|\s[-–—]\s")
+
+_TAXONOMY = frozenset(TAXONOMY)
+
+
+def _is_technical(token: str) -> bool:
+    return any(char.isdigit() or char in "+#./" for char in token) or any(
+        char.isupper() for char in token[1:]
+    )
+
+
+def _saturated(tf: int) -> float:
+    return tf * (K1 + 1) / (tf + K1)
+
+
+def _blank(text: str, spans) -> str:
+    # Taxonomy spellings are candidates of their own; blanking them with a
+    # break keeps them out of the surrounding phrases.
+    chars = list(text)
+    for start, end in spans:
+        chars[start:end] = "," * (end - start)
+    return "".join(chars)
+
+
+def _runs(text: str):
+    """Runs of content tokens: no stopword, boilerplate or punctuation
+    between them. Technical tokens stand alone as one-token runs."""
+    for segment in _BREAK_RE.split(text):
+        run = []
+        for token in _TOKEN_RE.findall(segment):
+            folded = token.lower()
+            if (
+                folded in STOPWORDS
+                or folded in BOILERPLATE
+                or folded in DUTY_VERBS
+                or not any(char.isalpha() for char in token)
+            ):
+                if run:
+                    yield run
+                run = []
+            elif _is_technical(token):
+                if run:
+                    yield run
+                yield [token]
+                run = []
+            else:
+                run.append(token)
+        if run:
+            yield run
+
+
+def extract_keywords(job_description: str, limit: int = MAX_KEYWORDS) -> list[str]:
+    """The job description's keywords, heaviest first."""
+    taxonomy_tf = Counter()
+    spans = []
+    for match, terms in find_keywords(job_description):
+        spans.append((match.start, match.end))
+        # A spelling that is a term itself counts as that term only:
+        # "Terraform" in a JD asks for Terraform, not Infrastructure as Code.
+        direct = {term for term in terms if term.lower() == match.term}
+        taxonomy_tf.update(direct or terms)
+
+    weights = {term: TAXONOMY_IDF * _saturated(tf) for term, tf in taxonomy_tf.items()}
+    first_seen = {}
+    spelled = {}
+    token_tf = Counter()
+    phrase_tf = Counter()
+    for run in _runs(_blank(job_description, spans)):
+        folded = [token.lower() for token in run]
+        token_tf.update(folded)
+        for token, key in zip(run, folded, strict=True):
+            spelled.setdefault(key, token)
+        if len(run) <= 3:
+            grams = [tuple(folded)] if len(run) > 1 else []
+        else:
+            grams = list(pairwise(folded))
+        for gram in grams:
+            phrase_tf[gram] += 1
+            first_seen.setdefault(gram, len(first_seen))
+        for key in folded:
+            first_seen.setdefault((key,), len(first_seen))
+
+    in_phrases = {key for gram in phrase_tf for key in gram}
+    for gram, tf in phrase_tf.items():
+        name = " ".join(spelled[key] for key in gram)
+        weights[name] = len(gram) * WORD_IDF * _saturated(tf)
+    for key, tf in token_tf.items():
+        token = spelled[key]
+        if _is_technical(token):
+            weights[token] = TECHNICAL_IDF * _saturated(tf)
+        elif tf > 1 and key not in in_phrases:
+            weights[token] = WORD_IDF * _saturated(tf)
+
+    def order(name):
+        gram = tuple(name.lower().split())
+        return (-weights[name], name not in _TAXONOMY, first_seen.get(gram, 0))
+
+    return sorted(weights, key=order)[:limit]
+
+
+def keywords_present(text: str, keywords) -> set[str]:
+    """Which of `keywords` the text shows: taxonomy terms directly or
+    through an alias, anything else as an exact case-insensitive match
+    on word boundaries."""
+    found = keywords_in(text) & set(keywords)
+    others = [keyword for keyword in keywords if keyword not in _TAXONOMY]
+    if others:
+        found.update(SkillMatcher(others).extract(text))
+    return found
@@ -8,11 +8,15 @@ that both hold real text is treated as a column gutter.
 # body lines mask gutters and dense right-aligned dates can fake one.
 # Upgrade path: per-line gutter voting, then a real layout model behind
 # this same analyze() interface.
-"""
 
-import io
+Both passes read words from the shared ats.document.PdfDocument, so pages
+are parsed and word-segmented once per upload, and read them as column
+tuples (PdfDocument.boxes) so the clustering runs on sorted/accumulate
+rather than per-word dict lookups.
+"""
 
-import pdfplumber
+from itertools import accumulate
+from operator import sub
 
 from ats.extraction import EMAIL_RE, PHONE_CANDIDATE_RE, _phone_sane
 from ats.thresholds import (
@@ -23,23 +27,28 @@ from ats.thresholds import (
 )
 
 
-def _column_count(page):
-    words = page.extract_words()
+def _column_count(page, boxes):
     # Ignore the top band of the page: a full-width name/contact header
     # would otherwise bridge the gutter between body columns.
     cutoff = page.height * HEADER_BAND_FRACTION
-    body = [w for w in words if w["top"] >= cutoff]
+    body = sorted(
+        (x0, x1) for x0, x1, top in zip(boxes.x0, boxes.x1, boxes.top) if top >= cutoff
+    )
     if len(body) < 2 * MIN_COLUMN_WORDS:
         return 1
 
-    clusters = []  # [x_start, x_end, word_count]
-    for x0, x1 in sorted((w["x0"], w["x1"]) for w in body):
-        if clusters and x0 - clusters[-1][1] < GUTTER_MIN_WIDTH_PT:
-            clusters[-1][1] = max(clusters[-1][1], x1)
-            clusters[-1][2] += 1
-        else:
-            clusters.append([x0, x1, 1])
-    return max(1, sum(1 for c in clusters if c[2] >= MIN_COLUMN_WORDS))
+    # Sorted by start, the running max of word ends is the right edge of
+    # the cluster being built; a word starting GUTTER_MIN_WIDTH_PT or more
+    # past it opens the next cluster.
+    starts, ends = zip(*body)
+    reach = list(accumulate(ends, max))
+    breaks = [
+        i
+        for i in range(1, len(body))
+        if starts[i] - reach[i - 1] >= GUTTER_MIN_WIDTH_PT
+    ]
+    sizes = map(sub, [*breaks, len(body)], [0, *breaks])
+    return max(1, sum(1 for size in sizes if size >= MIN_COLUMN_WORDS))
 
 
 def _has_email(text):
@@ -50,7 +59,7 @@ def _has_phone(text):
     return any(_phone_sane(m.group(0)) for m in PHONE_CANDIDATE_RE.finditer(text))
 
 
-def contact_in_margins(data):
+def contact_in_margins(doc):
     """True when email or phone exists only in the header/footer band.
 
     Words in the bottom MARGIN_BAND_FRACTION of any page — or the top band
@@ -63,16 +72,17 @@ def contact_in_margins(data):
     """
     margin_words = []
     body_words = []
-    with pdfplumber.open(io.BytesIO(data)) as pdf:
-        for page_index, page in enumerate(pdf.pages):
-            top_band = page.height * MARGIN_BAND_FRACTION
-            bottom_band = page.height * (1 - MARGIN_BAND_FRACTION)
-            for word in page.extract_words():
-                in_top = page_index > 0 and word["top"] < top_band
-                if in_top or word["bottom"] > bottom_band:
-                    margin_words.append(word["text"])
-                else:
-                    body_words.append(word["text"])
+    for page_index, page in enumerate(doc.plumber_pages):
+        boxes = doc.boxes(page_index)
+        top_band = (
+            page.height * MARGIN_BAND_FRACTION if page_index > 0 else float("-inf")
+        )
+        bottom_band = page.height * (1 - MARGIN_BAND_FRACTION)
+        for text, top, bottom in zip(boxes.text, boxes.top, boxes.bottom):
+            if top < top_band or bottom > bottom_band:
+                margin_words.append(text)
+            else:
+                body_words.append(text)
     margin_text = " ".join(margin_words)
     body_text = " ".join(body_words)
     return (_has_email(margin_text) and not _has_email(body_text)) or (
@@ -80,12 +90,11 @@ def contact_in_margins(data):
     )
 
 
-def analyze(data):
+def analyze(doc):
     """Return {"max_columns": int, "table_count": int} across all pages."""
     max_columns = 1
     table_count = 0
-    with pdfplumber.open(io.BytesIO(data)) as pdf:
-        for page in pdf.pages:
-            max_columns = max(max_columns, _column_count(page))
-            table_count += len(page.find_tables())
+    for index, page in enumerate(doc.plumber_pages):
+        max_columns = max(max_columns, _column_count(page, doc.boxes(index)))
+        table_count += doc.table_count(index)
     return {"max_columns": max_columns, "table_count": table_count}
@@ -8,9 +8,22 @@ honestly via llm_disagreement instead of silently picking a winner.
 
 High-confidence rules results are never touched, and a dead LLM never
 breaks the endpoint: total failure returns the rules results unchanged.
+
+Both samples are requested at once on the shared async client, so the
+pass costs one LLM round trip rather than two. Once one good sample is
+in, the other gets SECOND_SAMPLE_GRACE_S more before it is cancelled
+and the field is resolved from the one sample (low confidence, as when
+the two disagree); nothing waits past SAMPLE_TIMEOUT_S.
+
+When both samples come back, they are cached (services.llm_cache) under
+the model, the field-naming prompt and the truncated text, so the same
+resume re-extracted costs no LLM call. The merge against the rules
+results always runs fresh.
 """
 
+import asyncio
 import logging
+import os
 
 from pydantic import BaseModel, EmailStr, Field, ValidationError, field_validator
 
@@ -20,13 +33,16 @@ from ats.extraction import (
     DATE_RE,
     FieldResult,
 )
-from services.genrate_resume import _get_client, _get_model
+from services import llm_cache
+from services.genrate_resume import _get_async_client, _get_model
 from services.llm_json import extract_json
 
 logger = logging.getLogger("resume_libre")
 
 MAX_TEXT_CHARS = 6_000
 _TEMPERATURES = (0.3, 0.5)
+SAMPLE_TIMEOUT_S = float(os.getenv("ATS_LLM_SAMPLE_TIMEOUT", "20"))
+SECOND_SAMPLE_GRACE_S = float(os.getenv("ATS_LLM_SECOND_SAMPLE_GRACE", "3"))
 
 SYSTEM_PROMPT_TEMPLATE = (
     "Extract ONLY the requested fields from this resume text. "
@@ -91,11 +107,11 @@ DEMO_RESOLUTION = {
 _INVALID = object()  # sentinel: sample missing/unparseable for this field
 
 
-def _call_llm(client, model: str, messages: list[dict], temperature: float):
+async def _call_llm(client, model: str, messages: list[dict], temperature: float):
     """One completion call. Try JSON mode first; some OpenRouter models
     reject response_format, so retry once without it before giving up."""
     try:
-        return client.chat.completions.create(
+        return await client.chat.completions.create(
             model=model,
             temperature=temperature,
             max_tokens=1000,
@@ -103,7 +119,7 @@ def _call_llm(client, model: str, messages: list[dict], temperature: float):
             messages=messages,
         )
     except Exception:
-        return client.chat.completions.create(
+        return await client.chat.completions.create(
             model=model,
             temperature=temperature,
             max_tokens=1000,
@@ -111,15 +127,46 @@ def _call_llm(client, model: str, messages: list[dict], temperature: float):
         )
 
 
-def _sample(client, model: str, messages: list[dict], temperature: float):
-    """One full sample: call + JSON recovery. None means the sample is dead."""
+async def _sample(client, model: str, messages: list[dict], temperature: float):
+    """One full sample: call + JSON recovery, as (sample, tokens spent).
+    A None sample is dead."""
     try:
-        completion = _call_llm(client, model, messages, temperature)
+        completion = await _call_llm(client, model, messages, temperature)
         raw = completion.choices[0].message.content or ""
-        return extract_json(raw)
+        return extract_json(raw), llm_cache.usage_tokens(completion)
     except Exception as e:
         logger.warning("llm_fallback sample (temp=%s) failed: %s", temperature, e)
-        return None
+        return None, 0
+
+
+async def _samples(client, model: str, messages: list[dict]) -> list:
+    """(sample, tokens) per temperature, requested concurrently; the
+    sample is None if it failed, timed out or was cancelled after the
+    grace."""
+    tasks = [
+        asyncio.create_task(_sample(client, model, messages, t)) for t in _TEMPERATURES
+    ]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + SAMPLE_TIMEOUT_S
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0.0, deadline - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            if any(task.result()[0] is not None for task in done):
+                deadline = min(deadline, loop.time() + SECOND_SAMPLE_GRACE_S)
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    if pending:
+        logger.warning("llm_fallback: %d slow sample(s) dropped", len(pending))
+    return [(None, 0) if task.cancelled() else task.result() for task in tasks]
 
 
 def _validated(sample, field: str):
@@ -158,12 +205,16 @@ def _merge_field(prior: FieldResult, v1, v2) -> FieldResult:
 
 
 async def resolve_low_confidence(
-    text: str, rules: dict[str, FieldResult], demo: bool = False
+    text: str,
+    rules: dict[str, FieldResult],
+    demo: bool = False,
+    refresh: bool = False,
 ) -> dict[str, FieldResult]:
     """Resolve failed/low-confidence rules fields via double-sampled LLM calls.
 
     Returns the full merged field dict. High-confidence rules results are
     never overwritten, and LLM failure degrades to the rules results.
+    `refresh` skips the cached samples (and replaces them).
     """
     unresolved = [
         field
@@ -182,7 +233,7 @@ async def resolve_low_confidence(
             **{f: DEMO_RESOLUTION[f] for f in unresolved if f in DEMO_RESOLUTION},
         }
 
-    client = _get_client()
+    client = _get_async_client()
     model = _get_model()
     messages = [
         {
@@ -192,14 +243,31 @@ async def resolve_low_confidence(
         {"role": "user", "content": text[:MAX_TEXT_CHARS]},
     ]
 
-    samples = [_sample(client, model, messages, t) for t in _TEMPERATURES]
-    if all(s is None for s in samples):
+    key = llm_cache.cache_key(
+        "llm_fallback",
+        model,
+        messages[0]["content"],
+        messages[1]["content"],
+        repr(_TEMPERATURES),
+    )
+    samples = await llm_cache.get_reply(key, bypass=refresh)
+    if samples is None:
+        results = await _samples(client, model, messages)
+        samples = [sample for sample, _ in results]
+        if all(sample is not None for sample in samples):
+            await llm_cache.put_reply(
+                key, samples, sum(tokens for _, tokens in results)
+            )
+
+    # Good samples in temperature order: a lone survivor is run1.
+    samples = [s for s in samples if s is not None]
+    if not samples:
         logger.warning(
             "llm_fallback: both samples failed; returning rules results unchanged"
         )
         return rules
 
-    run1, run2 = samples
+    run1, run2 = (*samples, None)[:2]
     resolved = dict(rules)
     for field in unresolved:
         resolved[field] = _merge_field(
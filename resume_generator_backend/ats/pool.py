@@ -0,0 +1,232 @@
+"""Worker processes for the CPU-bound ATS battery.
+
+pdfplumber, PyMuPDF, the similarity pass and the regex checks hold the GIL for
+seconds on a large PDF; run on the event loop they stall every streaming
+generation and SSE client on that API worker. Jobs run instead in a
+small spawn-started ProcessPoolExecutor whose workers import the parsing
+stack once at startup.
+
+- At most ATS_POOL_WORKERS jobs run and ATS_POOL_QUEUE_DEPTH more wait;
+  beyond that the upload is refused with a fast 503 + Retry-After.
+- Each job gets ATS_JOB_CPU_SECONDS of CPU time, enforced inside the
+  worker with a profiling timer, so a pathological PDF costs one 422
+  rather than a wedged worker.
+- A worker that crashes outright (a native-code fault in a parser)
+  breaks the executor; it is rebuilt and the job reports a parse error.
+
+stream() runs a generator job and relays each item it yields over a pipe
+as it is produced, for the progressive /ats/check/stream.
+
+ATS_POOL_WORKERS=0 runs jobs inline on the event loop — the old
+behaviour, used by the test suite.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+from fastapi import HTTPException
+
+logger = logging.getLogger("resume_libre")
+
+_executor: ProcessPoolExecutor | None = None
+_inflight = 0  # queued + running
+
+
+class JobTimeout(BaseException):
+    """CPU budget exhausted. BaseException so parser code that catches
+    Exception broadly cannot swallow it."""
+
+
+def _workers() -> int:
+    # One per API process: each worker is ~90 MB resident once preloaded,
+    # and every uvicorn worker starts its own pool.
+    return int(os.getenv("ATS_POOL_WORKERS", "1"))
+
+
+def _queue_depth() -> int:
+    return int(os.getenv("ATS_POOL_QUEUE_DEPTH", "8"))
+
+
+def _cpu_seconds() -> float:
+    return float(os.getenv("ATS_JOB_CPU_SECONDS", "20"))
+
+
+def _preload():
+    """Worker initializer: pay the parser imports once, not per job."""
+    import ats.battery  # noqa: F401  (pulls in pdfplumber, fitz, docx, checks)
+
+
+def _expire(signum, frame):
+    raise JobTimeout
+
+
+def _run_timed(fn, cpu_seconds, *args):
+    """Worker side: run one job under a CPU-time (ITIMER_PROF) budget."""
+    signal.signal(signal.SIGPROF, _expire)
+    signal.setitimer(signal.ITIMER_PROF, cpu_seconds)
+    try:
+        return fn(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+
+
+def _drain(gen_fn, writer, *args):
+    """Worker side: send each item of gen_fn(*args) down the pipe."""
+    try:
+        for item in gen_fn(*args):
+            writer.send(item)
+    finally:
+        writer.close()
+
+
+def start_pool() -> None:
+    """Create the executor (app startup); a no-op in inline mode."""
+    global _executor
+    if _executor is None and _workers() > 0:
+        _executor = ProcessPoolExecutor(
+            max_workers=_workers(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_preload,
+        )
+
+
+def shutdown_pool() -> None:
+    """Stop the workers (app shutdown), dropping any queued jobs."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def ensure_capacity() -> None:
+    """Raise 503 when the queue is full. run() and stream() check this
+    themselves; call it before starting a streaming response, whose
+    status cannot change once the body has begun."""
+    if _workers() > 0 and _inflight >= _workers() + _queue_depth():
+        raise HTTPException(
+            status_code=503,
+            detail="The resume checker is busy — try again in a few seconds.",
+            headers={"Retry-After": "5"},
+        )
+
+
+@contextmanager
+def _job_errors(executor):
+    global _executor
+    try:
+        yield
+    except JobTimeout:
+        raise HTTPException(
+            status_code=422,
+            detail="This file took too long to analyze. Export a simpler PDF "
+            "(fewer pages, no embedded scans) and try again.",
+        )
+    except BrokenProcessPool:
+        logger.warning("ATS worker process died; rebuilding the pool")
+        if _executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+        raise
+
+
+async def run(fn, *args):
+    """Run `fn(*args)` in a worker process and return its result.
+
+    `fn` and its arguments must be picklable (module-level functions,
+    bytes, strings). Raises 503 when the queue is full and 422 when the
+    job exceeds its CPU budget; any other worker exception propagates.
+    """
+    global _inflight
+    if _workers() <= 0:
+        return fn(*args)
+    ensure_capacity()
+
+    start_pool()
+    executor = _executor
+    _inflight += 1
+    try:
+        with _job_errors(executor):
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, _run_timed, fn, _cpu_seconds(), *args
+            )
+    finally:
+        _inflight -= 1
+
+
+def _retrieve(job):
+    if not job.cancelled():
+        job.exception()  # abandoned by a closed stream; don't log it as lost
+
+
+async def stream(gen_fn, *args):
+    """Run generator `gen_fn(*args)` in a worker; yield its items as they
+    arrive. Same admission, budget and errors as run().
+
+    Items travel over a one-way pipe read by the event loop itself
+    (add_reader), so no thread sits blocked on a worker. Closing the
+    stream early closes the pipe; the worker's next send fails and the
+    job ends.
+    """
+    global _inflight
+    if _workers() <= 0:
+        for item in gen_fn(*args):
+            yield item
+        return
+    ensure_capacity()
+
+    start_pool()
+    executor = _executor
+    loop = asyncio.get_running_loop()
+    reader, writer = multiprocessing.get_context("spawn").Pipe(duplex=False)
+    items = asyncio.Queue()
+    finished = object()
+
+    def readable():
+        try:
+            while reader.poll():
+                items.put_nowait(reader.recv())
+        except EOFError:
+            loop.remove_reader(reader.fileno())
+
+    _inflight += 1
+    loop.add_reader(reader.fileno(), readable)
+    job = loop.run_in_executor(
+        executor, _run_timed, _drain, _cpu_seconds(), gen_fn, writer, *args
+    )
+    job.add_done_callback(lambda _: items.put_nowait(finished))
+    try:
+        with _job_errors(executor):
+            while (item := await items.get()) is not finished:
+                yield item
+            readable()  # sent just before the job returned
+            while not items.empty():
+                yield items.get_nowait()
+            job.result()
+    finally:
+        _inflight -= 1
+        loop.remove_reader(reader.fileno())
+        reader.close()
+        # The executor pickles `writer` on a feeder thread; by now it has.
+        writer.close()
+        if not job.done():
+            job.add_done_callback(_retrieve)
+
+
+def worker_count() -> int:
+    """Jobs that can run at once (1 in inline mode)."""
+    return max(1, _workers())
+
+
+def stats() -> dict:
+    return {
+        "workers": _workers(),
+        "queue_depth": _queue_depth(),
+        "inflight": _inflight,
+        "started": _executor is not None,
+    }
@@ -0,0 +1,384 @@
+"""Declarative registry of the /ats/check battery.
+
+Each Check names the inputs it reads (extracted texts, page stats, layout,
+rules-extracted fields, ...), its report category and a cost class; each
+Input names the inputs it is computed from. A run resolves only the
+inputs its selected checks need, computes each once, and times every
+check (`duration_ms`) and input (`inputs_ms`).
+
+Cost classes describe the check's own work on top of the shared parse:
+"cheap" checks are regexes and counters over the extracted text or file
+metadata; "expensive" ones walk page geometry or compare both
+extractions. `?cost=cheap` is the editor's per-compile subset. A check's
+PDF and DOCX variants share its id, category and cost (the PDF one), so
+a filter selects the same checks for either format.
+
+Checks run one after another inside the job. Every input and check is
+GIL-bound Python over one PdfDocument (which is not thread-safe), so
+threads inside a job measured no faster; parallelism comes from ats.pool
+running uploads in separate processes.
+
+REGISTRY order is report order, for PDF and DOCX alike.
+"""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+
+from ats import checks, extraction, extractors, layout
+
+CHEAP = "cheap"
+EXPENSIVE = "expensive"
+COSTS = (CHEAP, EXPENSIVE)
+
+PDF = ("pdf",)
+DOCX = ("docx",)
+ALL_FORMATS = ("pdf", "docx")
+
+# Inputs supplied by the request rather than the upload bytes. Checks that
+# read them run per request (battery.build_check_report), never cached.
+REQUEST_INPUTS = frozenset({"filename"})
+
+
+@dataclass(frozen=True)
+class Input:
+    needs: tuple[str, ...]
+    compute: Callable
+
+
+@dataclass(frozen=True)
+class Check:
+    id: str
+    category: str
+    cost: str
+    inputs: tuple[str, ...]
+    run: Callable
+    formats: tuple[str, ...] = ALL_FORMATS
+
+    @property
+    def per_request(self) -> bool:
+        return not REQUEST_INPUTS.isdisjoint(self.inputs)
+
+
+# Roots supplied by battery.analyze: "doc" (PdfDocument) or "data" (DOCX
+# bytes), and "size" (upload bytes).
+INPUTS = {
+    "pdf": {
+        "meta": Input(("doc",), extractors.pdf_meta),
+        "plumber_text": Input(("doc",), extractors.extract_pdf_pdfplumber),
+        "fitz_text": Input(("doc",), extractors.extract_pdf_pymupdf),
+        # pdfplumber's text is the best text for the content checks.
+        "text": Input(("plumber_text",), lambda text: text),
+        "both_texts": Input(("plumber_text", "fitz_text"), lambda a, b: a + b),
+        "glued": Input(("plumber_text", "fitz_text"), checks.detect_glued),
+        "layout": Input(("doc",), layout.analyze),
+        "stats": Input(("doc",), extractors.pdf_stats),
+        "links": Input(("doc",), extractors.extract_pdf_links),
+        "extracted": Input(
+            ("text", "links"),
+            lambda text, links: extraction.extract_fields_rules(text, links=links),
+        ),
+        "margin_contact": Input(("doc",), layout.contact_in_margins),
+    },
+    # ponytail: DOCX layout inspection is shallow — python-docx sees
+    # tables but not multi-column section formatting. Upgrade path:
+    # parse w:cols in the document XML.
+    "docx": {
+        "docx": Input(("data",), extractors.extract_docx),
+        "text": Input(("docx",), lambda parsed: parsed[0]),
+        "both_texts": Input(("text",), lambda text: text),
+        "table_count": Input(("docx",), lambda parsed: parsed[1]),
+        "extracted": Input(("text",), extraction.extract_fields_rules),
+    },
+}
+
+
+def _longest_word_count(a, b):
+    # max of both extractions — glued-word extractions undercount
+    return max(len(a.split()), len(b.split()))
+
+
+# DOCX has no link annotations or page margins to inspect, so the
+# link-only-contact and header-footer-contact checks are PDF-only.
+REGISTRY = (
+    Check(
+        "extraction-agreement",
+        "extraction",
+        EXPENSIVE,
+        ("plumber_text", "fitz_text", "glued"),
+        lambda a, b, glued: checks.extraction_agreement(a, b, glued=glued),
+        PDF,
+    ),
+    Check(
+        "extraction-agreement",
+        "extraction",
+        EXPENSIVE,
+        (),
+        lambda: checks.extraction_agreement_single("DOCX"),
+        DOCX,
+    ),
+    Check(
+        "columns",
+        "layout",
+        EXPENSIVE,
+        ("layout",),
+        lambda info: checks.columns(info["max_columns"]),
+        PDF,
+    ),
+    Check("columns", "layout", EXPENSIVE, (), lambda: checks.columns(1), DOCX),
+    Check(
+        "tables",
+        "layout",
+        EXPENSIVE,
+        ("layout",),
+        lambda info: checks.tables(info["table_count"]),
+        PDF,
+    ),
+    Check("tables", "layout", EXPENSIVE, ("table_count",), checks.tables, DOCX),
+    Check(
+        "encoding-sanity", "typography", CHEAP, ("both_texts",), checks.encoding_sanity
+    ),
+    Check(
+        "content-completeness",
+        "extraction",
+        EXPENSIVE,
+        ("plumber_text", "fitz_text", "glued"),
+        lambda a, b, glued: checks.content_completeness(a, b, glued=glued),
+        PDF,
+    ),
+    Check(
+        "content-completeness",
+        "extraction",
+        EXPENSIVE,
+        (),
+        lambda: checks.content_completeness_single("DOCX"),
+        DOCX,
+    ),
+    Check("section-headers", "content", CHEAP, ("text",), checks.section_headers),
+    Check("contact-info", "contact", CHEAP, ("text",), checks.contact_info),
+    Check(
+        "page-count",
+        "file",
+        CHEAP,
+        ("meta",),
+        lambda meta: checks.page_count(meta["page_count"]),
+        PDF,
+    ),
+    Check(
+        "resume-length",
+        "content",
+        CHEAP,
+        ("plumber_text", "fitz_text"),
+        lambda a, b: checks.resume_length(_longest_word_count(a, b)),
+        PDF,
+    ),
+    Check(
+        "resume-length",
+        "content",
+        CHEAP,
+        ("text",),
+        lambda text: checks.resume_length(len(text.split())),
+        DOCX,
+    ),
+    Check(
+        "font-count",
+        "typography",
+        CHEAP,
+        ("stats",),
+        lambda stats: checks.font_count(stats["font_names"]),
+        PDF,
+    ),
+    Check(
+        "tiny-font",
+        "typography",
+        CHEAP,
+        ("stats",),
+        lambda stats: checks.tiny_font(stats["tiny_char_fraction"]),
+        PDF,
+    ),
+    Check(
+        "images",
+        "layout",
+        CHEAP,
+        ("stats",),
+        lambda stats: checks.images(stats["image_count"]),
+        PDF,
+    ),
+    Check(
+        "special-characters",
+        "typography",
+        CHEAP,
+        ("both_texts",),
+        checks.special_characters,
+        PDF,
+    ),
+    Check(
+        "margins",
+        "layout",
+        CHEAP,
+        ("stats",),
+        lambda stats: checks.margins(stats["edge_text"]),
+        PDF,
+    ),
+    Check(
+        "link-only-contact",
+        "contact",
+        CHEAP,
+        ("extracted",),
+        checks.link_only_contact,
+        PDF,
+    ),
+    Check(
+        "header-footer-contact",
+        "layout",
+        EXPENSIVE,
+        ("margin_contact",),
+        checks.header_footer_contact,
+        PDF,
+    ),
+    Check(
+        "encrypted-pdf",
+        "file",
+        CHEAP,
+        ("meta",),
+        lambda meta: checks.encrypted_pdf(meta["is_encrypted"]),
+        PDF,
+    ),
+    Check("file-size", "file", CHEAP, ("size",), checks.file_size),
+    Check("filename", "file", CHEAP, ("filename",), checks.filename_check),
+    # Format-independent content & contact checks on the best text.
+    # writing-tips and quantified-bullets may decline to run (None).
+    Check("bullet-density", "content", CHEAP, ("text",), checks.bullet_density),
+    Check("quantified-bullets", "content", CHEAP, ("text",), checks.quantified_bullets),
+    Check("long-bullets", "content", CHEAP, ("text",), checks.long_bullets),
+    Check("repeated-verbs", "content", CHEAP, ("text",), checks.repeated_verbs),
+    Check("first-person", "content", CHEAP, ("text",), checks.first_person),
+    Check("buzzwords", "content", CHEAP, ("text",), checks.buzzwords),
+    Check("all-caps-lines", "content", CHEAP, ("text",), checks.all_caps_lines),
+    Check("duplicate-bullets", "content", CHEAP, ("text",), checks.duplicate_bullets),
+    Check(
+        "date-format-consistency",
+        "content",
+        CHEAP,
+        ("text",),
+        checks.date_format_consistency,
+    ),
+    Check("hyphenation-breaks", "content", CHEAP, ("text",), checks.hyphenation_breaks),
+    Check("orphan-headings", "content", CHEAP, ("text",), checks.orphan_headings),
+    Check("writing-tips", "content", CHEAP, ("text",), checks.writing_tips),
+    Check("multiple-emails", "contact", CHEAP, ("text",), checks.multiple_emails),
+    Check("broken-links", "contact", CHEAP, ("text",), checks.broken_links),
+)
+
+CHECK_IDS = tuple(dict.fromkeys(check.id for check in REGISTRY))
+CATEGORIES = tuple(dict.fromkeys(check.category for check in REGISTRY))
+_POSITION = {check_id: index for index, check_id in enumerate(CHECK_IDS)}
+_COST = {check.id: check.cost for check in REGISTRY}
+
+
+def _split(value):
+    return {part.strip() for part in value.split(",") if part.strip()}
+
+
+def selection(
+    ids: str | None = None, categories: str | None = None, cost: str | None = None
+) -> frozenset[str] | None:
+    """Check ids chosen by comma-separated query filters, or None for all.
+
+    Filters combine as an intersection; an unknown name is a 422 so a typo
+    never silently runs nothing.
+    """
+    if ids is None and categories is None and cost is None:
+        return None
+    chosen = set(CHECK_IDS)
+    for value, known, field in (
+        (ids, CHECK_IDS, "checks"),
+        (categories, CATEGORIES, "categories"),
+        (cost, COSTS, "cost"),
+    ):
+        if value is None:
+            continue
+        wanted = _split(value)
+        unknown = wanted - set(known)
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unknown {field}: {', '.join(sorted(unknown))}. "
+                f"Valid: {', '.join(known)}.",
+            )
+        chosen &= {
+            check.id
+            for check in REGISTRY
+            if wanted & {check.id, check.category, check.cost}
+        }
+    return frozenset(chosen)
+
+
+def specs(kind: str | None, selected=None, per_request: bool = False) -> list[Check]:
+    """Registry entries for one upload format (any, if None), filtered to
+    `selected` ids."""
+    return [
+        check
+        for check in REGISTRY
+        if (kind is None or kind in check.formats)
+        and check.per_request == per_request
+        and (selected is None or check.id in selected)
+    ]
+
+
+def position(result: dict) -> int:
+    """Sort key putting check results in report order."""
+    return _POSITION[result["id"]]
+
+
+def stream_position(result: dict) -> tuple[bool, int]:
+    """Sort key for streaming stored results: cheap first, then report
+    order — the order iter_run() produces them in."""
+    return _COST[result["id"]] != CHEAP, _POSITION[result["id"]]
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+class Resolver:
+    """Computes inputs on first use, from context roots and INPUTS rules."""
+
+    def __init__(self, inputs: dict, context: dict):
+        self._inputs = inputs
+        self._values = dict(context)
+        self.inputs_ms = {}
+
+    def get(self, name):
+        if name not in self._values:
+            rule = self._inputs[name]
+            args = [self.get(need) for need in rule.needs]
+            started = time.perf_counter()
+            self._values[name] = rule.compute(*args)
+            self.inputs_ms[name] = _elapsed_ms(started)
+        return self._values[name]
+
+
+def by_cost(selected_specs) -> list[Check]:
+    """Cheap checks first, each class in registry order — the streaming
+    order, so first findings arrive before the slow passes run."""
+    return sorted(selected_specs, key=lambda check: check.cost != CHEAP)
+
+
+def iter_run(selected_specs, resolver: Resolver):
+    """Run checks in order, yielding each result as soon as it exists.
+    Each result carries its own `duration_ms` (inputs are timed separately
+    in resolver.inputs_ms); checks that decline to run yield nothing."""
+    for check in selected_specs:
+        args = [resolver.get(name) for name in check.inputs]
+        started = time.perf_counter()
+        result = check.run(*args)
+        if result is not None:
+            result["duration_ms"] = _elapsed_ms(started)
+            yield result
+
+
+def run(selected_specs, resolver: Resolver) -> list[dict]:
+    return list(iter_run(selected_specs, resolver))
@@ -1,7 +1,7 @@
 """Assemble the final checklist report. Deliberately no blended score."""
 
 
-def build_report(filename, checks, extracted=None):
+def build_report(filename, checks, extracted=None, timings=None, pages=None):
     body = {
         "filename": filename,
         "checks": checks,
@@ -16,4 +16,12 @@ def build_report(filename, checks, extracted=None):
     }
     if extracted is not None:
         body["extracted"] = {k: v.model_dump() for k, v in extracted.items()}
+    if pages is not None:
+        # PDFs past the page budget are analyzed on their first pages
+        # only; "skipped" says how many the checks never saw.
+        body["pages"] = pages
+    if timings is not None:
+        # Per-check cost is on each check as duration_ms; shared inputs
+        # (parses, layout, stats) are timed once here.
+        body["timings"] = timings
     return body
@@ -2,49 +2,81 @@
 
 POST /ats/check — stateless resume parseability checker. Unauthenticated
 by design: it is pure-CPU, top-of-funnel, and rate-limited per IP.
+POST /ats/check/stream is the same report as SSE, one event per check.
+
+POST /ats/check/batch — many files or ZIPs, one NDJSON report per file
+plus aggregate stats (ats/batch.py). Requires a signed-in user.
+
+POST /ats/check/compile — compile the editor's LaTeX and check the PDF
+in one request, so the PDF is not downloaded and re-uploaded.
 
 POST /ats/extract — rules extraction plus LLM fallback for the ambiguous
 fields. Requires auth (or demo) because it spends LLM tokens.
 
+Both share one analysis per upload, cached by a hash of the bytes
+(ats/cache.py), so a re-upload or an extract after a check skips parsing.
+
 Uploads are processed entirely in memory and never written to disk
-(PII policy, see PRIVACY.md).
+(PII policy, see PRIVACY.md). Single-file uploads are refused with 413
+as soon as they pass the size limit (core/uploads.py).
 """
 
+import json
+import secrets
+
 from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from fastapi.responses import Response, StreamingResponse
 
-from ats import checks, extraction, extractors, input_handler, layout, report
+from ats import batch, battery, input_handler, pool, registry
+from ats import cache as ats_cache
 from ats.llm_fallback import resolve_low_confidence
-from core.deps import require_user_or_demo
+from core.deps import require_user_or_demo, verify_jwt
 from core.limiter import limiter
+from core.uploads import read_upload
+from schemas.export import ExportRequest
+from services import pdf_cache
+from services.export_utils import get_filename_base
+from services.latex_compiler import compile_latex_pdf, pdf_key
 
 router = APIRouter(prefix="/ats", tags=["ats"])
 
-# The editor's auto-check uploads a synthesized blob under this name; the
-# filename check would nag about it on every compile, so it is skipped.
-_SYNTHESIZED_FILENAME = "resume.pdf"
-
-
-def _text_checks(text):
-    """Format-independent content & contact checks on the best extracted
-    text, shared by the PDF and DOCX branches. Checks that decline to run
-    (writing_tips, quantified_bullets) return None and are dropped."""
-    candidates = [
-        checks.bullet_density(text),
-        checks.quantified_bullets(text),
-        checks.long_bullets(text),
-        checks.repeated_verbs(text),
-        checks.first_person(text),
-        checks.buzzwords(text),
-        checks.all_caps_lines(text),
-        checks.duplicate_bullets(text),
-        checks.date_format_consistency(text),
-        checks.hyphenation_breaks(text),
-        checks.orphan_headings(text),
-        checks.writing_tips(text),
-        checks.multiple_emails(text),
-        checks.broken_links(text),
-    ]
-    return [check for check in candidates if check is not None]
+
+_PARSE_FAILED = "Could not parse this file — it may be corrupted or password-protected."
+
+
+async def _cached_analysis(data, kind, selected):
+    """(cached analysis or None, the key a fresh one is stored under).
+
+    A cached full analysis serves any selection; a partial run is cached
+    under its own key (the selected ids appended).
+    """
+    key = ats_cache.upload_key(data, kind)
+    analysis = await ats_cache.get_analysis(key)
+    if analysis is not None:
+        return battery.select(analysis, selected), key
+    if selected is not None:
+        key += ":" + ",".join(sorted(selected))
+        analysis = await ats_cache.get_analysis(key)
+    return analysis, key
+
+
+async def _analysis(data, kind, selected=None):
+    """battery.analyze() for these bytes, from the cache when possible."""
+    analysis, key = await _cached_analysis(data, kind, selected)
+    if analysis is not None:
+        return analysis
+    try:
+        analysis = await pool.run(battery.analyze, data, kind, selected)
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=400, detail=_PARSE_FAILED)
+    await ats_cache.put_analysis(key, analysis)
+    return analysis
+
+
+def _sse(payload):
+    return f"data: {json.dumps(payload)}\n\n"
 
 
 @router.get("/roles")
@@ -55,83 +87,201 @@ async def list_roles():
     return {"roles": sorted(ROLE_KEYWORDS)}
 
 
+@router.get("/checks")
+async def list_checks():
+    """The check registry: what /ats/check's filters can select."""
+    return {
+        "checks": [
+            {
+                "id": check.id,
+                "category": check.category,
+                "cost": check.cost,
+                "formats": list(check.formats),
+            }
+            for check in registry.REGISTRY
+        ],
+        "categories": list(registry.CATEGORIES),
+    }
+
+
 @router.post("/check")
 @limiter.limit(
     "30/hour"
 )  # pure CPU; generous so the editor's auto-check per compile fits
-async def check_resume(request: Request, file: UploadFile = File(...)):
-    data = await file.read()
+async def check_resume(
+    request: Request,
+    file: UploadFile = File(...),
+    checks: str | None = None,
+    categories: str | None = None,
+    cost: str | None = None,
+):
+    """Parseability report. `checks`, `categories` and `cost` are
+    comma-separated filters (e.g. `?cost=cheap`); combined, a check must
+    match all of them."""
+    selected = registry.selection(checks, categories, cost)
+    data = await read_upload(file)
     kind = input_handler.validate_upload(file.filename, data)
 
-    try:
-        if kind == "pdf":
-            plumber_text = extractors.extract_pdf_pdfplumber(data)
-            if input_handler.is_scanned(plumber_text):
-                return report.build_report(file.filename, [checks.scanned_pdf()])
-            fitz_text = extractors.extract_pdf_pymupdf(data)
-            layout_info = layout.analyze(data)
-            stats = extractors.pdf_stats(data)
-            glued = checks.detect_glued(plumber_text, fitz_text)
-            links = extractors.extract_pdf_links(data)
-            extracted = extraction.extract_fields_rules(plumber_text, links=links)
-            results = [
-                checks.extraction_agreement(plumber_text, fitz_text, glued=glued),
-                checks.columns(layout_info["max_columns"]),
-                checks.tables(layout_info["table_count"]),
-                checks.encoding_sanity(plumber_text + fitz_text),
-                checks.content_completeness(plumber_text, fitz_text, glued=glued),
-                checks.section_headers(plumber_text),
-                checks.contact_info(plumber_text),
-                checks.page_count(stats["page_count"]),
-                # max of both extractions — glued-word extractions undercount
-                checks.resume_length(
-                    max(len(plumber_text.split()), len(fitz_text.split()))
-                ),
-                checks.font_count(stats["font_names"]),
-                checks.tiny_font(stats["tiny_char_fraction"]),
-                checks.images(stats["image_count"]),
-                checks.special_characters(plumber_text + fitz_text),
-                checks.margins(stats["edge_text"]),
-                checks.link_only_contact(extracted),
-                checks.header_footer_contact(layout.contact_in_margins(data)),
-                checks.encrypted_pdf(stats["is_encrypted"]),
-                checks.file_size(len(data)),
-            ]
-            best_text = plumber_text
-        else:
-            # ponytail: DOCX layout inspection is shallow — python-docx sees
-            # tables but not multi-column section formatting. Upgrade path:
-            # parse w:cols in the document XML.
-            # DOCX has no link annotations or page margins to inspect, so
-            # the link-only-contact and header-footer-contact checks are
-            # PDF-only.
-            text, table_count = extractors.extract_docx(data)
-            extracted = extraction.extract_fields_rules(text)
-            results = [
-                checks.extraction_agreement_single("DOCX"),
-                checks.columns(1),
-                checks.tables(table_count),
-                checks.encoding_sanity(text),
-                checks.content_completeness_single("DOCX"),
-                checks.section_headers(text),
-                checks.contact_info(text),
-                checks.resume_length(len(text.split())),
-                checks.file_size(len(data)),
-            ]
-            best_text = text
-        if file.filename != _SYNTHESIZED_FILENAME:
-            results.append(checks.filename_check(file.filename))
-        results.extend(_text_checks(best_text))
-    except HTTPException:
-        raise
-    except Exception:
-        raise HTTPException(
-            status_code=400,
-            detail="Could not parse this file — it may be corrupted or "
-            "password-protected.",
+    analysis = await _analysis(data, kind, selected)
+    return battery.build_check_report(file.filename, analysis, selected)
+
+
+@router.post("/check/stream")
+@limiter.limit("30/hour")
+async def check_resume_stream(
+    request: Request,
+    file: UploadFile = File(...),
+    checks: str | None = None,
+    categories: str | None = None,
+    cost: str | None = None,
+):
+    """/ats/check as Server-Sent Events, same filters.
+
+    Emits: data: {"event": "check", "check": {...}} per check as soon as it
+    is computed — cheap text checks first, layout passes last.
+    Final: data: {"event": "summary", ...} — the /ats/check body without
+    "checks", plus "order" (the check ids in report order).
+    On failure: data: {"event": "error", "content": "..."}.
+    """
+    selected = registry.selection(checks, categories, cost)
+    data = await read_upload(file)
+    kind = input_handler.validate_upload(file.filename, data)
+    filename = file.filename
+    cached, key = await _cached_analysis(data, kind, selected)
+    if cached is None:
+        pool.ensure_capacity()  # 503 now; once streaming, status is fixed
+
+    async def analysis_events():
+        if cached is not None:
+            for check in sorted(cached["checks"], key=registry.stream_position):
+                yield "check", check
+            yield "analysis", cached
+            return
+        async for event, payload in pool.stream(
+            battery.stream_analysis, data, kind, selected
+        ):
+            if event == "analysis":
+                await ats_cache.put_analysis(key, payload)
+            yield event, payload
+
+    async def event_stream():
+        # Per-request checks (filename) are cheap: sent right after the
+        # first byte-derived check, or before the summary if there was none.
+        pending = True
+        try:
+            async for event, payload in analysis_events():
+                if event == "check":
+                    yield _sse({"event": "check", "check": payload})
+                    if pending and payload["id"] != "scanned-pdf":
+                        for check in battery.request_checks(filename, selected):
+                            yield _sse({"event": "check", "check": check})
+                        pending = False
+                    continue
+                if pending and not payload["scanned"]:
+                    for check in battery.request_checks(filename, selected):
+                        yield _sse({"event": "check", "check": check})
+                body = battery.build_check_report(filename, payload, selected)
+                body["order"] = [check["id"] for check in body.pop("checks")]
+                yield _sse({"event": "summary", **body})
+        except HTTPException as e:
+            yield _sse({"event": "error", "content": e.detail})
+        except Exception:
+            yield _sse({"event": "error", "content": _PARSE_FAILED})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.post("/check/batch")
+@limiter.limit("20/hour")
+async def check_batch(
+    request: Request,
+    files: list[UploadFile] = File(...),
+    checks: str | None = None,
+    categories: str | None = None,
+    cost: str | None = None,
+    user: dict = Depends(verify_jwt),
+):
+    """Bulk /ats/check: .pdf/.docx files and/or .zip archives of them.
+
+    Streams application/x-ndjson — one {"index", "filename", "report"} or
+    {"index", "filename", "error"} line per document as it finishes, then
+    {"aggregate": {...}} with pass/warn/fail/info counts per check id.
+    """
+    selected = registry.selection(checks, categories, cost)
+    # Files stay spooled; each is read when its turn in the pool comes.
+    entries = batch.documents([(f.filename, f.file) for f in files])
+
+    async def ndjson():
+        async for record in batch.run(
+            entries, _analysis, selected, pool.worker_count()
+        ):
+            yield json.dumps(record) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+def _multipart(report, pdf, filename):
+    boundary = secrets.token_hex(16)
+    body = b"".join(
+        (
+            f"--{boundary}\r\nContent-Type: application/json\r\n\r\n".encode(),
+            json.dumps(report).encode(),
+            f"\r\n--{boundary}\r\nContent-Type: application/pdf\r\n"
+            f"Content-Disposition: attachment; filename={filename}\r\n\r\n".encode(),
+            pdf,
+            f"\r\n--{boundary}--\r\n".encode(),
         )
+    )
+    return Response(body, media_type=f"multipart/mixed; boundary={boundary}")
+
+
+@router.post("/check/compile")
+@limiter.limit("20/hour")  # compiles, like /export-resume
+async def compile_and_check(
+    request: Request,
+    body: ExportRequest,
+    checks: str | None = None,
+    categories: str | None = None,
+    cost: str | None = None,
+    user: dict = Depends(require_user_or_demo),
+):
+    """/export-resume's PDF and its /ats/check report, in one request.
 
-    return report.build_report(file.filename, results, extracted)
+    Same body as /export-resume (LaTeX, or Markdown to convert) and the
+    same filters as /ats/check. Returns JSON {"filename", "pdf_key",
+    "report"}; fetch the PDF from GET /export-resume/pdf/{pdf_key}, which
+    is null unless the PDF is in Redis — too large to cache, or Redis down,
+    and another worker could not serve it. With `Accept: multipart/mixed`
+    the response carries both instead: the report as application/json,
+    then the PDF.
+    """
+    selected = registry.selection(checks, categories, cost)
+    source = body.latex_content or body.markdown_content
+    try:
+        pdf = await compile_latex_pdf(source)
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to compile resume: {e!s}")
+    analysis = await _analysis(pdf, "pdf", selected)
+    report = battery.build_check_report(
+        battery.SYNTHESIZED_FILENAME, analysis, selected
+    )
+    filename = f"{get_filename_base(body.markdown_content)}.pdf"
+    if "multipart/mixed" in request.headers.get("accept", ""):
+        return _multipart(report, pdf, filename)
+    key = pdf_key(source)
+    return {
+        "filename": filename,
+        "pdf_key": key if await pdf_cache.is_shared(key) else None,
+        "report": report,
+    }
 
 
 @router.post("/extract")
@@ -139,39 +289,32 @@ async def check_resume(request: Request, file: UploadFile = File(...)):
 async def extract_fields(
     request: Request,
     file: UploadFile = File(...),
+    refresh: bool = False,
     user: dict = Depends(require_user_or_demo),
 ):
-    data = await file.read()
+    """Rules extraction plus the LLM pass for ambiguous fields. LLM samples
+    are cached per text; `?refresh=true` asks the model again."""
+    data = await read_upload(file)
     kind = input_handler.validate_upload(file.filename, data)
 
-    links = None
-    try:
-        if kind == "pdf":
-            # Same best-text choice as /ats/check: pdfplumber's extraction.
-            text = extractors.extract_pdf_pdfplumber(data)
-            if input_handler.is_scanned(text):
-                raise HTTPException(
-                    status_code=422,
-                    detail="This PDF has no extractable text — it looks like a "
-                    "scan or photo export. AI field extraction needs real text; "
-                    "export a text-based PDF from your editor.",
-                )
-            # Same link-annotation fallback as /ats/check, so the AI resolve
-            # pass never erases a link-recovered contact field client-side.
-            links = extractors.extract_pdf_links(data)
-        else:
-            text, _ = extractors.extract_docx(data)
-    except HTTPException:
-        raise
-    except Exception:
+    # Same best text (pdfplumber's) and link-annotation fallback as
+    # /ats/check, so the AI resolve pass never erases a link-recovered
+    # contact field client-side.
+    analysis = await _analysis(data, kind)
+    if analysis["scanned"]:
         raise HTTPException(
-            status_code=400,
-            detail="Could not parse this file — it may be corrupted or "
-            "password-protected.",
+            status_code=422,
+            detail="This PDF has no extractable text — it looks like a "
+            "scan or photo export. AI field extraction needs real text; "
+            "export a text-based PDF from your editor.",
         )
 
-    rules = extraction.extract_fields_rules(text, links=links)
-    resolved = await resolve_low_confidence(text, rules, demo=user.get("demo", False))
+    resolved = await resolve_low_confidence(
+        analysis["text"],
+        battery.fields(analysis),
+        demo=user.get("demo", False),
+        refresh=refresh,
+    )
     return {
         "filename": file.filename,
         "extracted": {field: result.model_dump() for field, result in resolved.items()},
@@ -0,0 +1,132 @@
+"""Fast difflib ratio for extraction agreement.
+
+ratio(a, b) returns exactly difflib.SequenceMatcher(None, a, b).ratio() —
+default autojunk included, which is what AGREEMENT_PASS/WARN were
+calibrated against — without difflib's quadratic longest-match search.
+
+difflib's definition, which this reproduces step by step:
+
+- Autojunk: for len(b) >= 200, characters occurring more than
+  len(b) // 100 + 1 times in b are "popular" (on a resume, most letters
+  and the space). A match can only be *seeded* on rare characters.
+- find_longest_match: the longest run of rare characters common to both
+  ranges — earliest in a, then earliest in b — extended both ways over
+  any equal characters, popular ones included. With no seed, the common
+  prefix of the two ranges is the match.
+- get_matching_blocks: recurse left and right of each match;
+  ratio = 2 * matched / (len(a) + len(b)).
+
+The difference is the search. difflib's dynamic programme visits every
+pair of equal rare characters in the range, per call. Here the seed
+length is binary-searched: a seed of length k exists iff some rare
+k-gram of a's range starts at a position of the same k-gram in b's
+range, looked up in a per-k index of b built once. Rare runs are short
+(a handful of characters in Latin text), so each call costs a few
+passes over a's rare positions.
+
+Tolerance: none — tests/test_ats_similarity.py asserts equality with
+difflib on the extraction fixtures and on random strings. A 10k-character
+extraction takes ~5 ms instead of ~75 ms, a glued one ~12 ms instead of
+~120 ms (python -m scripts.bench_similarity).
+"""
+
+import bisect
+from collections import Counter
+
+AUTOJUNK_MIN_LEN = 200  # difflib only junks popular characters from here
+
+
+def ratio(a: str, b: str) -> float:
+    """difflib.SequenceMatcher(None, a, b).ratio(), in [0, 1]."""
+    total = len(a) + len(b)
+    if not total:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    aligner = _Aligner(a, b)
+    matched = 0
+    queue = [(0, len(a), 0, len(b))]
+    while queue:
+        alo, ahi, blo, bhi = queue.pop()
+        i, j, k = aligner.longest_match(alo, ahi, blo, bhi)
+        if k:
+            matched += k
+            if alo < i and blo < j:
+                queue.append((alo, i, blo, j))
+            if i + k < ahi and j + k < bhi:
+                queue.append((i + k, ahi, j + k, bhi))
+    return 2 * matched / total
+
+
+def _rare_runs(text: str, popular: set) -> list[int]:
+    """run[i]: how many characters from i on are not popular."""
+    run = [0] * (len(text) + 1)
+    for i in range(len(text) - 1, -1, -1):
+        if text[i] not in popular:
+            run[i] = run[i + 1] + 1
+    return run
+
+
+class _Aligner:
+    def __init__(self, a: str, b: str):
+        self.a, self.b = a, b
+        popular = set()
+        if len(b) >= AUTOJUNK_MIN_LEN:
+            limit = len(b) // 100 + 1
+            popular = {char for char, n in Counter(b).items() if n > limit}
+        self.run_a = _rare_runs(a, popular)
+        self.run_b = _rare_runs(b, popular)
+        self.rare_a = [i for i in range(len(a)) if self.run_a[i]]
+        self.max_run = min(max(self.run_a), max(self.run_b))
+        self._indexes = {}
+
+    def _index(self, k: int) -> dict[str, list[int]]:
+        """Rare k-grams of b -> their start positions, ascending."""
+        index = self._indexes.get(k)
+        if index is None:
+            index = self._indexes[k] = {}
+            b, run_b = self.b, self.run_b
+            for j in range(len(b)):
+                if run_b[j] >= k:
+                    index.setdefault(b[j : j + k], []).append(j)
+        return index
+
+    def _seed(self, alo, ahi, blo, bhi, k) -> tuple[int, int] | None:
+        """Earliest (i, j) of a rare k-gram common to both ranges."""
+        a, run_a, rare_a = self.a, self.run_a, self.rare_a
+        index = self._index(k)
+        for slot in range(bisect.bisect_left(rare_a, alo), len(rare_a)):
+            i = rare_a[slot]
+            if i + k > ahi:
+                break
+            if run_a[i] < k:
+                continue
+            starts = index.get(a[i : i + k])
+            if starts is None:
+                continue
+            first = bisect.bisect_left(starts, blo)
+            if first < len(starts) and starts[first] + k <= bhi:
+                return i, starts[first]
+        return None
+
+    def longest_match(self, alo, ahi, blo, bhi) -> tuple[int, int, int]:
+        """difflib's find_longest_match(alo, ahi, blo, bhi)."""
+        a, b = self.a, self.b
+        seed = self._seed(alo, ahi, blo, bhi, 1)
+        if seed is None:
+            i, j, k = alo, blo, 0
+        else:
+            low, high = 1, min(ahi - alo, bhi - blo, self.max_run)
+            while low < high:
+                mid = (low + high + 1) // 2
+                found = self._seed(alo, ahi, blo, bhi, mid)
+                if found is None:
+                    high = mid - 1
+                else:
+                    low, seed = mid, found
+            (i, j), k = seed, low
+            while i > alo and j > blo and a[i - 1] == b[j - 1]:
+                i, j, k = i - 1, j - 1, k + 1
+        while i + k < ahi and j + k < bhi and a[i + k] == b[j + k]:
+            k += 1
+        return i, j, k
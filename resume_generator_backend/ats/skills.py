@@ -3,11 +3,21 @@
 Flat keyword matching only — no ML, no fuzzy matching. Matching is
 case-insensitive with word boundaries; multi-word terms are matched as
 plain substrings with the same boundaries.
+
+All terms are matched in one pass over the text: SkillMatcher folds the
+taxonomy into a character trie and walks it from every word start, so
+the cost depends on the text, not on how many terms the taxonomy holds
+(one regex per term grew linearly with it —
+python -m scripts.bench_skills compares the two on a 5,000-term list).
+
+KeywordIndex adds ALIASES on top ("K8s" counts as Kubernetes, "MySQL" as
+SQL) for scoring a resume against a role's keyword list.
 """
 
 # Keyword lists adapted from 5hivam123/smart-resume-analyzer (MIT)
 
-import re
+from collections import defaultdict
+from dataclasses import dataclass
 
 ROLE_KEYWORDS = {
     "Software Developer (SDE)": [
@@ -240,15 +250,157 @@ TAXONOMY = sorted(
 )
 
 
-def _term_pattern(term):
+# Other spellings that count as a taxonomy term when scoring a resume
+# against a role. An alias may credit several terms ("DSA") and may itself
+# be a term ("Terraform" also shows Infrastructure as Code).
+ALIASES = {
+    "A/B Testing": ("A/B Tests", "AB Testing"),
+    "Algorithms": ("DSA",),
+    "AWS": ("Amazon Web Services",),
+    "CI/CD": (
+        "CI / CD",
+        "Continuous Integration",
+        "Continuous Delivery",
+        "Continuous Deployment",
+    ),
+    "Dashboards": ("Dashboard",),
+    "Data Structures": ("DSA",),
+    "Data Visualization": ("Data Viz",),
+    "Design Patterns": ("Design Pattern",),
+    "Fine-tuning": ("Fine tuning", "Finetuning"),
+    "GCP": ("Google Cloud", "Google Cloud Platform"),
+    "Hugging Face": ("HuggingFace",),
+    "Infrastructure as Code": ("IaC", "Terraform"),
+    "JavaScript": ("JS", "ES6"),
+    "Kubernetes": ("K8s",),
+    "LLM": ("LLMs", "Large Language Model", "Large Language Models"),
+    "Load Balancing": ("Load Balancer", "Load Balancers"),
+    "Machine Learning": ("ML",),
+    "Microservices": ("Microservice", "Micro-services"),
+    "MS Office": ("Microsoft Office",),
+    "Multithreading": ("Multi-threading", "Concurrency"),
+    "Next.js": ("NextJS",),
+    "NLP": ("Natural Language Processing",),
+    "Node.js": ("NodeJS", "Node JS"),
+    "NoSQL": ("MongoDB", "DynamoDB", "Cassandra"),
+    "OOP": ("Object-Oriented Programming", "Object Oriented Programming"),
+    "PostgreSQL": ("Postgres",),
+    "Power BI": ("PowerBI",),
+    "RAG": ("Retrieval-Augmented Generation", "Retrieval Augmented Generation"),
+    "React": ("ReactJS", "React.js"),
+    "REST API": ("REST APIs", "RESTful", "REST"),
+    "Scikit-learn": ("sklearn", "scikit learn"),
+    "Spring Boot": ("SpringBoot",),
+    "SQL": ("MySQL", "PostgreSQL", "Postgres", "SQLite", "T-SQL"),
+    "Tailwind CSS": ("Tailwind", "TailwindCSS"),
+    "UI/UX": ("UX", "UI Design", "UX Design"),
+    "Unit Testing": ("Unit Tests", "pytest", "JUnit"),
+    "Vector Database": ("Vector DB", "Vector Databases"),
+    "WebSockets": ("WebSocket",),
+}
+
+
+@dataclass(frozen=True)
+class SkillMatch:
+    term: str
+    start: int
+    end: int
+
+
+def _is_word(char):
     # \w-style boundaries that also treat + and # as word characters so
     # "C++" does not match inside "C++11" and "Java" not inside "JavaScript".
-    return re.compile(r"(?<![\w+#])" + re.escape(term) + r"(?![\w+#])", re.IGNORECASE)
+    # Same semantics as (?<![\w+#])term(?![\w+#]) with re.IGNORECASE.
+    return char.isalnum() or char in "_+#"
+
+
+class SkillMatcher:
+    """Case-insensitive, boundary-aware matcher for a fixed list of terms."""
+
+    def __init__(self, terms):
+        self.terms = list(terms)
+        self._order = {term: rank for rank, term in enumerate(self.terms)}
+        self._root = {}
+        for term in self.terms:
+            node = self._root
+            for char in term:
+                node = node.setdefault(char.lower(), {})
+            node[None] = term  # None never collides with a character edge
+
+    def find(self, text: str) -> list[SkillMatch]:
+        """Every term occurrence, by start then length. Overlapping matches
+        are all reported ("React" and "React Native" at the same start,
+        "CSS" inside "Tailwind CSS")."""
+        folded = [char.lower() for char in text]
+        length = len(text)
+        root = self._root
+        matches = []
+        for start in range(length):
+            node = root.get(folded[start])
+            if node is None or (start and _is_word(text[start - 1])):
+                continue
+            end = start + 1
+            while True:
+                term = node.get(None)
+                if term is not None and (end == length or not _is_word(text[end])):
+                    matches.append(SkillMatch(term, start, end))
+                if end == length:
+                    break
+                node = node.get(folded[end])
+                if node is None:
+                    break
+                end += 1
+        return matches
+
+    def extract(self, text: str) -> list[str]:
+        """Distinct terms present in the text, in the matcher's term order."""
+        found = {match.term for match in self.find(text)}
+        return sorted(found, key=self._order.__getitem__)
+
 
+_MATCHER = SkillMatcher(TAXONOMY)
 
-_PATTERNS = [(term, _term_pattern(term)) for term in TAXONOMY]
+
+def find_skills(text: str) -> list[SkillMatch]:
+    """Every taxonomy term occurrence in the text, with its span."""
+    return _MATCHER.find(text)
 
 
 def extract_skills(text: str) -> list[str]:
     """Return the sorted taxonomy terms present in the text."""
-    return [term for term, pattern in _PATTERNS if pattern.search(text)]
+    return _MATCHER.extract(text)
+
+
+class KeywordIndex:
+    """Which taxonomy terms a text shows, directly or through an alias."""
+
+    def __init__(self, terms, aliases):
+        self._credits = defaultdict(set)  # folded spelling -> terms it shows
+        for term in terms:
+            self._credits[term.lower()].add(term)
+        for term, names in aliases.items():
+            for name in names:
+                self._credits[name.lower()].add(term)
+        self._matcher = SkillMatcher(self._credits)
+
+    def find(self, text: str) -> list[tuple[SkillMatch, set[str]]]:
+        """Every spelling occurrence, with the terms it shows."""
+        return [
+            (match, self._credits[match.term]) for match in self._matcher.find(text)
+        ]
+
+    def present(self, text: str) -> set[str]:
+        return {term for _match, terms in self.find(text) for term in terms}
+
+
+_INDEX = KeywordIndex(TAXONOMY, ALIASES)
+
+
+def keywords_in(text: str) -> set[str]:
+    """Taxonomy terms the text shows, counting ALIASES."""
+    return _INDEX.present(text)
+
+
+def find_keywords(text: str) -> list[tuple[SkillMatch, set[str]]]:
+    """Every taxonomy or alias spelling in the text, with the terms it shows."""
+    return _INDEX.find(text)
@@ -9,7 +9,8 @@ as tunable constants, not ground truth.
 MAX_FILE_BYTES = 5 * 1024 * 1024  # 5 MB upload cap
 SCANNED_MIN_CHARS = 100  # fewer extracted chars than this => scanned/image PDF
 
-# extraction-agreement (difflib.SequenceMatcher ratio, normalized text)
+# extraction-agreement (ats.similarity.ratio — equal to difflib's default
+# SequenceMatcher ratio on normalized text, which these were set against)
 AGREEMENT_PASS = 0.90
 AGREEMENT_WARN = 0.75  # below this => fail
 
@@ -1,20 +1,40 @@
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
+from ats import pool as ats_pool
 from core.limiter import limiter
 from core.logging import EventLoggingSubscriber, RequestResponseMiddleware
+from core.uploads import UploadLimitMiddleware
 from services.events import bus
+from services.genrate_resume import close_async_client
+from services.http_clients import close_http_clients, open_http_clients
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    open_http_clients()
+    ats_pool.start_pool()
+    yield
+    ats_pool.shutdown_pool()
+    # Shared outbound clients hold keep-alive pools; close them on shutdown.
+    await close_http_clients()
+    await close_async_client()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Resume-Libre API", version="2.1.0")
+    app = FastAPI(title="Resume-Libre API", version="2.1.0", lifespan=lifespan)
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+    # ─── Upload size ceiling ─────────────────────────────
+    # Innermost, so its 413 still gets CORS headers and is logged.
+    app.add_middleware(UploadLimitMiddleware)
+
     # ─── CORS ────────────────────────────────────────────
     # Comma-separated production origins via ALLOWED_ORIGINS,
     # e.g. ALLOWED_ORIGINS=https://resumelibre.com
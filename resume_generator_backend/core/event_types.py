@@ -6,6 +6,7 @@ class Events:
 
     # Pipeline events
     README_FETCHED = "readme:fetched"
+    PROFILES_DROPPED = "profiles:dropped"
     PROMPT_BUILT = "prompt:built"
     LLM_GENERATING = "llm:generating"
     LLM_TOKEN = "llm:token"
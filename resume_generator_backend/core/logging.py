@@ -27,6 +27,7 @@ class EventLoggingSubscriber:
 
     _ALL_EVENTS = [
         Events.README_FETCHED,
+        Events.PROFILES_DROPPED,
         Events.PROMPT_BUILT,
         Events.LLM_GENERATING,
         Events.LLM_TOKEN,
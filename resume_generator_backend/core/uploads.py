@@ -0,0 +1,117 @@
+"""Bounded reads of single-file uploads.
+
+Starlette parses a multipart body in full — spooling the file to memory,
+then to a temp file past 1 MB — before an endpoint runs, so a size check
+in the endpoint comes after the whole upload has been received. With a
+512 MB container, a handful of concurrent 100 MB uploads would exhaust it
+before validate_upload's 413 could fire.
+
+UploadLimitMiddleware sits in front of the upload routes. It answers 413
+from the Content-Length header without reading the body and, for chunked
+uploads, counts bytes as they arrive and refuses at the ceiling — one
+file's worth for the single-file routes, ATS_BATCH_MAX_BYTES for
+/ats/check/batch. read_upload() then reads the accepted file with one capped read
+into a single `bytes` — the buffer PyMuPDF maps without copying and
+pdfplumber/pypdf wrap in a BytesIO view — and closes the spool at once.
+"""
+
+import json
+import os
+
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from ats.input_handler import FILE_TOO_LARGE
+from ats.thresholds import MAX_FILE_BYTES
+
+# Boundaries, part headers and the small form fields around the file.
+MULTIPART_OVERHEAD = 64 * 1024
+
+BATCH_MAX_BYTES = int(os.getenv("ATS_BATCH_MAX_BYTES", str(100 * 1024 * 1024)))
+BATCH_TOO_LARGE = (
+    f"Batch too large — at most {BATCH_MAX_BYTES // (1024 * 1024)} MB per request."
+)
+
+_SINGLE_FILE = (MAX_FILE_BYTES + MULTIPART_OVERHEAD, FILE_TOO_LARGE)
+
+# path -> (body ceiling in bytes, 413 detail)
+UPLOAD_LIMITS = {
+    "/ats/check": _SINGLE_FILE,
+    "/ats/check/stream": _SINGLE_FILE,
+    "/ats/extract": _SINGLE_FILE,
+    "/extract-resume": _SINGLE_FILE,
+    "/ats/check/batch": (BATCH_MAX_BYTES, BATCH_TOO_LARGE),
+}
+
+
+async def _refuse(send, detail):
+    body = json.dumps({"detail": detail}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class UploadLimitMiddleware:
+    """413 for request bodies over their path's ceiling, before parsing."""
+
+    def __init__(self, app, limits=None):
+        self.app = app
+        self.limits = UPLOAD_LIMITS if limits is None else limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        max_bytes, detail = limit
+        declared = Headers(scope=scope).get("content-length", "")
+        if declared.isdigit() and int(declared) > max_bytes:
+            await _refuse(send, detail)
+            return
+
+        received = 0
+        refused = False
+
+        async def limited_receive():
+            nonlocal received, refused
+            if refused:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    # Answer now; the app sees a disconnect and its own
+                    # (error) response is dropped.
+                    refused = True
+                    await _refuse(send, detail)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            if not refused:
+                await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
+
+
+async def read_upload(file: UploadFile, max_bytes: int = MAX_FILE_BYTES) -> bytes:
+    """The upload's bytes, or 413 past `max_bytes` without reading further."""
+    if file.size is not None and file.size > max_bytes:
+        await file.close()
+        raise HTTPException(status_code=413, detail=FILE_TOO_LARGE)
+    try:
+        data = await file.read(max_bytes + 1)
+    finally:
+        await file.close()  # the spool is a second copy; drop it now
+    if len(data) > max_bytes:
+        raise HTTPException(status_code=413, detail=FILE_TOO_LARGE)
+    return data
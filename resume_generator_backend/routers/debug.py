@@ -22,6 +22,7 @@ class DebugEventRelay:
 
     _ALL_EVENTS = [
         Events.README_FETCHED,
+        Events.PROFILES_DROPPED,
         Events.PROMPT_BUILT,
         Events.LLM_GENERATING,
         Events.LLM_TOKEN,
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Path, Request
 from fastapi.responses import Response
 
 from core.deps import require_user_or_demo
 from core.limiter import limiter
 from schemas.export import ExportRequest
+from services import pdf_cache
 from services.export_utils import (
     get_filename_base,
     latex_to_pdf,
@@ -54,3 +55,17 @@ async def export_resume(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to export resume: {e!s}")
+
+
+@router.get("/export-resume/pdf/{key}")
+async def cached_pdf(
+    key: str = Path(pattern=r"^[0-9a-f]{64}$"),
+    user: dict = Depends(require_user_or_demo),
+):
+    """A compiled PDF by the pdf_key /ats/check/compile returned."""
+    pdf = await pdf_cache.get_pdf(key)
+    if pdf is None:
+        raise HTTPException(
+            status_code=404, detail="This PDF has expired — compile it again."
+        )
+    return Response(content=pdf, media_type="application/pdf")
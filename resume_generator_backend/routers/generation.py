@@ -9,6 +9,7 @@ from fastapi.responses import StreamingResponse
 from core.deps import require_user_or_demo
 from core.event_types import Events
 from core.limiter import limiter
+from core.uploads import read_upload
 from schemas.resume import AtsScoreRequest, ProfileRef, ResumeRequest, ResumeResponse
 from services.ats_score import analyze_ats
 from services.events import bus
@@ -183,14 +184,19 @@ async def stream_resume_generation(
 async def analyze_ats_score(
     request: Request,
     body: AtsScoreRequest,
+    refresh: bool = False,
     user: dict = Depends(require_user_or_demo),
 ):
-    """Score how well a resume matches a job description (ATS keywords)."""
+    """Score how well a resume matches a job description (ATS keywords).
+    Scored locally; the LLM advises on the gaps for a job description
+    (or with `"suggestions": true` for a target role), served from the LLM cache on repeats (`?refresh=true` asks again)."""
     result = await analyze_ats(
         resume_text=body.resume_text,
         job_description=body.job_description,
         target_role=body.target_role,
         demo=user.get("demo", False),
+        refresh=refresh,
+        suggestions=body.suggestions,
     )
     return result.model_dump()
 
@@ -201,7 +207,7 @@ async def extract_resume(
     user: dict = Depends(require_user_or_demo),
 ):
     try:
-        content = await file.read()
+        content = await read_upload(file)
 
         if file.filename.endswith(".pdf"):
             pdf_reader = pypdf.PdfReader(io.BytesIO(content))
@@ -1,8 +1,12 @@
 from fastapi import APIRouter, HTTPException
 
+from ats import cache as ats_cache
+from ats import pool as ats_pool
 from core.deps import is_demo_mode
 from schemas.export import SystemPromptResponse
+from services import llm_cache, pdf_cache, profile_cache, singleflight
 from services.genrate_resume import load_system_prompt
+from services.http_clients import pool_stats
 
 router = APIRouter(tags=["health"])
 
@@ -14,6 +18,8 @@ async def root():
         "version": "2.1.0",
         "endpoints": {
             "/health": "GET - Health check",
+            "/health/pools": "GET - Outbound connection pool stats",
+            "/health/caches": "GET - Cache hit/miss stats",
             "/get-system-prompt": "GET - Get system prompt",
             "/generate-resume": "POST - Generate resume",
             "/generate-resume-stream": "GET - Stream resume generation (SSE)",
@@ -29,6 +35,25 @@ async def health_check():
     return {"status": "healthy", "service": "resume-libre", "demo": is_demo_mode()}
 
 
+@router.get("/health/pools")
+async def health_pools():
+    """Outbound keep-alive connections per integration and host, plus the
+    ATS worker pool's occupancy."""
+    return {"pools": pool_stats(), "ats_workers": ats_pool.stats()}
+
+
+@router.get("/health/caches")
+async def health_caches():
+    """Hit/miss counters and memory-tier size per cache (this worker only)."""
+    return {
+        "pdf": pdf_cache.stats(),
+        "ats": ats_cache.stats(),
+        "llm": llm_cache.stats(),
+        "profiles": profile_cache.stats(),
+        "singleflight": singleflight.stats(),
+    }
+
+
 @router.get("/get-system-prompt", response_model=SystemPromptResponse)
 async def get_system_prompt():
     try:
@@ -33,6 +33,10 @@ class AtsScoreRequest(BaseModel):
     resume_text: str = Field(min_length=100, max_length=60_000)
     job_description: str | None = Field(None, min_length=30, max_length=30_000)
     target_role: str | None = Field(None, max_length=60)
+    # Keywords are matched locally; this has the LLM write tailored
+    # suggestions for the missing ones. Unset means on for a job
+    # description (as before local scoring) and off for a target role.
+    suggestions: bool | None = None
 
     @model_validator(mode="after")
     def _exactly_one_basis(self):
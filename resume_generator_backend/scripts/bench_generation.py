@@ -0,0 +1,217 @@
+"""Load benchmark for streaming generation on a single worker.
+
+Starts a local fake OpenRouter (an OpenAI-compatible SSE endpoint that
+drips tokens with a fixed per-token delay) in a background thread, points
+the shared async LLM client at it via OPENROUTER_BASE_URL, and runs N
+concurrent generate_resume_stream() calls on ONE event loop — the situation
+of one uvicorn worker serving N users at once.
+
+A ticker coroutine runs alongside the streams and records how late each of
+its wake-ups fires. That lag is what /health and /ats/check would see on
+the same worker: near zero when streaming is non-blocking, roughly the
+whole stream duration when it is not.
+
+Run from resume_generator_backend/:
+
+    python -m scripts.bench_generation --streams 1 5 20 --tokens 200 --delay-ms 10
+
+Wall time should stay close to the single-stream time as N grows.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+_COLUMNS = (
+    ("streams", 8),
+    ("wall_s", 8),
+    ("ttft_ms_p50", 12),
+    ("stream_s_p50", 13),
+    ("loop_lag_ms_max", 16),
+)
+_TICK_SECONDS = 0.01
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _fake_openrouter(tokens, delay):
+    """OpenAI-compatible /chat/completions that streams `tokens`."""
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+
+    app = FastAPI()
+
+    def chunk(payload):
+        return f"data: {json.dumps(payload)}\n\n"
+
+    @app.post("/chat/completions")
+    async def completions():
+        async def stream():
+            for token in tokens:
+                await asyncio.sleep(delay)
+                yield chunk(
+                    {
+                        "id": "bench",
+                        "object": "chat.completion.chunk",
+                        "created": 0,
+                        "model": "bench",
+                        "choices": [
+                            {
+                                "index": 0,
+                                "delta": {"content": token},
+                                "finish_reason": None,
+                            }
+                        ],
+                    }
+                )
+            yield chunk(
+                {
+                    "id": "bench",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": "bench",
+                    "choices": [],
+                    "usage": {
+                        "prompt_tokens": 1,
+                        "completion_tokens": len(tokens),
+                        "total_tokens": len(tokens) + 1,
+                    },
+                }
+            )
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+def _start_server(app, port):
+    import uvicorn
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def _split(text, count):
+    size = max(1, len(text) // count)
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+async def _one_stream():
+    from services.genrate_resume import generate_resume_stream
+
+    started = time.perf_counter()
+    first = None
+    async for _token in generate_resume_stream("benchmark prompt"):
+        if first is None:
+            first = time.perf_counter() - started
+    return first, time.perf_counter() - started
+
+
+async def _run(streams):
+    lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal lag
+        while not done.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(_TICK_SECONDS)
+            lag = max(lag, time.perf_counter() - before - _TICK_SECONDS)
+
+    tick_task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    results = await asyncio.gather(*(_one_stream() for _ in range(streams)))
+    wall = time.perf_counter() - started
+    done.set()
+    await tick_task
+    return {
+        "streams": streams,
+        "wall_s": wall,
+        "ttft_ms_p50": statistics.median(r[0] for r in results) * 1000,
+        "stream_s_p50": statistics.median(r[1] for r in results),
+        "loop_lag_ms_max": lag * 1000,
+    }
+
+
+def _print_table(rows):
+    header = "  ".join(name.ljust(width) for name, width in _COLUMNS)
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        cells = []
+        for name, width in _COLUMNS:
+            value = row[name]
+            text = f"{value:.3f}" if isinstance(value, float) else str(value)
+            cells.append(text.ljust(width))
+        print("  ".join(cells))
+
+
+async def _bench(levels):
+    from services.genrate_resume import close_async_client
+
+    try:
+        await _one_stream()  # warm-up: client construction, imports, first connect
+        return [await _run(streams) for streams in levels]
+    finally:
+        await close_async_client()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--streams",
+        type=int,
+        nargs="+",
+        default=[1, 5, 20],
+        help="concurrency levels to run (default: 1 5 20)",
+    )
+    parser.add_argument(
+        "--tokens", type=int, default=200, help="tokens per fake stream"
+    )
+    parser.add_argument(
+        "--delay-ms", type=float, default=10, help="fake per-token network delay"
+    )
+    args = parser.parse_args(argv)
+
+    from services.genrate_resume import _load_demo_resume
+
+    port = _free_port()
+    tokens = _split(_load_demo_resume(), args.tokens)
+    server, thread = _start_server(_fake_openrouter(tokens, args.delay_ms / 1000), port)
+    os.environ["OPENROUTER_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+
+    try:
+        rows = asyncio.run(_bench(args.streams))
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+    print(
+        f"fake OpenRouter: {len(tokens)} tokens/stream, "
+        f"{args.delay_ms:g} ms/token (~{len(tokens) * args.delay_ms / 1000:.1f}s "
+        "per stream)"
+    )
+    _print_table(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Cold vs warm compile time per template against a running latex-service.
+
+latex-service dumps a shipped preamble into a TeX format once it has
+compiled it FORMAT_BUILD_AFTER times; later compiles with that preamble
+load the format and typeset only the body. For every template in
+templates/ plus the article preamble md_to_latex() emits, this script:
+
+1. times one compile with a \\def nonce in the preamble — not a shipped
+   preamble, so always a full (cold) compile,
+2. recompiles the document as is until the service answers X-Format: warm,
+3. times --warm-runs more compiles.
+
+Times come from the service's X-Compile-ms header, so queue wait and the
+HTTP round trip are excluded.
+
+Run from resume_generator_backend/ with the sidecar up (docker compose up
+latex-service, or LATEX_SERVICE_URL pointing at one):
+
+    python -m scripts.bench_latex_formats --warm-runs 5
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import uuid
+from pathlib import Path
+
+import httpx
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "templates"
+
+_COLUMNS = (
+    ("template", 22),
+    ("cold_ms", 9),
+    ("warm_ms_p50", 12),
+    ("speedup", 8),
+    ("warm_after", 11),
+)
+_PLACEHOLDER_RE = re.compile(r"\{\{([A-Z0-9_]+)\}\}")
+_MAX_WARMUP_COMPILES = 6
+
+_ARTICLE_SAMPLE = """# Jane Doe
+jane@example.com | github.com/janedoe
+
+## Experience
+- **Backend Engineer**, Example Corp — built the billing pipeline
+- Cut p95 latency by 40% with request coalescing
+
+## Skills
+Python, FastAPI, PostgreSQL, Redis
+"""
+
+
+def _documents():
+    """(name, latex) for each template with placeholders filled in."""
+    from services.latex_compiler import md_to_latex
+
+    docs = [("article (md_to_latex)", md_to_latex(_ARTICLE_SAMPLE))]
+    for path in sorted(TEMPLATES_DIR.glob("*.tex")):
+        text = path.read_text(encoding="utf-8")
+        filled = _PLACEHOLDER_RE.sub(
+            lambda m: m.group(1).replace("_", " ").title(), text
+        )
+        docs.append((path.stem, filled))
+    return docs
+
+
+def _with_nonce(latex):
+    idx = latex.index("\\documentclass")
+    nonce = f"\\def\\benchnonce{{{uuid.uuid4().hex}}}\n"
+    return latex[:idx] + nonce + latex[idx:]
+
+
+def _compile(client, url, latex):
+    resp = client.post(f"{url}/compile", json={"latex": latex})
+    resp.raise_for_status()
+    return int(resp.headers["X-Compile-ms"]), resp.headers.get("X-Format", "cold")
+
+
+def _bench_one(client, url, name, latex, warm_runs):
+    cold_ms, _ = _compile(client, url, _with_nonce(latex))
+    warm_after = None
+    for attempt in range(1, _MAX_WARMUP_COMPILES + 1):
+        _, mode = _compile(client, url, latex)
+        if mode == "warm":
+            warm_after = attempt
+            break
+    if warm_after is None:
+        return {
+            "template": name,
+            "cold_ms": cold_ms,
+            "warm_ms_p50": "-",
+            "speedup": "-",
+            "warm_after": "never",
+        }
+    warm = [_compile(client, url, latex)[0] for _ in range(warm_runs)]
+    p50 = statistics.median(warm)
+    return {
+        "template": name,
+        "cold_ms": cold_ms,
+        "warm_ms_p50": p50,
+        "speedup": cold_ms / p50 if p50 else 0.0,
+        "warm_after": warm_after,
+    }
+
+
+def _print_table(rows):
+    header = "  ".join(name.ljust(width) for name, width in _COLUMNS)
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        cells = []
+        for name, width in _COLUMNS:
+            value = row[name]
+            text = f"{value:.1f}" if isinstance(value, float) else str(value)
+            cells.append(text.ljust(width))
+        print("  ".join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--url",
+        default=os.getenv("LATEX_SERVICE_URL", "http://localhost:8000"),
+        help="latex-service base URL (default: $LATEX_SERVICE_URL or localhost)",
+    )
+    parser.add_argument(
+        "--warm-runs", type=int, default=3, help="timed compiles once warm"
+    )
+    args = parser.parse_args(argv)
+
+    rows = []
+    with httpx.Client(timeout=310) as client:
+        for name, latex in _documents():
+            rows.append(_bench_one(client, args.url, name, latex, args.warm_runs))
+    _print_table(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Cost of the extraction-agreement ratio: ats.similarity vs difflib.
+
+Builds two extractions of the same synthetic resume text — the second
+with light per-line noise (dropped bullets, glued words, swapped lines),
+as pdfplumber and PyMuPDF disagree in practice — at each --chars length,
+and times:
+
+- fast: ats.similarity.ratio(), what the content checks now use;
+- difflib: SequenceMatcher(None, a, b).ratio(), the value it must equal,
+  skipped above --difflib-max chars because it is quadratic.
+
+Run from resume_generator_backend/:
+
+    python -m scripts.bench_similarity --chars 2000 10000 50000 200000
+"""
+
+import argparse
+import difflib
+import random
+import statistics
+import sys
+import time
+
+from scripts.bench_ats_parse import _PAGE_TEXT
+
+_COLUMNS = (
+    ("chars", 8),
+    ("fast_ms", 9),
+    ("difflib_ms", 11),
+    ("fast_ratio", 11),
+    ("difflib_ratio", 14),
+)
+
+
+def _pair(chars, seed):
+    rng = random.Random(seed)
+    lines = []
+    while sum(len(line) + 1 for line in lines) < chars:
+        lines.extend(_PAGE_TEXT.lower().splitlines())
+    other = []
+    for line in lines:
+        roll = rng.random()
+        if roll < 0.03:
+            continue
+        if roll < 0.06:
+            line = line.replace(" ", "", 1)
+        if roll < 0.08 and other:
+            other.insert(-1, line)
+            continue
+        other.append(line)
+    return " ".join(lines)[:chars], " ".join(other)[:chars]
+
+
+def _time(fn, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        value = fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000, value
+
+
+def _print_table(rows):
+    header = "  ".join(name.ljust(width) for name, width in _COLUMNS)
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        cells = []
+        for name, width in _COLUMNS:
+            value = row[name]
+            text = f"{value:.3f}" if isinstance(value, float) else str(value)
+            cells.append(text.ljust(width))
+        print("  ".join(cells))
+
+
+def main(argv=None):
+    from ats import similarity
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--chars",
+        type=int,
+        nargs="+",
+        default=[2_000, 10_000, 50_000, 200_000],
+        help="extraction lengths (default: 2000 10000 50000 200000)",
+    )
+    parser.add_argument(
+        "--difflib-max",
+        type=int,
+        default=20_000,
+        help="skip the quadratic difflib run above this length (default: 20000)",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per input")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rows = []
+    for chars in args.chars:
+        a, b = _pair(chars, args.seed)
+        fast_ms, fast = _time(lambda a=a, b=b: similarity.ratio(a, b), args.runs)
+        row = {
+            "chars": chars,
+            "fast_ms": fast_ms,
+            "fast_ratio": fast,
+            "difflib_ms": "-",
+            "difflib_ratio": "-",
+        }
+        if chars <= args.difflib_max:
+            row["difflib_ms"], row["difflib_ratio"] = _time(
+                lambda a=a, b=b: difflib.SequenceMatcher(None, a, b).ratio(),
+                1,
+            )
+        rows.append(row)
+    _print_table(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Skill extraction cost: one regex per term vs the single-pass matcher.
+
+"per-term" is the previous implementation: a boundary-wrapped, case-
+insensitive regex per taxonomy term, each searched over the full text.
+"matcher" is ats.skills.SkillMatcher, one trie walk over the text.
+
+Taxonomies: the shipped TAXONOMY, plus synthetic ones padded to each
+--terms size with plausible single- and multi-word terms (some sharing
+prefixes with real ones). The text is the synthetic resume page plus a
+line of 25 terms drawn from the taxonomy. Both modes must find the same
+terms; a mismatch aborts the run.
+
+Run from resume_generator_backend/:
+
+    python -m scripts.bench_skills --terms 5000 --pages 1 4
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+
+from scripts.bench_ats_parse import _PAGE_TEXT
+
+_COLUMNS = (
+    ("terms", 7),
+    ("pages", 6),
+    ("mode", 9),
+    ("build_ms", 9),
+    ("scan_ms_p50", 12),
+    ("found", 6),
+)
+
+_WORDS = [
+    "data",
+    "cloud",
+    "stream",
+    "graph",
+    "vector",
+    "edge",
+    "secure",
+    "event",
+    "batch",
+    "query",
+    "model",
+    "service",
+    "mesh",
+    "cache",
+    "index",
+    "search",
+    "signal",
+    "pixel",
+    "neural",
+    "quantum",
+    "policy",
+    "ledger",
+    "kernel",
+    "shader",
+    "schema",
+    "agent",
+]
+
+
+def _taxonomy(size, seed):
+    from ats.skills import TAXONOMY
+
+    rng = random.Random(seed)
+    terms = set(TAXONOMY)
+    while len(terms) < size:
+        shape = rng.random()
+        if shape < 0.3:
+            term = rng.choice(TAXONOMY) + " " + rng.choice(_WORDS).title()
+        elif shape < 0.6:
+            term = f"{rng.choice(_WORDS).title()}{rng.choice(_WORDS)}"
+        else:
+            term = " ".join(rng.choice(_WORDS).title() for _ in range(2))
+            term += f" {rng.randint(1, 99)}" if rng.random() < 0.5 else ""
+        terms.add(term)
+    return sorted(terms, key=str.lower)
+
+
+def _per_term(terms):
+    patterns = [
+        (
+            term,
+            re.compile(r"(?<![\w+#])" + re.escape(term) + r"(?![\w+#])", re.IGNORECASE),
+        )
+        for term in terms
+    ]
+    return lambda text: [term for term, pattern in patterns if pattern.search(text)]
+
+
+def _matcher(terms):
+    from ats.skills import SkillMatcher
+
+    return SkillMatcher(terms).extract
+
+
+def _measure(build, terms, text, runs):
+    started = time.perf_counter()
+    extract = build(terms)
+    build_ms = (time.perf_counter() - started) * 1000
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        found = extract(text)
+        samples.append(time.perf_counter() - started)
+    return build_ms, statistics.median(samples) * 1000, found
+
+
+def _print_table(rows):
+    header = "  ".join(name.ljust(width) for name, width in _COLUMNS)
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        cells = []
+        for name, width in _COLUMNS:
+            value = row[name]
+            text = f"{value:.2f}" if isinstance(value, float) else str(value)
+            cells.append(text.ljust(width))
+        print("  ".join(cells))
+
+
+def main(argv=None):
+    from ats.skills import TAXONOMY
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--terms",
+        type=int,
+        nargs="+",
+        default=[5000],
+        help="synthetic taxonomy sizes, besides the shipped one (default: 5000)",
+    )
+    parser.add_argument(
+        "--pages",
+        type=int,
+        nargs="+",
+        default=[1, 4],
+        help="resume text lengths in pages (default: 1 4)",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per mode")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    taxonomies = [TAXONOMY] + [_taxonomy(n, args.seed) for n in args.terms]
+    rows = []
+    for terms in taxonomies:
+        for pages in args.pages:
+            # Plus a line of taxonomy terms, so synthetic ones are found too.
+            sample = random.Random(args.seed).sample(terms, min(25, len(terms)))
+            text = "\n".join([_PAGE_TEXT] * pages) + "\nAlso: " + ", ".join(sample)
+            results = {}
+            for mode, build in (("per-term", _per_term), ("matcher", _matcher)):
+                build_ms, scan_ms, found = _measure(build, terms, text, args.runs)
+                results[mode] = found
+                rows.append(
+                    {
+                        "terms": len(terms),
+                        "pages": pages,
+                        "mode": mode,
+                        "build_ms": build_ms,
+                        "scan_ms_p50": scan_ms,
+                        "found": len(found),
+                    }
+                )
+            if results["per-term"] != results["matcher"]:
+                print(f"mismatch at {len(terms)} terms, {pages} pages", file=sys.stderr)
+                return 1
+    _print_table(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Peak RSS of the API under concurrent oversized uploads to /ats/check.
+
+Starts uvicorn (one worker, ATS_POOL_WORKERS=0) in a subprocess, fires
+--concurrency uploads of --megabytes each at once, and reports the
+server's peak resident set (VmHWM from /proc, Linux only) next to its
+resident set at idle. "declared" uploads carry a Content-Length;
+"chunked" ones stream without one, so the ceiling must count bytes.
+
+Run from resume_generator_backend/:
+
+    python -m scripts.bench_upload_memory --concurrency 8 --megabytes 50
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+
+_COLUMNS = (
+    ("mode", 9),
+    ("uploads", 8),
+    ("upload_mb", 10),
+    ("statuses", 12),
+    ("idle_rss_mb", 12),
+    ("peak_rss_mb", 12),
+)
+
+_BOUNDARY = "bench-upload-memory"
+_CHUNK = 64 * 1024
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_mb(pid, field):
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError(f"{field} not in /proc/{pid}/status")
+
+
+def _start_server(port):
+    env = {**os.environ, "ATS_POOL_WORKERS": "0"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("uvicorn did not start")
+
+
+def _body(megabytes):
+    yield (
+        f'--{_BOUNDARY}\r\nContent-Disposition: form-data; name="file"; '
+        'filename="big.pdf"\r\nContent-Type: application/pdf\r\n\r\n%PDF-'
+    ).encode()
+    for _ in range(megabytes * 1024 * 1024 // _CHUNK):
+        yield bytes(_CHUNK)
+    yield f"\r\n--{_BOUNDARY}--\r\n".encode()
+
+
+async def _upload(client, url, megabytes, declared):
+    headers = {"content-type": f"multipart/form-data; boundary={_BOUNDARY}"}
+    if declared:
+        content = b"".join(_body(megabytes))
+    else:
+
+        async def content():
+            for chunk in _body(megabytes):
+                yield chunk
+
+        content = content()
+    try:
+        resp = await client.post(url, content=content, headers=headers)
+        return resp.status_code
+    except Exception as e:  # refused mid-upload: the server hung up
+        return type(e).__name__
+
+
+async def _fire(port, concurrency, megabytes, declared):
+    import httpx
+
+    url = f"http://127.0.0.1:{port}/ats/check"
+    async with httpx.AsyncClient(timeout=120) as client:
+        return await asyncio.gather(
+            *(_upload(client, url, megabytes, declared) for _ in range(concurrency))
+        )
+
+
+def _print_table(rows):
+    header = "  ".join(name.ljust(width) for name, width in _COLUMNS)
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        cells = []
+        for name, width in _COLUMNS:
+            value = row[name]
+            text = f"{value:.1f}" if isinstance(value, float) else str(value)
+            cells.append(text.ljust(width))
+        print("  ".join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=8, help="uploads at once")
+    parser.add_argument("--megabytes", type=int, default=50, help="size per upload")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for mode, declared in (("declared", True), ("chunked", False)):
+        port = _free_port()
+        server = _start_server(port)
+        try:
+            idle = _rss_mb(server.pid, "VmRSS")
+            statuses = asyncio.run(
+                _fire(port, args.concurrency, args.megabytes, declared)
+            )
+            peak = _rss_mb(server.pid, "VmHWM")
+        finally:
+            server.terminate()
+            server.wait()
+        rows.append(
+            {
+                "mode": mode,
+                "uploads": args.concurrency,
+                "upload_mb": args.megabytes,
+                "statuses": ",".join(
+                    f"{status}x{n}" for status, n in Counter(statuses).items()
+                ),
+                "idle_rss_mb": idle,
+                "peak_rss_mb": peak,
+            }
+        )
+    _print_table(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,11 +22,12 @@ Uses only the stdlib plus the extractors already shipped with the app.
 """
 
 import argparse
-import difflib
 import sys
 from pathlib import Path
 
+from ats import similarity
 from ats.checks import _normalize
+from ats.document import PdfDocument
 from ats.extractors import extract_pdf_pdfplumber, extract_pdf_pymupdf
 from ats.thresholds import AGREEMENT_PASS, AGREEMENT_WARN, COMPLETENESS_PASS
 
@@ -43,7 +44,7 @@ _COLUMNS = (
 
 
 def _ratio(text_a, text_b):
-    return difflib.SequenceMatcher(None, _normalize(text_a), _normalize(text_b)).ratio()
+    return similarity.ratio(_normalize(text_a), _normalize(text_b))
 
 
 def _jaccard(text_a, text_b):
@@ -66,9 +67,9 @@ def _collect(directory):
             print(f"skipping {pdf_path.name}: label must be good|bad, got {label!r}")
             continue
         truth = txt_path.read_text()
-        data = pdf_path.read_bytes()
-        plumber = extract_pdf_pdfplumber(data)
-        pymupdf = extract_pdf_pymupdf(data)
+        with PdfDocument(pdf_path.read_bytes()) as doc:
+            plumber = extract_pdf_pdfplumber(doc)
+            pymupdf = extract_pdf_pymupdf(doc)
         rows.append(
             {
                 "file": pdf_path.name,
@@ -1,7 +1,23 @@
-"""ATS keyword score: compare a resume against a job description via LLM.
+"""ATS keyword score: compare a resume against a job description or a
+target role's keyword list.
 
 Returns a structured match report (percent, matched/missing keywords,
 summary) instead of free text, so the frontend can render it directly.
+
+Scoring is local and deterministic: a target role's basis is its preset
+keyword list, a job description's is the ranked list ats.keywords
+extracts from it (taxonomy terms, technical tokens, phrases). Either is
+matched against the resume with the skills trie and its alias index —
+no LLM call, about a millisecond.
+
+For a job description (or when the caller asks for suggestions on a
+target role) the LLM then gets only the gap list
+(target, matched and missing keywords — a few hundred tokens instead of
+up to 20k characters of resume and JD) and writes the importance,
+suggestions and summary. If it fails or replies with nonsense, the
+local result is returned as is. Replies are cached by a hash of the
+model, prompt and gap list (services.llm_cache); `refresh` asks again
+and replaces the entry.
 """
 
 import logging
@@ -11,7 +27,8 @@ from typing import Literal
 from fastapi import HTTPException
 from pydantic import BaseModel, Field, ValidationError
 
-from services.genrate_resume import _get_client, _get_model
+from services import llm_cache
+from services.genrate_resume import _get_async_client, _get_model
 from services.llm_json import extract_json
 
 logger = logging.getLogger("resume_libre")
@@ -20,13 +37,13 @@ MAX_RESUME_CHARS = 12_000
 MAX_JD_CHARS = 8_000
 
 SYSTEM_PROMPT = (
-    "You are an ATS keyword analyst. Compare the resume against the job "
-    "description (or the expected keywords for the stated target role). "
-    "Return ONLY a JSON object with keys: match_percent "
-    "(integer 0-100), matched_keywords (array of strings), missing_keywords "
-    "(array of {keyword, importance: high|medium|low, suggestion}), summary "
-    "(string, <=500 chars). The resume may be LaTeX source; analyze only its "
-    "textual content. Never invent resume content."
+    "You are an ATS keyword coach. You are given the keywords a resume "
+    "matched and the keywords it is missing for a job description or target "
+    "role, most important first. Return ONLY a JSON object with keys: "
+    "missing_keywords (array of {keyword, importance: high|medium|low, "
+    "suggestion}, one per missing keyword, spelled as given), summary "
+    "(string, <=500 chars). A suggestion says where the keyword belongs if "
+    "the candidate really has that experience. Never invent resume content."
 )
 
 RETRY_MESSAGE = (
@@ -48,6 +65,11 @@ class AtsScoreResult(BaseModel):
     summary: str = Field(max_length=500)
 
 
+class GapAdvice(BaseModel):
+    missing_keywords: list[KeywordGap]
+    summary: str = Field(max_length=500)
+
+
 # Canned result for demo mode — no API keys, no LLM cost.
 DEMO_RESULT = AtsScoreResult(
     match_percent=78,
@@ -77,11 +99,55 @@ DEMO_RESULT = AtsScoreResult(
 )
 
 
-def _call_llm(client, model: str, messages: list[dict]):
+def _importance(rank: int, total: int) -> str:
+    # Keyword lists are ranked (role lists lead with their core skills, JD
+    # keywords come heaviest first): first third high, last third low.
+    return ("high", "medium", "low")[min(2, 3 * rank // total)]
+
+
+def _score(resume_text: str, keywords, basis: str) -> AtsScoreResult:
+    from ats.keywords import keywords_present
+
+    present = keywords_present(resume_text, keywords)
+    matched = [keyword for keyword in keywords if keyword in present]
+    missing = [
+        KeywordGap(
+            keyword=keyword,
+            importance=_importance(rank, len(keywords)),
+            suggestion=f"If you have used {keyword}, name it where you used it "
+            "(a role, project or course).",
+        )
+        for rank, keyword in enumerate(keywords)
+        if keyword not in present
+    ]
+    return AtsScoreResult(
+        match_percent=round(100 * len(matched) / len(keywords)) if keywords else 0,
+        matched_keywords=matched,
+        missing_keywords=missing,
+        summary=f"{len(matched)} of {len(keywords)} {basis} keywords found "
+        "in the resume.",
+    )
+
+
+def score_role(resume_text: str, target_role: str, keywords) -> AtsScoreResult:
+    """Deterministic match of a resume against a role's keyword list."""
+    return _score(resume_text, keywords, target_role)
+
+
+def score_description(resume_text: str, job_description: str) -> AtsScoreResult:
+    """Deterministic match of a resume against a job description's
+    extracted keywords."""
+    from ats.keywords import extract_keywords
+
+    keywords = extract_keywords(job_description[:MAX_JD_CHARS])
+    return _score(resume_text, keywords, "job description")
+
+
+async def _call_llm(client, model: str, messages: list[dict]):
     """One completion call. Try JSON mode first; some OpenRouter models
     reject response_format, so retry once without it before giving up."""
     try:
-        return client.chat.completions.create(
+        return await client.chat.completions.create(
             model=model,
             temperature=0.1,
             max_tokens=2000,
@@ -89,7 +155,7 @@ def _call_llm(client, model: str, messages: list[dict]):
             messages=messages,
         )
     except Exception:
-        return client.chat.completions.create(
+        return await client.chat.completions.create(
             model=model,
             temperature=0.1,
             max_tokens=2000,
@@ -102,16 +168,21 @@ async def analyze_ats(
     job_description: str | None = None,
     target_role: str | None = None,
     demo: bool = False,
+    refresh: bool = False,
+    suggestions: bool | None = None,
 ) -> AtsScoreResult:
-    """Score resume keyword match via OpenRouter, against either a pasted
-    job description or a named target role (preset keyword list)."""
+    """Score resume keyword match against either a pasted job description
+    or a named target role, locally; with `suggestions`, the LLM writes
+    the advice for the missing keywords. Unset, suggestions are on for a
+    job description and off for a target role."""
     if demo:
         return DEMO_RESULT
 
     resume_text = resume_text[:MAX_RESUME_CHARS]
 
     if job_description:
-        basis = f"JOB DESCRIPTION:\n{job_description[:MAX_JD_CHARS]}"
+        result = score_description(resume_text, job_description)
+        target = "TARGET: job description"
     else:
         from ats.skills import ROLE_KEYWORDS
 
@@ -121,32 +192,71 @@ async def analyze_ats(
                 status_code=422,
                 detail=f"Unknown target role. Valid roles: {sorted(ROLE_KEYWORDS)}",
             )
-        basis = (
-            f"TARGET ROLE: {target_role}\n"
-            f"EXPECTED KEYWORDS FOR THIS ROLE:\n{', '.join(keywords)}"
+        result = score_role(resume_text, target_role, keywords)
+        target = f"TARGET ROLE: {target_role}"
+
+    if suggestions is None:
+        suggestions = bool(job_description)
+    if not suggestions or not result.missing_keywords:
+        return result
+    advice = await _advise(result, target, refresh)
+    return _merge(result, advice) if advice is not None else result
+
+
+def _merge(result: AtsScoreResult, advice: GapAdvice) -> AtsScoreResult:
+    # The keyword sets stay local; the LLM only rewrites the gaps it was
+    # given, and a gap it skipped keeps its templated suggestion.
+    written = {gap.keyword.lower(): gap for gap in advice.missing_keywords}
+    missing = [
+        gap.model_copy(
+            update={
+                "importance": written[gap.keyword.lower()].importance,
+                "suggestion": written[gap.keyword.lower()].suggestion,
+            }
         )
+        if gap.keyword.lower() in written
+        else gap
+        for gap in result.missing_keywords
+    ]
+    return result.model_copy(
+        update={"missing_keywords": missing, "summary": advice.summary}
+    )
 
-    client = _get_client()
-    model = _get_model()
 
+async def _advise(
+    result: AtsScoreResult, target: str, refresh: bool
+) -> GapAdvice | None:
+    """LLM-written advice for the result's gap list, None if the LLM is
+    unavailable or its output is unreadable twice."""
+    model = _get_model()
+    gaps = (
+        f"{target}\n"
+        f"MATCHED: {', '.join(result.matched_keywords) or '(none)'}\n"
+        f"MISSING: {', '.join(gap.keyword for gap in result.missing_keywords)}"
+    )
     messages = [
         {"role": "system", "content": SYSTEM_PROMPT},
-        {
-            "role": "user",
-            "content": f"RESUME:\n{resume_text}\n\n{basis}",
-        },
+        {"role": "user", "content": gaps},
     ]
 
+    key = llm_cache.cache_key("ats_score", model, SYSTEM_PROMPT, gaps)
+    cached = await llm_cache.get_reply(key, bypass=refresh)
+    if cached is not None:
+        return GapAdvice.model_validate(cached)
+
     started = time.monotonic()
+    tokens = 0
     for _attempt in range(2):
         try:
-            completion = _call_llm(client, model, messages)
+            completion = await _call_llm(_get_async_client(), model, messages)
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"ATS analysis failed: {e!s}")
+            logger.warning("ats_score suggestions unavailable: %s", e)
+            return None
+        tokens += llm_cache.usage_tokens(completion)
 
         raw = completion.choices[0].message.content or ""
         try:
-            result = AtsScoreResult.model_validate(extract_json(raw))
+            advice = GapAdvice.model_validate(extract_json(raw))
         except (ValidationError, ValueError):
             # Malformed reply — retry once with an explicit correction.
             messages = [
@@ -164,9 +274,8 @@ async def analyze_ats(
             getattr(usage, "prompt_tokens", None),
             getattr(usage, "completion_tokens", None),
         )
-        return result
+        await llm_cache.put_reply(key, advice.model_dump(), tokens)
+        return advice
 
-    raise HTTPException(
-        status_code=502,
-        detail="ATS analysis produced unreadable output — try again",
-    )
+    logger.warning("ats_score suggestions unreadable twice; serving local result")
+    return None
@@ -1,4 +1,7 @@
 import os
+import time
+from collections import OrderedDict
+from typing import Any
 
 import redis.asyncio as aioredis
 
@@ -13,3 +16,104 @@ def get_redis() -> aioredis.Redis:
             socket_connect_timeout=2,
         )
     return _client
+
+
+async def put_bounded(
+    prefix: str, index_key: str, key: str, value, ttl: int, max_entries: int
+) -> None:
+    """SET `prefix + key` with a TTL and keep at most `max_entries` of them.
+
+    A sorted set (`index_key`, scored by store time) tracks live keys so
+    the oldest can be evicted first. Redis failures are swallowed — callers
+    treat Redis as an optional tier.
+    """
+    now = time.time()
+    try:
+        redis = get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.set(prefix + key, value, ex=ttl)
+            pipe.zadd(index_key, {key: now})
+            # Index members whose value has expired by TTL.
+            pipe.zremrangebyscore(index_key, "-inf", now - ttl)
+            pipe.zcard(index_key)
+            *_, size = await pipe.execute()
+        if size > max_entries:
+            evicted = await redis.zpopmin(index_key, size - max_entries)
+            if evicted:
+                await redis.delete(*(prefix + member.decode() for member, _ in evicted))
+    except Exception:
+        pass
+
+
+async def get_with_ttl(redis, redis_key: str) -> tuple[Any, int | None]:
+    """GET `redis_key` plus its remaining TTL in seconds (None if it has
+    none), so a memory tier can hold a promoted entry no longer than Redis
+    will. Redis errors propagate; callers already treat them as a miss."""
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.get(redis_key)
+        pipe.ttl(redis_key)
+        value, ttl = await pipe.execute()
+    return value, ttl if ttl is not None and ttl >= 0 else None
+
+
+class MemoryLRU:
+    """Size-bounded in-process LRU — the per-worker tier in front of Redis.
+
+    Bounded by total bytes (callers pass each entry's size) and optionally
+    by entry count; the least recently used entries are evicted first.
+    Entries also expire `ttl` seconds after set() (or the ttl passed to
+    it): the caches publish a retention in PRIVACY.md, and size-only
+    eviction would keep a quiet worker's entries for its whole life.
+    """
+
+    def __init__(
+        self, max_bytes: int, max_entries: int | None = None, ttl: float | None = None
+    ):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (value, size, monotonic expiry or None)
+        self._entries: OrderedDict[str, tuple[Any, int, float | None]] = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, _, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self.pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, size: int, ttl: float | None = None) -> None:
+        if ttl is None:
+            ttl = self.ttl
+        self.pop(key)
+        if size > self.max_bytes or (ttl is not None and ttl <= 0):
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, size, expires_at)
+        self._bytes += size
+        while self._bytes > self.max_bytes or (
+            self.max_entries is not None and len(self._entries) > self.max_entries
+        ):
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -4,7 +4,7 @@ import re
 import time
 
 from fastapi import HTTPException
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 logger = logging.getLogger("resume_libre")
 
@@ -36,15 +36,50 @@ def _load_demo_resume() -> str:
     return path.read_text(encoding="utf-8")
 
 
-def _get_client() -> OpenAI:
+def _get_api_key() -> str:
     api_key = os.getenv("OPENROUTER_API_KEY")
     if not api_key:
         raise HTTPException(status_code=500, detail="OPENROUTER_API_KEY not configured")
+    return api_key
 
-    return OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=api_key,
-    )
+
+def _get_base_url() -> str:
+    # Overridable so load tests can point generation at a local fake server.
+    return os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+
+
+def _get_client() -> OpenAI:
+    return OpenAI(base_url=_get_base_url(), api_key=_get_api_key())
+
+
+_async_client: AsyncOpenAI | None = None
+
+
+def _get_async_client() -> AsyncOpenAI:
+    """Shared AsyncOpenAI client — one keep-alive connection pool per worker.
+
+    Generation runs inside `async def` handlers; a sync client there blocks
+    the event loop on every network read, stalling every other request on
+    the worker (health checks included) for the length of a stream.
+    """
+    global _async_client
+    api_key = _get_api_key()
+    if _async_client is None:
+        _async_client = AsyncOpenAI(base_url=_get_base_url(), api_key=api_key)
+    elif _async_client.api_key != api_key:
+        # A rotated key keeps the pool: with_options shares the old client's
+        # connections. A fresh client would leak the old pool, and closing
+        # it would cut off streams still reading from it.
+        _async_client = _async_client.with_options(api_key=api_key)
+    return _async_client
+
+
+async def close_async_client() -> None:
+    """Close the shared client's pool (app shutdown)."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
 
 
 def _get_model() -> str:
@@ -78,12 +113,12 @@ async def generate_resume_content(
         "The document body between \\begin{document} and \\end{document} MUST contain the full resume content."
     )
 
-    client = _get_client()
+    client = _get_async_client()
     model = _get_model()
 
     started = time.monotonic()
     try:
-        completion = client.chat.completions.create(
+        completion = await client.chat.completions.create(
             model=model,
             max_tokens=8000,
             temperature=0.1,
@@ -155,12 +190,12 @@ async def generate_resume_stream(
         "The document body between \\begin{document} and \\end{document} MUST contain the full resume content."
     )
 
-    client = _get_client()
+    client = _get_async_client()
     model = _get_model()
 
     started = time.monotonic()
     try:
-        stream = client.chat.completions.create(
+        stream = await client.chat.completions.create(
             model=model,
             max_tokens=8000,
             temperature=0.1,
@@ -178,7 +213,7 @@ async def generate_resume_stream(
     full_content = ""
     usage = None
 
-    for chunk in stream:
+    async for chunk in stream:
         if getattr(chunk, "usage", None):
             usage = chunk.usage
         if chunk.choices and chunk.choices[0].delta.content:
@@ -1,8 +1,7 @@
 import logging
 
-import httpx
-
-from services.cache import get_redis
+from services import profile_cache
+from services.http_clients import get_http_client
 
 logger = logging.getLogger("resume_libre")
 
@@ -11,21 +10,9 @@ async def fetch_github_readme(username: str) -> str:
     if not username:
         return ""
 
-    try:
-        redis = get_redis()
-        cached = await redis.get(f"github:{username}")
-        if cached:
-            return cached.decode()
-    except Exception:
-        redis = None
-
-    content = await _fetch_from_github(username)
-    if content and redis:
-        try:
-            await redis.setex(f"github:{username}", 3600, content)  # 1h TTL
-        except Exception:
-            pass
-    return content
+    return await profile_cache.cached_fetch(
+        "github", username, lambda: _fetch_from_github(username)
+    )
 
 
 async def _fetch_from_github(username: str) -> str:
@@ -33,8 +20,7 @@ async def _fetch_from_github(username: str) -> str:
     headers = {"Accept": "application/vnd.github.raw"}
 
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.get(url, headers=headers)
+        response = await get_http_client("github").get(url, headers=headers)
 
         if response.status_code == 200:
             return response.text
@@ -0,0 +1,123 @@
+"""App-lifetime outbound HTTP clients — one keep-alive pool per integration.
+
+Every fetcher used to open a fresh httpx.AsyncClient per call, paying a
+TCP+TLS handshake on every profile fetch and PDF compile. Clients now live
+for the whole app: opened in the FastAPI lifespan (core/app.py), closed on
+shutdown, and created lazily for scripts and tests that never start one.
+
+Each integration talks to a single host, so a client's pool limits are
+that host's connection limits. Retries are transport-level: httpx retries
+only failed connection attempts, which is safe for POSTs (no request was
+sent) and never repeats a request the upstream already saw.
+"""
+
+import os
+from dataclasses import dataclass
+
+import httpx
+
+
+@dataclass(frozen=True)
+class ClientPolicy:
+    host: str
+    timeout: float
+    retries: int = 1
+    max_connections: int = 10
+    max_keepalive: int = 5
+    keepalive_expiry: float = 30.0
+
+
+POLICIES = {
+    "github": ClientPolicy(host="api.github.com", timeout=15),
+    "huggingface": ClientPolicy(host="huggingface.co", timeout=15),
+    "orcid": ClientPolicy(host="pub.orcid.org", timeout=15),
+    # Actor runs are paid — never retry beyond the connect attempt.
+    "apify": ClientPolicy(host="api.apify.com", timeout=30, retries=0),
+    # Tectonic cold compiles can take minutes; the sidecar is on the
+    # private network, so keep plenty of warm connections to it. The
+    # timeout covers the sidecar's COMPILE_QUEUE_TIMEOUT + COMPILE_TIMEOUT.
+    "latex": ClientPolicy(
+        host=httpx.URL(
+            os.getenv("LATEX_SERVICE_URL", "http://latex-service:8000")
+        ).host,
+        timeout=310,
+        max_connections=20,
+        max_keepalive=10,
+    ),
+}
+
+_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 is opt-in (OUTBOUND_HTTP2=true) and needs the `h2` package."""
+    if os.getenv("OUTBOUND_HTTP2", "").lower() not in ("1", "true", "yes"):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build(policy: ClientPolicy) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=policy.max_connections,
+        max_keepalive_connections=policy.max_keepalive,
+        keepalive_expiry=policy.keepalive_expiry,
+    )
+    http2 = _http2_enabled()
+    transport = httpx.AsyncHTTPTransport(
+        retries=policy.retries, limits=limits, http2=http2
+    )
+    return httpx.AsyncClient(transport=transport, timeout=policy.timeout)
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """Shared client for one integration (a key of POLICIES)."""
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _clients[name] = _build(POLICIES[name])
+    return client
+
+
+def open_http_clients() -> None:
+    """Create every integration's client up front (app startup)."""
+    for name in POLICIES:
+        get_http_client(name)
+
+
+async def close_http_clients() -> None:
+    """Close every pool (app shutdown)."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def pool_stats() -> dict:
+    """Active/idle connection counts per integration and upstream host.
+
+    Reads httpcore's pool through private attributes — monitoring only, so
+    any shape change degrades to empty host lists rather than raising.
+    """
+    stats = {}
+    for name, client in _clients.items():
+        policy = POLICIES[name]
+        hosts: dict[str, dict] = {}
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        for conn in getattr(pool, "connections", ()):
+            origin = getattr(conn, "_origin", None)
+            host = origin.host.decode() if origin else policy.host
+            counts = hosts.setdefault(host, {"active": 0, "idle": 0})
+            if conn.is_idle():
+                counts["idle"] += 1
+            elif not conn.is_closed():
+                counts["active"] += 1
+        stats[name] = {
+            "max_connections": policy.max_connections,
+            "max_keepalive": policy.max_keepalive,
+            "queued_requests": len(getattr(pool, "_requests", ())),
+            "hosts": hosts,
+        }
+    return stats
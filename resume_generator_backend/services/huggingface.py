@@ -1,10 +1,8 @@
-import json
 import logging
 import re
 
-import httpx
-
-from services.cache import get_redis
+from services import profile_cache
+from services.http_clients import get_http_client
 
 logger = logging.getLogger("resume_libre")
 
@@ -23,21 +21,10 @@ async def fetch_huggingface_profile(username: str) -> dict:
     if not username:
         return {}
 
-    try:
-        redis = get_redis()
-        cached = await redis.get(f"hf:{username}")
-        if cached:
-            return json.loads(cached)
-    except Exception:
-        redis = None
-
-    data = await _fetch_from_huggingface(username)
-    if data and redis:
-        try:
-            await redis.setex(f"hf:{username}", 86400, json.dumps(data))  # 24h TTL
-        except Exception:
-            pass
-    return data
+    # Three sequential API calls, each up to the client's 15 s timeout.
+    return await profile_cache.cached_fetch(
+        "hf", username, lambda: _fetch_from_huggingface(username), timeout=60
+    )
 
 
 async def _fetch_from_huggingface(username: str) -> dict:
@@ -49,25 +36,25 @@ async def _fetch_from_huggingface(username: str) -> dict:
 
     data: dict = {}
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            for section, url in endpoints.items():
-                response = await client.get(url)
-                if response.status_code != 200:
-                    logger.warning(
-                        f"HuggingFace {section} fetch failed: {response.status_code}"
-                    )
-                    continue
-                items = [
-                    {
-                        "id": item["id"],
-                        "downloads": item.get("downloads", 0) or 0,
-                        "likes": item.get("likes", 0) or 0,
-                    }
-                    for item in response.json()
-                    if isinstance(item, dict) and item.get("id")
-                ]
-                if items:
-                    data[section] = items
+        client = get_http_client("huggingface")
+        for section, url in endpoints.items():
+            response = await client.get(url)
+            if response.status_code != 200:
+                logger.warning(
+                    f"HuggingFace {section} fetch failed: {response.status_code}"
+                )
+                continue
+            items = [
+                {
+                    "id": item["id"],
+                    "downloads": item.get("downloads", 0) or 0,
+                    "likes": item.get("likes", 0) or 0,
+                }
+                for item in response.json()
+                if isinstance(item, dict) and item.get("id")
+            ]
+            if items:
+                data[section] = items
     except Exception as e:
         logger.warning(f"HuggingFace fetch error: {e}")
         return {}
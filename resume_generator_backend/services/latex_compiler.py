@@ -1,33 +1,63 @@
+import logging
 import os
 
 import httpx
 from fastapi import HTTPException
 
+from services import pdf_cache
+from services.http_clients import get_http_client
+
+logger = logging.getLogger("resume_libre")
+
 LATEX_SERVICE_URL = os.getenv("LATEX_SERVICE_URL", "http://latex-service:8000")
 
 
-async def compile_latex_pdf(latex_content: str) -> bytes:
+def _compile_source(latex_content: str) -> str:
     if r"\documentclass" not in latex_content:
-        latex_content = md_to_latex(latex_content)
-    else:
-        # strip anything before \documentclass (LLM sometimes prepends \begin{document})
-        idx = latex_content.index(r"\documentclass")
-        latex_content = latex_content[idx:]
+        return md_to_latex(latex_content)
+    # strip anything before \documentclass (LLM sometimes prepends \begin{document})
+    idx = latex_content.index(r"\documentclass")
+    return latex_content[idx:]
+
+
+def pdf_key(latex_content: str) -> str:
+    """The pdf_cache key compile_latex_pdf() stores this source under."""
+    return pdf_cache.cache_key(_compile_source(latex_content))
+
+
+async def compile_latex_pdf(latex_content: str) -> bytes:
+    latex_content = _compile_source(latex_content)
+    key = pdf_cache.cache_key(latex_content)
+    cached = await pdf_cache.get_pdf(key)
+    if cached is not None:
+        return cached
 
     try:
-        async with httpx.AsyncClient(timeout=310) as client:
-            resp = await client.post(
-                f"{LATEX_SERVICE_URL}/compile",
-                json={"latex": latex_content},
-            )
+        resp = await get_http_client("latex").post(
+            f"{LATEX_SERVICE_URL}/compile",
+            json={"latex": latex_content},
+        )
     except httpx.HTTPError as e:
         raise HTTPException(
             status_code=503, detail=f"LaTeX compile service unavailable: {e}"
         )
 
+    logger.info(
+        f"LaTeX compile: status={resp.status_code} "
+        f"queue_wait_ms={resp.headers.get('X-Queue-Wait-ms')} "
+        f"compile_ms={resp.headers.get('X-Compile-ms')}"
+    )
+    if resp.status_code == 503:
+        # Sidecar admission control: its compile queue is full.
+        raise HTTPException(
+            status_code=503,
+            detail="LaTeX compile service is busy — try again shortly",
+            headers={"Retry-After": resp.headers.get("Retry-After", "5")},
+        )
     if resp.status_code != 200:
         raise RuntimeError(f"LaTeX service error: {resp.text}")
 
+    await pdf_cache.put_pdf(key, resp.content)
     return resp.content
 
 
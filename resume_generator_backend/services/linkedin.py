@@ -1,11 +1,9 @@
 import asyncio
-import json
 import logging
 import os
 
-import httpx
-
-from services.cache import get_redis
+from services import profile_cache
+from services.http_clients import get_http_client
 
 logger = logging.getLogger("resume_libre")
 
@@ -17,85 +15,67 @@ async def fetch_linkedin_profile(profile_url: str) -> dict:
     if not profile_url:
         return {}
 
-    try:
-        redis = get_redis()
-        cached = await redis.get(f"linkedin:{profile_url}")
-        if cached:
-            return json.loads(cached)
-    except Exception:
-        redis = None
-
-    token = os.getenv("APIFY_API_TOKEN")
-    if not token:
-        return {}
+    async def fetch():
+        token = os.getenv("APIFY_API_TOKEN")
+        if not token:
+            return {}
+        return await _fetch_from_apify(profile_url, token)
 
-    data = await _fetch_from_apify(profile_url, token)
-    if data and redis:
-        try:
-            await redis.setex(f"linkedin:{profile_url}", 86400, json.dumps(data))
-        except Exception:
-            pass
-    return data
+    # One paid actor run per profile, however many users ask at once. The
+    # run polls for up to three minutes, so others wait at least that long.
+    return await profile_cache.cached_fetch("linkedin", profile_url, fetch, timeout=300)
 
 
 async def _fetch_from_apify(profile_url: str, token: str) -> dict:
-    async with httpx.AsyncClient(timeout=30) as client:
-        # 1. Start actor run
-        resp = await client.post(
-            f"{APIFY_BASE}/acts/{ACTOR_ID}/runs",
-            params={"token": token},
-            json={"profiles": [profile_url]},
-        )
-        if resp.status_code not in (200, 201):
-            logger.info(
-                f"Apify run start failed: {resp.status_code} - {resp.text[:200]}"
-            )
-            return {}
-
-        run_data = resp.json().get("data", {})
-        run_id = run_data.get("id")
-        dataset_id = run_data.get("defaultDatasetId")
-        if not run_id:
-            logger.info(f"Apify: no run ID in response: {resp.text[:200]}")
-            return {}
+    client = get_http_client("apify")
+    # 1. Start actor run
+    resp = await client.post(
+        f"{APIFY_BASE}/acts/{ACTOR_ID}/runs",
+        params={"token": token},
+        json={"profiles": [profile_url]},
+    )
+    if resp.status_code not in (200, 201):
+        logger.info(f"Apify run start failed: {resp.status_code} - {resp.text[:200]}")
+        return {}
 
-        logger.info(f"Apify: run {run_id} started, polling...")
+    run_data = resp.json().get("data", {})
+    run_id = run_data.get("id")
+    dataset_id = run_data.get("defaultDatasetId")
+    if not run_id:
+        logger.info(f"Apify: no run ID in response: {resp.text[:200]}")
+        return {}
 
-        # 2. Poll until SUCCEEDED or timeout (~3 min)
-        for _ in range(36):
-            await asyncio.sleep(5)
-            status_resp = await client.get(
-                f"{APIFY_BASE}/actor-runs/{run_id}",
-                params={"token": token},
-            )
-            if status_resp.status_code == 200:
-                status = status_resp.json().get("data", {}).get("status", "")
-                logger.info(f"Apify: run status = {status}")
-                if status == "SUCCEEDED":
-                    break
-                if status in ("FAILED", "ABORTED", "TIMED-OUT"):
-                    logger.info(f"Apify run {status}: {run_id}")
-                    return {}
+    logger.info(f"Apify: run {run_id} started, polling...")
 
-        # 3. Fetch dataset items
-        items_resp = await client.get(
-            f"{APIFY_BASE}/datasets/{dataset_id}/items",
+    # 2. Poll until SUCCEEDED or timeout (~3 min)
+    for _ in range(36):
+        await asyncio.sleep(5)
+        status_resp = await client.get(
+            f"{APIFY_BASE}/actor-runs/{run_id}",
             params={"token": token},
         )
-        if items_resp.status_code == 200:
-            items = items_resp.json()
-            logger.info(
-                f"Apify: got {len(items) if isinstance(items, list) else 0} items"
-            )
-            if (
-                isinstance(items, list)
-                and items
-                and items[0].get("success") is not False
-            ):
-                return items[0]
-        else:
-            logger.warning(
-                f"Apify dataset fetch failed: {items_resp.status_code} - {items_resp.text[:200]}"
-            )
+        if status_resp.status_code == 200:
+            status = status_resp.json().get("data", {}).get("status", "")
+            logger.info(f"Apify: run status = {status}")
+            if status == "SUCCEEDED":
+                break
+            if status in ("FAILED", "ABORTED", "TIMED-OUT"):
+                logger.info(f"Apify run {status}: {run_id}")
+                return {}
+
+    # 3. Fetch dataset items
+    items_resp = await client.get(
+        f"{APIFY_BASE}/datasets/{dataset_id}/items",
+        params={"token": token},
+    )
+    if items_resp.status_code == 200:
+        items = items_resp.json()
+        logger.info(f"Apify: got {len(items) if isinstance(items, list) else 0} items")
+        if isinstance(items, list) and items and items[0].get("success") is not False:
+            return items[0]
+    else:
+        logger.warning(
+            f"Apify dataset fetch failed: {items_resp.status_code} - {items_resp.text[:200]}"
+        )
 
     return {}
@@ -0,0 +1,113 @@
+"""Cache of LLM replies, keyed by a SHA-256 of everything the model saw.
+
+The job-match panel asks for the same gap suggestions each time it is
+reopened, and /ats/extract re-resolves the
+same fields of the same text. The key hashes the model, the system
+prompt (which names the requested fields) and the truncated inputs, so
+any change to any of them is a miss. Entries live in:
+
+1. an in-process LRU (per uvicorn worker, bounded by bytes), then
+2. Redis (shared across workers, TTL'd, bounded by entry count).
+
+Each entry records the tokens its reply cost, so a hit adds them to the
+saved_tokens counter. Prompts and uploaded documents are never stored,
+but the replies are personal data: /ats/extract's samples are the name,
+email, phone and other fields read out of the resume. PRIVACY.md
+publishes the retention, so both tiers honour LLM_CACHE_TTL — an entry
+records when it was stored, and the memory tier drops it once it is
+older than that. Cache failures never fail a request — a miss just
+calls the model.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from services.cache import MemoryLRU, get_redis, put_bounded
+
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))
+MEMORY_MAX_BYTES = int(os.getenv("LLM_CACHE_MEMORY_MB", "8")) * 1024 * 1024
+REDIS_MAX_ENTRIES = int(os.getenv("LLM_CACHE_REDIS_ENTRIES", "2000"))
+
+_KEY_PREFIX = "llm:"
+_INDEX_KEY = "llm:index"
+
+_memory = MemoryLRU(MEMORY_MAX_BYTES)
+_counters = {
+    "memory_hits": 0,
+    "redis_hits": 0,
+    "misses": 0,
+    "bypassed": 0,
+    "stores": 0,
+    "saved_tokens": 0,
+}
+
+
+def cache_key(purpose: str, model: str, system_prompt: str, *inputs: str) -> str:
+    """`purpose` names the caller (e.g. "ats_score"), so two features that
+    happen to send the same prompt never share an entry."""
+    payload = json.dumps([purpose, model, system_prompt, *inputs])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def usage_tokens(completion) -> int:
+    """Total tokens a completion reports, 0 if the provider sent no usage."""
+    tokens = getattr(getattr(completion, "usage", None), "total_tokens", None)
+    return tokens if isinstance(tokens, int) else 0
+
+
+async def get_reply(key: str, bypass: bool = False):
+    """The cached reply for `key`, or None on a miss or when `bypass`."""
+    if bypass:
+        _counters["bypassed"] += 1
+        return None
+
+    entry = _memory.get(key)
+    if entry is not None and _expired(entry):
+        _memory.pop(key)
+        entry = None
+    if entry is None:
+        try:
+            raw = await get_redis().get(_KEY_PREFIX + key)
+        except Exception:
+            raw = None
+        if raw is None:
+            _counters["misses"] += 1
+            return None
+        entry = json.loads(raw)
+        if _expired(entry):
+            _counters["misses"] += 1
+            return None
+        _memory.set(key, entry, len(raw))
+        _counters["redis_hits"] += 1
+    else:
+        _counters["memory_hits"] += 1
+    _counters["saved_tokens"] += entry["tokens"]
+    return entry["reply"]
+
+
+async def put_reply(key: str, reply, tokens: int) -> None:
+    entry = {"reply": reply, "tokens": tokens, "stored_at": time.time()}
+    raw = json.dumps(entry, separators=(",", ":"))
+    _counters["stores"] += 1
+    _memory.set(key, entry, len(raw))
+    await put_bounded(
+        _KEY_PREFIX, _INDEX_KEY, key, raw, LLM_CACHE_TTL, REDIS_MAX_ENTRIES
+    )
+
+
+def _expired(entry: dict) -> bool:
+    return time.time() - entry.get("stored_at", 0) >= LLM_CACHE_TTL
+
+
+def stats() -> dict:
+    """Hit/miss counters and tokens saved for this worker, plus the memory
+    tier's footprint. Bypassed lookups do not count toward the ratio."""
+    lookups = _counters["memory_hits"] + _counters["redis_hits"] + _counters["misses"]
+    hits = _counters["memory_hits"] + _counters["redis_hits"]
+    return {
+        **_counters,
+        "hit_ratio": hits / lookups if lookups else 0.0,
+        "memory": _memory.stats(),
+    }
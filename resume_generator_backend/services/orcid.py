@@ -1,10 +1,8 @@
-import json
 import logging
 import re
 
-import httpx
-
-from services.cache import get_redis
+from services import profile_cache
+from services.http_clients import get_http_client
 
 logger = logging.getLogger("resume_libre")
 
@@ -37,21 +35,9 @@ async def fetch_orcid_profile(orcid_id: str) -> dict:
     if not orcid_id:
         return {}
 
-    try:
-        redis = get_redis()
-        cached = await redis.get(f"orcid:{orcid_id}")
-        if cached:
-            return json.loads(cached)
-    except Exception:
-        redis = None
-
-    data = await _fetch_from_orcid(orcid_id)
-    if data and redis:
-        try:
-            await redis.setex(f"orcid:{orcid_id}", 86400, json.dumps(data))  # 24h TTL
-        except Exception:
-            pass
-    return data
+    return await profile_cache.cached_fetch(
+        "orcid", orcid_id, lambda: _fetch_from_orcid(orcid_id)
+    )
 
 
 async def _fetch_from_orcid(orcid_id: str) -> dict:
@@ -59,8 +45,7 @@ async def _fetch_from_orcid(orcid_id: str) -> dict:
     headers = {"Accept": "application/json"}
 
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.get(url, headers=headers)
+        response = await get_http_client("orcid").get(url, headers=headers)
 
         if response.status_code != 200:
             logger.warning(f"ORCID record fetch failed: {response.status_code}")
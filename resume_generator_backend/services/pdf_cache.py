@@ -0,0 +1,98 @@
+"""Content-addressed cache of compiled PDFs, in front of latex-service.
+
+The editor recompiles on every save, usually with LaTeX byte-identical to
+the previous compile, and every compile is then re-uploaded to /ats/check.
+Tectonic output for the same source is the same PDF, so compiles are keyed
+by a SHA-256 of the normalized LaTeX and served from:
+
+1. an in-process LRU (per uvicorn worker, bounded by bytes), then
+2. Redis (shared across workers, TTL'd, bounded by entry count with the
+   oldest entries evicted first).
+
+Both tiers hold a PDF for at most PDF_CACHE_TTL (the retention PRIVACY.md
+publishes): a PDF promoted from Redis keeps only its remaining Redis
+lifetime in memory. Hits skip the sidecar round trip entirely. Cache failures never break a
+compile — a Redis outage degrades to the memory tier, then to compiling.
+"""
+
+import hashlib
+import os
+import re
+
+from services.cache import MemoryLRU, get_redis, get_with_ttl, put_bounded
+
+PDF_CACHE_TTL = int(os.getenv("PDF_CACHE_TTL", "3600"))
+MEMORY_MAX_BYTES = int(os.getenv("PDF_CACHE_MEMORY_MB", "32")) * 1024 * 1024
+REDIS_MAX_ENTRIES = int(os.getenv("PDF_CACHE_REDIS_ENTRIES", "200"))
+# Larger PDFs are image-heavy outliers; not worth a Redis slot.
+MAX_ENTRY_BYTES = 2 * 1024 * 1024
+
+_KEY_PREFIX = "pdf:"
+_INDEX_KEY = "pdf:index"
+
+# Trailing spaces/tabs never change TeX output — except after a backslash,
+# where "\ " is a control space, so that run is left alone.
+_TRAILING_WS_RE = re.compile(r"(?<![\\ \t])[ \t]+$", re.MULTILINE)
+
+_memory = MemoryLRU(MEMORY_MAX_BYTES, ttl=PDF_CACHE_TTL)
+_counters = {"memory_hits": 0, "redis_hits": 0, "misses": 0, "stores": 0}
+
+
+def normalize_latex(latex: str) -> str:
+    """Canonical form for hashing: LF line endings, no trailing whitespace."""
+    text = latex.replace("\r\n", "\n").replace("\r", "\n")
+    return _TRAILING_WS_RE.sub("", text).strip()
+
+
+def cache_key(latex: str) -> str:
+    return hashlib.sha256(normalize_latex(latex).encode("utf-8")).hexdigest()
+
+
+async def get_pdf(key: str) -> bytes | None:
+    pdf = _memory.get(key)
+    if pdf is not None:
+        _counters["memory_hits"] += 1
+        return pdf
+
+    try:
+        pdf, ttl = await get_with_ttl(get_redis(), _KEY_PREFIX + key)
+    except Exception:
+        pdf = None
+    if pdf is not None:
+        _counters["redis_hits"] += 1
+        _memory.set(key, pdf, len(pdf), ttl)
+        return pdf
+
+    _counters["misses"] += 1
+    return None
+
+
+async def put_pdf(key: str, pdf: bytes) -> None:
+    if len(pdf) > MAX_ENTRY_BYTES:
+        return
+    _counters["stores"] += 1
+    _memory.set(key, pdf, len(pdf))
+
+    await put_bounded(
+        _KEY_PREFIX, _INDEX_KEY, key, pdf, PDF_CACHE_TTL, REDIS_MAX_ENTRIES
+    )
+
+
+async def is_shared(key: str) -> bool:
+    """Whether Redis holds `key`, so any worker can serve it by key. A PDF
+    only in this worker's memory (oversized, or Redis down) is not."""
+    try:
+        return bool(await get_redis().exists(_KEY_PREFIX + key))
+    except Exception:
+        return False
+
+
+def stats() -> dict:
+    """Hit/miss counters for this worker plus the memory tier's footprint."""
+    lookups = _counters["memory_hits"] + _counters["redis_hits"] + _counters["misses"]
+    hits = _counters["memory_hits"] + _counters["redis_hits"]
+    return {
+        **_counters,
+        "hit_ratio": hits / lookups if lookups else 0.0,
+        "memory": _memory.stats(),
+    }
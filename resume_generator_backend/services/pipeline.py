@@ -1,3 +1,6 @@
+import asyncio
+import logging
+import os
 from collections.abc import Callable
 from typing import Any
 
@@ -10,6 +13,21 @@ from services.linkedin import fetch_linkedin_profile
 from services.orcid import fetch_orcid_profile
 from services.prompt import build_user_prompt
 
+logger = logging.getLogger("resume_libre")
+
+# Profile fetches in flight at once per request. Rows run concurrently so
+# time-to-first-token is the slowest fetch, not the sum of all of them; the
+# cap keeps MAX_PROFILES rows of one type from hitting one API ten-wide.
+FETCH_CONCURRENCY = 4
+
+# Overall budget for the fetch stage, in seconds. Rows still in flight when
+# it runs out are cancelled and the prompt is built from whatever arrived,
+# so a slow third party (Apify polls for minutes) cannot hold the first LLM
+# token hostage. Per-call override via run(..., fetch_deadline=...).
+FETCH_DEADLINE_SECONDS = float(os.getenv("PROFILE_FETCH_DEADLINE", "20"))
+
+_PROFILE_TYPES = ("github", "linkedin", "huggingface", "orcid")
+
 
 def _as_profile_tuples(
     profiles: list | None,
@@ -86,42 +104,87 @@ class ResumePipeline:
                 data = result
         return data
 
+    async def _fetch_one(self, ptype: str, value: str) -> Any:
+        """Fetch one profile row; "" / {} when the source had nothing."""
+        if ptype == "github":
+            readme = await fetch_github_readme(value)
+            return await self._apply_middleware("readme_fetch", readme)
+        if ptype == "linkedin":
+            return await fetch_linkedin_profile(value)
+        if ptype == "huggingface":
+            return await fetch_huggingface_profile(value)
+        return await fetch_orcid_profile(value)
+
     async def _fetch_profiles(
-        self, refs: list[tuple[str, str]]
+        self, refs: list[tuple[str, str]], deadline: float | None = None
     ) -> tuple[list, list, list, list]:
-        """Fetch every profile source row; one bus event per fetch."""
+        """Fetch every profile source row concurrently (at most
+        FETCH_CONCURRENCY in flight); one bus event per fetch as it completes.
+        Results are assembled in input order so the prompt is deterministic.
+
+        Rows unfinished after `deadline` seconds are cancelled and reported
+        in a single PROFILES_DROPPED event; None waits for every row.
+        """
         github_readmes: list[tuple[str, str]] = []
         linkedin_profiles: list[dict] = []
         hf_profiles: list[tuple[str, dict]] = []
         orcid_profiles: list[dict] = []
 
-        for ptype, value in refs:
+        refs = [(ptype, value) for ptype, value in refs if ptype in _PROFILE_TYPES]
+        semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+        async def fetch(ptype: str, value: str) -> Any:
+            async with semaphore:
+                try:
+                    data = await self._fetch_one(ptype, value)
+                except Exception as e:
+                    # Fail open like the fetchers themselves: one broken
+                    # source must not sink the rows fetched alongside it.
+                    logger.warning(f"{ptype} fetch error for {value!r}: {e}")
+                    data = None
+            await bus.publish(
+                Events.README_FETCHED, {"source": ptype, "id": value, "ok": bool(data)}
+            )
+            return data
+
+        tasks = [asyncio.create_task(fetch(ptype, value)) for ptype, value in refs]
+        try:
+            if tasks:
+                await asyncio.wait(tasks, timeout=deadline)
+        finally:
+            # Deadline hit (or the request itself was cancelled): stop the
+            # stragglers rather than leave them running unowned.
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.wait(tasks)
+
+        dropped = [
+            {"source": ptype, "id": value}
+            for (ptype, value), task in zip(refs, tasks, strict=True)
+            if task.cancelled()
+        ]
+        if dropped:
+            logger.warning(
+                f"profile fetch deadline ({deadline}s) dropped {len(dropped)} "
+                f"source(s): {dropped}"
+            )
+            await bus.publish(
+                Events.PROFILES_DROPPED, {"deadline": deadline, "sources": dropped}
+            )
+
+        for (ptype, value), task in zip(refs, tasks, strict=True):
+            data = None if task.cancelled() else task.result()
+            if not data:
+                continue
             if ptype == "github":
-                readme = await fetch_github_readme(value)
-                readme = await self._apply_middleware("readme_fetch", readme)
-                ok = bool(readme)
-                if ok:
-                    github_readmes.append((value, readme))
+                github_readmes.append((value, data))
             elif ptype == "linkedin":
-                data = await fetch_linkedin_profile(value)
-                ok = bool(data)
-                if ok:
-                    linkedin_profiles.append(data)
+                linkedin_profiles.append(data)
             elif ptype == "huggingface":
-                data = await fetch_huggingface_profile(value)
-                ok = bool(data)
-                if ok:
-                    hf_profiles.append((value, data))
-            elif ptype == "orcid":
-                data = await fetch_orcid_profile(value)
-                ok = bool(data)
-                if ok:
-                    orcid_profiles.append(data)
+                hf_profiles.append((value, data))
             else:
-                continue
-            await bus.publish(
-                Events.README_FETCHED, {"source": ptype, "id": value, "ok": ok}
-            )
+                orcid_profiles.append(data)
 
         return github_readmes, linkedin_profiles, hf_profiles, orcid_profiles
 
@@ -170,8 +233,13 @@ class ResumePipeline:
         ats_feedback: str | None = None,
         demo: bool = False,
         profiles: list | None = None,
+        fetch_deadline: float | None = FETCH_DEADLINE_SECONDS,
     ) -> str:
-        """Execute the full pipeline. Returns the generated resume content."""
+        """Execute the full pipeline. Returns the generated resume content.
+
+        `fetch_deadline` bounds the profile-fetch stage in seconds (None
+        waits for every source).
+        """
 
         if demo:
             return await generate_resume_content("", demo=True)
@@ -181,7 +249,7 @@ class ResumePipeline:
         )
 
         # Stage 1: Fetch every profile source
-        fetched = await self._fetch_profiles(refs)
+        fetched = await self._fetch_profiles(refs, fetch_deadline)
 
         # Stage 2: Build the prompt
         user_prompt = self._build_prompt_from_profiles(
@@ -222,8 +290,12 @@ class ResumePipeline:
         ats_feedback: str | None = None,
         demo: bool = False,
         profiles: list | None = None,
+        fetch_deadline: float | None = FETCH_DEADLINE_SECONDS,
     ):
-        """Execute the pipeline with streaming generation. Yields tokens."""
+        """Execute the pipeline with streaming generation. Yields tokens.
+
+        `fetch_deadline` is the same fetch-stage budget as in run().
+        """
 
         if demo:
             async for token in generate_resume_stream("", demo=True):
@@ -235,7 +307,7 @@ class ResumePipeline:
         )
 
         # Stage 1: Fetch every profile source
-        fetched = await self._fetch_profiles(refs)
+        fetched = await self._fetch_profiles(refs, fetch_deadline)
 
         # Stage 2: Build the prompt
         user_prompt = self._build_prompt_from_profiles(
@@ -0,0 +1,159 @@
+"""Stale-while-revalidate cache for the profile sources (GitHub, LinkedIn,
+HuggingFace, ORCID).
+
+A plain TTL made the first user after expiry pay the full upstream
+latency — minutes for an Apify LinkedIn run. Entries are now envelopes,
+{"fetched_at": unix time, "data": ...}, under profile:<source>:<key>,
+read against two per-source TTLs:
+
+- younger than the soft TTL: fresh, served as is;
+- between soft and hard TTL: stale, served instantly while one
+  background refresh (coalesced through services.singleflight) replaces
+  it. A failed refresh keeps the stale copy and holds off retrying for
+  RETRY_AFTER seconds, so a down upstream is not hit on every request;
+- past the hard TTL Redis has evicted it (or it is ignored, should its
+  Redis expiry predate a lower hard TTL): a miss, fetched inline.
+
+TTLs are read from <SOURCE>_CACHE_SOFT_TTL / <SOURCE>_CACHE_HARD_TTL
+(seconds). The hard TTL is how long profile data is retained, so the
+defaults match PRIVACY.md (GitHub 1 h, the others 24 h); raising one
+changes the published retention. Empty results — the fetchers' "not
+found / upstream failed" — are never stored. Redis failures never fail a
+fetch.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from services import singleflight
+from services.cache import get_redis
+
+logger = logging.getLogger("resume_libre")
+
+
+@dataclass(frozen=True)
+class Freshness:
+    soft_ttl: int  # served without a refresh until this age
+    hard_ttl: int  # served stale (and refreshed) until this age, then evicted
+
+
+def _freshness(source: str, soft_ttl: int, hard_ttl: int) -> Freshness:
+    prefix = f"{source.upper()}_CACHE"
+    return Freshness(
+        soft_ttl=int(os.getenv(f"{prefix}_SOFT_TTL", str(soft_ttl))),
+        hard_ttl=int(os.getenv(f"{prefix}_HARD_TTL", str(hard_ttl))),
+    )
+
+
+FRESHNESS = {
+    "github": _freshness("github", 1800, 3600),
+    "linkedin": _freshness("linkedin", 12 * 3600, 86400),
+    "hf": _freshness("hf", 12 * 3600, 86400),
+    "orcid": _freshness("orcid", 12 * 3600, 86400),
+}
+RETRY_AFTER = int(os.getenv("PROFILE_CACHE_RETRY_AFTER", "300"))
+
+_refreshes: set[asyncio.Task] = set()
+_counters = {
+    "fresh_hits": 0,
+    "stale_hits": 0,
+    "misses": 0,
+    "refreshes": 0,
+    "failed_refreshes": 0,
+}
+
+
+async def cached_fetch(
+    source: str, key: str, fetch: Callable[[], Awaitable], timeout: float = 30.0
+):
+    """`await fetch()` through the cache. Concurrent misses (and stale
+    refreshes) share one call; `timeout` is singleflight's."""
+    freshness = FRESHNESS[source]
+    cache_key = f"profile:{source}:{key}"
+    envelope = await _read(cache_key)
+    now = time.time()
+    if envelope is not None and now - envelope["fetched_at"] >= freshness.hard_ttl:
+        envelope = None
+
+    if envelope is None:
+        _counters["misses"] += 1
+
+        async def load():
+            data = await fetch()
+            if data:
+                await _write(cache_key, data, time.time(), freshness.hard_ttl)
+            return data
+
+        return await singleflight.run(cache_key, load, timeout)
+
+    if now - envelope["fetched_at"] < freshness.soft_ttl:
+        _counters["fresh_hits"] += 1
+    else:
+        _counters["stale_hits"] += 1
+        if now >= envelope.get("retry_at", 0):
+            _revalidate(cache_key, envelope, fetch, timeout, freshness)
+    return envelope["data"]
+
+
+def _revalidate(cache_key, envelope, fetch, timeout, freshness) -> None:
+    async def refresh():
+        _counters["refreshes"] += 1
+        try:
+            data = await fetch()
+        except Exception as e:
+            logger.warning("profile refresh %s failed: %s", cache_key, e)
+            data = None
+        if data:
+            await _write(cache_key, data, time.time(), freshness.hard_ttl)
+        else:
+            # Keep serving the stale copy until its hard TTL; just note
+            # when to try again.
+            _counters["failed_refreshes"] += 1
+            expires_in = envelope["fetched_at"] + freshness.hard_ttl - time.time()
+            await _write(
+                cache_key,
+                envelope["data"],
+                envelope["fetched_at"],
+                max(1, int(expires_in)),
+                retry_at=time.time() + RETRY_AFTER,
+            )
+        return data
+
+    task = asyncio.ensure_future(singleflight.run(cache_key, refresh, timeout))
+    _refreshes.add(task)  # a bare task may be garbage-collected mid-refresh
+    task.add_done_callback(_refreshes.discard)
+
+
+async def _read(cache_key: str) -> dict | None:
+    try:
+        raw = await get_redis().get(cache_key)
+        return json.loads(raw) if raw else None
+    except Exception:
+        return None
+
+
+async def _write(cache_key, data, fetched_at, ttl, retry_at=None) -> None:
+    envelope = {"fetched_at": fetched_at, "data": data}
+    if retry_at is not None:
+        envelope["retry_at"] = retry_at
+    try:
+        await get_redis().set(cache_key, json.dumps(envelope), ex=ttl)
+    except Exception:
+        pass
+
+
+def stats() -> dict:
+    """Fresh/stale/miss counters for this worker; stale hits were served
+    instantly while a refresh ran."""
+    lookups = _counters["fresh_hits"] + _counters["stale_hits"] + _counters["misses"]
+    hits = _counters["fresh_hits"] + _counters["stale_hits"]
+    return {
+        **_counters,
+        "hit_ratio": hits / lookups if lookups else 0.0,
+        "refreshing": len(_refreshes),
+    }
@@ -0,0 +1,163 @@
+"""Request coalescing for profile fetches: one upstream call per key.
+
+Ten users generating from the same GitHub username at once all miss the
+cache together; without coalescing that is ten identical upstream calls
+(and, for LinkedIn, ten paid Apify actor runs). run() makes concurrent
+misses for one key share a single fetch:
+
+1. In-process: the first caller starts the fetch as a task; later
+   callers in the same worker await the same task (shielded, so one
+   caller disconnecting does not cancel it for the rest).
+2. Across workers: the task takes a Redis lock (SET NX, expiring after
+   `timeout`). The holder fetches, publishes the result to a channel
+   and keeps it under a short-lived result key for anyone who subscribed
+   late, then releases the lock. Workers that lose the lock wait for
+   that result instead of fetching.
+
+A waiter whose holder goes quiet for `timeout` (worker killed mid-fetch)
+fetches for itself. A holder whose fetch raises publishes the failure
+instead, and its waiters raise HolderFailed rather than each retrying —
+otherwise one failed Apify run turns into a paid run per waiting worker,
+all at once. This is what callers in the holder's own worker see too:
+the shared task's exception. Without Redis only the in-process tier
+applies. Results must be JSON-serializable.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from services.cache import get_redis
+
+logger = logging.getLogger("resume_libre")
+
+RESULT_TTL = int(os.getenv("SINGLEFLIGHT_RESULT_TTL", "10"))
+
+_LOCK_PREFIX = "singleflight:lock:"
+_RESULT_PREFIX = "singleflight:result:"
+_CHANNEL_PREFIX = "singleflight:done:"
+
+_inflight: dict[str, asyncio.Task] = {}
+_counters = {
+    "fetches": 0,
+    "joined": 0,
+    "remote_results": 0,
+    "remote_timeouts": 0,
+    "remote_failures": 0,
+}
+
+
+class HolderFailed(RuntimeError):
+    """The worker fetching this key for everyone raised."""
+
+
+async def run(key: str, fetch: Callable[[], Awaitable], timeout: float = 30.0):
+    """`await fetch()` once for all concurrent callers of `key`.
+
+    `timeout` bounds both the cross-worker lock and how long a worker
+    waits on another worker's fetch — set it above the fetch's own
+    worst case (Apify polls for minutes).
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_shared(key, fetch, timeout))
+        _inflight[key] = task
+        task.add_done_callback(lambda _task: _inflight.pop(key, None))
+    else:
+        _counters["joined"] += 1
+    return await asyncio.shield(task)
+
+
+async def _fetch_shared(key: str, fetch, timeout: float):
+    try:
+        redis = get_redis()
+        token = uuid.uuid4().hex
+        locked = await redis.set(
+            _LOCK_PREFIX + key, token, nx=True, px=int(timeout * 1000)
+        )
+    except Exception:
+        return await _fetch(fetch)
+
+    if not locked:
+        published = await _await_result(redis, key, timeout)
+        if published is None:
+            return await _fetch(fetch)
+        if not published["ok"]:
+            _counters["remote_failures"] += 1
+            raise HolderFailed(f"{key}: {published.get('error', 'fetch failed')}")
+        _counters["remote_results"] += 1
+        return published["value"]
+
+    outcome = {"ok": False}
+    try:
+        value = await _fetch(fetch)
+        outcome = {"ok": True, "value": value}
+        return value
+    except Exception as e:
+        outcome["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        await _publish(redis, key, token, outcome)
+
+
+async def _fetch(fetch):
+    _counters["fetches"] += 1
+    return await fetch()
+
+
+async def _await_result(redis, key: str, timeout: float) -> dict | None:
+    """The holder's published outcome, or None if it never came."""
+    try:
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(_CHANNEL_PREFIX + key)
+    except Exception:
+        return None
+    try:
+        # Subscribed first, then look: a result published in between is
+        # still under the result key.
+        raw = await redis.get(_RESULT_PREFIX + key)
+        deadline = time.monotonic() + timeout
+        while raw is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                _counters["remote_timeouts"] += 1
+                logger.warning("singleflight: no result for %s, fetching", key)
+                return None
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=min(remaining, 1.0)
+            )
+            if message is not None:
+                raw = message["data"]
+        return json.loads(raw)
+    except Exception:
+        return None
+    finally:
+        try:
+            await pubsub.aclose()
+        except Exception:
+            pass
+
+
+async def _publish(redis, key: str, token: str, outcome: dict) -> None:
+    raw = json.dumps(outcome)
+    try:
+        await redis.set(_RESULT_PREFIX + key, raw, ex=RESULT_TTL)
+        await redis.publish(_CHANNEL_PREFIX + key, raw)
+        # Release only our own lock: it may have expired and been retaken.
+        async with redis.pipeline() as pipe:
+            await pipe.watch(_LOCK_PREFIX + key)
+            if (await pipe.get(_LOCK_PREFIX + key)) == token.encode():
+                pipe.multi()
+                pipe.delete(_LOCK_PREFIX + key)
+                await pipe.execute()
+    except Exception:
+        pass
+
+
+def stats() -> dict:
+    """Upstream fetches run by this worker vs calls that shared one."""
+    return {**_counters, "inflight": len(_inflight)}
@@ -15,6 +15,10 @@ sys.path.insert(0, str(backend_dir))
 # Without this, the limiter points at redis://localhost:6379 — green on any
 # machine with a local Redis, ConnectionError in CI.
 os.environ.setdefault("RATE_LIMIT_STORAGE", "memory://")
+# Run the ATS battery inline: tests patch parser internals in this process,
+# and spawning worker processes per TestClient lifespan is slow. The pool
+# itself is covered in test_ats_pool.py.
+os.environ.setdefault("ATS_POOL_WORKERS", "0")
 
 
 @pytest.fixture
@@ -69,3 +73,19 @@ def mock_env_vars():
     os.environ["RATE_LIMIT_STORAGE"] = "memory://"
     yield
     # Cleanup is automatic since we're just setting env vars
+
+
+@pytest.fixture(autouse=True)
+def isolated_ats_cache():
+    """ATS analyses are cached by upload bytes; one test's cached analysis
+    must not satisfy another's (or reach a developer's local Redis)."""
+    from ats import cache as ats_cache
+
+    ats_cache._memory.clear()
+    no_redis = Exception("no redis")
+    with (
+        patch("ats.cache.get_redis", side_effect=no_redis),
+        patch("services.cache.get_redis", side_effect=no_redis),
+    ):
+        yield
+    ats_cache._memory.clear()
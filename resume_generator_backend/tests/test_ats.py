@@ -3,6 +3,7 @@ with PyMuPDF / python-docx so no binary fixtures live in the repo."""
 
 import io
 import os
+from unittest.mock import patch
 
 import docx
 import fitz
@@ -184,3 +185,72 @@ def test_oversize_upload_rejected(client):
     blob = b"%PDF-" + os.urandom(5 * 1024 * 1024)
     resp = post_file(client, "big.pdf", blob)
     assert resp.status_code == 413
+
+
+def test_oversize_body_refused_before_parsing(client):
+    """A declared Content-Length past the ceiling is a 413 before the
+    multipart body is read or the endpoint runs."""
+    blob = b"%PDF-" + bytes(20 * 1024 * 1024)
+    with patch("ats.router.input_handler.validate_upload") as validate:
+        resp = post_file(client, "big.pdf", blob)
+    assert resp.status_code == 413
+    assert "5 MB" in resp.json()["detail"]
+    validate.assert_not_called()
+
+
+def test_oversize_chunked_body_refused(client):
+    boundary = "bench"
+    head = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; '
+        'filename="big.pdf"\r\nContent-Type: application/pdf\r\n\r\n%PDF-'
+    ).encode()
+
+    def body():  # no Content-Length: sent chunked
+        yield head
+        for _ in range(100):
+            yield bytes(64 * 1024)
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    resp = client.post(
+        "/ats/check",
+        content=body(),
+        headers={"content-type": f"multipart/form-data; boundary={boundary}"},
+    )
+    assert resp.status_code == 413
+
+
+async def test_read_upload_caps_the_read():
+    from fastapi import HTTPException, UploadFile
+
+    from core.uploads import read_upload
+
+    small = UploadFile(io.BytesIO(b"%PDF-1.7 tiny"))
+    assert await read_upload(small, max_bytes=64) == b"%PDF-1.7 tiny"
+    assert small.file.closed
+
+    large = UploadFile(io.BytesIO(bytes(65)))
+    with pytest.raises(HTTPException) as exc:
+        await read_upload(large, max_bytes=64)
+    assert exc.value.status_code == 413
+
+
+def test_check_parses_each_backend_once(client):
+    """One /ats/check opens pdfplumber and PyMuPDF once each and
+    word-segments every page once, however many checks read them."""
+    import pdfplumber
+    from pdfplumber.page import Page
+
+    pdf = make_pdf([((72, 72, 523, 770), CLEAN_RESUME_TEXT)])
+    with (
+        patch("ats.document.pdfplumber.open", wraps=pdfplumber.open) as plumber_open,
+        patch("ats.document.fitz.open", wraps=fitz.open) as fitz_open,
+        patch.object(
+            Page, "extract_words", autospec=True, side_effect=Page.extract_words
+        ) as extract_words,
+    ):
+        resp = post_file(client, "resume.pdf", pdf)
+
+    assert resp.status_code == 200
+    assert plumber_open.call_count == 1
+    assert fitz_open.call_count == 1
+    assert extract_words.call_count == 1  # one page
@@ -0,0 +1,168 @@
+"""Tests for POST /ats/check/batch (ats/batch.py): per-file NDJSON reports,
+isolated errors, ZIP expansion and aggregate stats."""
+
+import io
+import json
+import zipfile
+
+import fitz
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from ats import batch
+
+RESUME_TEXT = """Jane Doe
+jane.doe@example.com | +1 555-123-4567
+
+Experience
+Software Engineer at Example Corp since 2020
+- Built a billing pipeline handling two million invoices per month
+
+Education
+B.S. Computer Science, State University, 2018
+"""
+
+
+def _pdf(text=RESUME_TEXT):
+    doc = fitz.open()
+    doc.new_page().insert_textbox(fitz.Rect(72, 72, 523, 770), text, fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def client():
+    from core.deps import verify_jwt
+    from core.limiter import limiter
+    from main import app
+
+    limiter.reset()
+    app.dependency_overrides[verify_jwt] = lambda: {"id": "u1", "email": "u@x.org"}
+    yield TestClient(app)
+    app.dependency_overrides.pop(verify_jwt, None)
+
+
+def _batch(client, files, query=""):
+    return client.post(
+        "/ats/check/batch" + query,
+        files=[
+            ("files", (name, data, "application/octet-stream")) for name, data in files
+        ],
+    )
+
+
+def _records(resp):
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+def test_requires_auth():
+    from main import app
+
+    resp = TestClient(app).post(
+        "/ats/check/batch", files=[("files", ("a.pdf", _pdf(), "application/pdf"))]
+    )
+    assert resp.status_code in (401, 403)
+
+
+def test_mixed_batch_isolates_errors_and_aggregates(client):
+    archive = _zip(
+        {
+            "cvs/jane.pdf": _pdf(),
+            "cvs/notes.txt": b"not a resume",
+            "__MACOSX/cvs/._jane.pdf": b"junk",
+            "cvs/": b"",
+        }
+    )
+    files = [
+        ("alice.pdf", _pdf()),
+        ("broken.pdf", b"%PDF-1.7 truncated"),
+        ("cvs.zip", archive),
+    ]
+    records = _records(_batch(client, files))
+
+    *per_file, last = records
+    by_name = {record["filename"]: record for record in per_file}
+    assert set(by_name) == {"alice.pdf", "broken.pdf", "jane.pdf", "notes.txt"}
+    assert sorted(record["index"] for record in per_file) == [0, 1, 2, 3]
+    assert "report" in by_name["alice.pdf"] and "report" in by_name["jane.pdf"]
+    assert by_name["broken.pdf"]["error"]["status"] == 400
+    assert by_name["notes.txt"]["error"]["status"] == 400
+
+    aggregate = last["aggregate"]
+    assert (aggregate["files"], aggregate["reported"], aggregate["errors"]) == (4, 2, 2)
+    assert sum(aggregate["checks"]["contact-info"].values()) == 2
+
+
+def test_batch_honours_filters(client):
+    records = _records(_batch(client, [("a.pdf", _pdf())], "?categories=contact"))
+    categories = {check["category"] for check in records[0]["report"]["checks"]}
+    assert categories == {"contact"}
+
+
+def test_oversized_zip_member_is_refused_unread(client, monkeypatch):
+    monkeypatch.setattr(batch, "MAX_FILE_BYTES", 1000)
+    records = _records(_batch(client, [("cvs.zip", _zip({"big.pdf": _pdf()}))]))
+    assert records[0]["error"]["status"] == 413
+
+
+def test_too_many_documents_is_413(client, monkeypatch):
+    monkeypatch.setattr(batch, "MAX_FILES", 2)
+    resp = _batch(client, [(f"{i}.pdf", _pdf()) for i in range(3)])
+    assert resp.status_code == 413
+
+
+def test_oversized_batch_body_is_413_before_parsing(client, monkeypatch):
+    from core import uploads
+
+    monkeypatch.setitem(uploads.UPLOAD_LIMITS, "/ats/check/batch", (2048, "too big"))
+    monkeypatch.setattr(batch, "documents", _unreachable)
+    resp = _batch(client, [(f"{i}.pdf", _pdf()) for i in range(3)])
+    assert resp.status_code == 413
+    assert resp.json()["detail"] == "too big"
+
+
+def _unreachable(uploads):
+    raise AssertionError("batch body parsed")
+
+
+def test_zip_over_the_batch_ceiling_is_413(client, monkeypatch):
+    monkeypatch.setattr(batch, "BATCH_MAX_BYTES", 100)
+    resp = _batch(client, [("cvs.zip", _zip({"a.pdf": _pdf()}))])
+    assert resp.status_code == 413
+
+
+def test_unreadable_zip_is_400(client):
+    assert _batch(client, [("cvs.zip", b"PK not a zip")]).status_code == 400
+
+
+async def test_busy_pool_is_retried(monkeypatch):
+    monkeypatch.setattr(batch.asyncio, "sleep", _no_sleep)
+    calls = []
+
+    async def flaky_analysis(data, kind, selected):
+        calls.append(kind)
+        if len(calls) == 1:
+            raise HTTPException(503, "busy", headers={"Retry-After": "5"})
+        from ats import battery
+
+        return battery.analyze(data, kind, selected)
+
+    entries = batch.documents([("a.pdf", io.BytesIO(_pdf()))])
+    records = [r async for r in batch.run(entries, flaky_analysis, None, 1)]
+    assert "report" in records[0]
+    assert len(calls) == 2
+
+
+async def _no_sleep(seconds):
+    return None
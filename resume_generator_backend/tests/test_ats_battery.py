@@ -6,9 +6,11 @@ Fixture PDFs are generated in memory with PyMuPDF — no binaries in the repo.
 """
 
 import io
+from unittest.mock import patch
 
 import docx
 import fitz
+import pdfplumber
 import pytest
 from fastapi.testclient import TestClient
 
@@ -118,6 +120,32 @@ def test_endpoint_three_page_pdf_fails_page_count(client):
     assert check["metric"] == {"kind": "count", "value": 3}
 
 
+def test_endpoint_long_pdf_analyzes_only_the_page_budget(client, monkeypatch):
+    from ats import battery
+
+    monkeypatch.setattr(battery, "PAGE_BUDGET", 2)
+    pdf = make_pdf([((72, 72, 523, 770), BODY_TEXT)], pages=40)
+    with patch("ats.document.pdfplumber.open", wraps=pdfplumber.open) as opened:
+        body = post_pdf(client, pdf).json()
+
+    assert body["pages"] == {"total": 40, "analyzed": 2, "skipped": 38}
+    assert opened.call_args.kwargs["pages"] == [1, 2]
+    # The true page count still drives the verdict.
+    assert check_by_id(body, "page-count")["metric"]["value"] == 40
+    assert body["extracted"]["name"]["value"] == "John Doe"
+
+
+def test_endpoint_short_pdf_skips_no_pages(client):
+    body = post_pdf(client, make_pdf([((72, 72, 523, 770), BODY_TEXT)])).json()
+    assert body["pages"] == {"total": 1, "analyzed": 1, "skipped": 0}
+
+
+def test_docx_report_has_no_page_counts(client):
+    data = make_docx(BODY_TEXT.splitlines())
+    resp = client.post("/ats/check", files={"file": ("resume.docx", data, DOCX_MIME)})
+    assert "pages" not in resp.json()
+
+
 # ── resume-length ────────────────────────────────────────────────────
 
 
@@ -0,0 +1,150 @@
+"""Tests for the ATS analysis cache (ats/cache.py): re-uploads and
+/ats/extract after /ats/check reuse one analysis of the same bytes.
+
+The conftest `isolated_ats_cache` fixture empties the memory tier and
+makes Redis unavailable around every test.
+"""
+
+import json
+from unittest.mock import patch
+
+import fakeredis
+import fitz
+import pytest
+from fastapi.testclient import TestClient
+
+from ats import battery
+from ats import cache as ats_cache
+
+RESUME_TEXT = """Jane Doe
+jane.doe@example.com | +1 555-123-4567
+
+Experience
+Software Engineer at Example Corp since 2020
+- Built a billing pipeline handling two million invoices per month
+
+Education
+B.S. Computer Science, State University, 2018
+"""
+
+
+def _pdf(text=RESUME_TEXT):
+    doc = fitz.open()
+    doc.new_page().insert_textbox(fitz.Rect(72, 72, 523, 770), text, fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from core.limiter import limiter
+    from main import app
+
+    monkeypatch.setenv("DEMO_MODE", "true")  # /ats/extract without a JWT
+    limiter.reset()
+    return TestClient(app)
+
+
+@pytest.fixture
+def counted_analyze():
+    with patch("ats.router.battery.analyze", wraps=battery.analyze) as analyze:
+        yield analyze
+
+
+def _without_timings(report):
+    """Report minus duration_ms — per-request checks are re-timed."""
+    checks = [
+        {k: v for k, v in check.items() if k != "duration_ms"}
+        for check in report["checks"]
+    ]
+    return {**report, "checks": checks}
+
+
+def _check(client, data, filename="jane-doe-resume.pdf"):
+    return client.post(
+        "/ats/check", files={"file": (filename, data, "application/pdf")}
+    )
+
+
+def test_reupload_is_analyzed_once(client, counted_analyze):
+    data = _pdf()
+    first = _check(client, data)
+    second = _check(client, data)
+
+    assert first.status_code == second.status_code == 200
+    assert _without_timings(first.json()) == _without_timings(second.json())
+    assert counted_analyze.call_count == 1
+    assert ats_cache.stats()["memory_hits"] == 1
+
+
+def test_filename_check_is_per_request(client, counted_analyze):
+    data = _pdf()
+    named = _check(client, data, "jane-doe-resume.pdf").json()
+    synthesized = _check(client, data, "resume.pdf").json()
+
+    named_ids = {c["id"] for c in named["checks"]}
+    synthesized_ids = {c["id"] for c in synthesized["checks"]}
+    assert named_ids - synthesized_ids == {"filename"}
+    assert counted_analyze.call_count == 1
+
+
+def test_extract_after_check_reuses_analysis(client, counted_analyze):
+    data = _pdf()
+    checked = _check(client, data).json()
+    resp = client.post(
+        "/ats/extract", files={"file": ("cv.pdf", data, "application/pdf")}
+    )
+
+    assert resp.status_code == 200
+    assert counted_analyze.call_count == 1
+    assert resp.json()["extracted"]["email"] == checked["extracted"]["email"]
+
+
+def test_changed_bytes_miss(client, counted_analyze):
+    _check(client, _pdf())
+    _check(client, _pdf(RESUME_TEXT + "\nSkills\nPython, Go\n"))
+    assert counted_analyze.call_count == 2
+
+
+async def test_redis_tier_refills_memory_and_stores_no_document():
+    data = _pdf()
+    key = ats_cache.upload_key(data, "pdf")
+    analysis = battery.analyze(data, "pdf")
+    raw = json.dumps(analysis)
+    redis = fakeredis.FakeAsyncRedis()
+    await redis.set("ats:" + key, raw, ex=600)
+
+    with patch("ats.cache.get_redis", return_value=redis):
+        assert await ats_cache.get_analysis(key) == analysis
+        await redis.delete("ats:" + key)
+        assert await ats_cache.get_analysis(key) == analysis  # from memory
+
+    assert ats_cache.stats()["redis_hits"] >= 1
+    assert data.hex() not in raw and "%PDF" not in raw
+
+
+async def test_memory_copy_expires_after_the_cache_ttl():
+    # Extracted text and contact fields: PRIVACY.md publishes ATS_CACHE_TTL.
+    analysis = {"texts": {"pdfplumber": "Jane Doe"}}
+    with patch("services.cache.time") as clock:
+        clock.monotonic.return_value = 1000.0
+        await ats_cache.put_analysis("k", analysis)
+        clock.monotonic.return_value += ats_cache.ATS_CACHE_TTL - 1
+        assert await ats_cache.get_analysis("k") == analysis
+        clock.monotonic.return_value += 1
+        assert await ats_cache.get_analysis("k") is None
+
+
+async def test_promoted_copy_keeps_the_remaining_redis_ttl():
+    redis = fakeredis.FakeAsyncRedis()
+    await redis.set("ats:k", json.dumps({"texts": {}}), ex=60)
+    with (
+        patch("ats.cache.get_redis", return_value=redis),
+        patch("services.cache.time") as clock,
+    ):
+        clock.monotonic.return_value = 1000.0
+        assert await ats_cache.get_analysis("k") == {"texts": {}}
+        await redis.delete("ats:k")
+        clock.monotonic.return_value += 60
+        assert await ats_cache.get_analysis("k") is None
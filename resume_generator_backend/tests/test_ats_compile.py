@@ -0,0 +1,158 @@
+"""Tests for POST /ats/check/compile: one request compiles the LaTeX and
+checks the PDF, returning the report with a PDF cache key or both parts
+as multipart/mixed."""
+
+import email
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import fitz
+import pytest
+from fastapi.testclient import TestClient
+
+from ats import battery, registry
+from services import pdf_cache
+from services.latex_compiler import pdf_key
+
+RESUME_TEXT = """Jane Doe
+jane.doe@example.com | +1 555-123-4567
+
+Experience
+Software Engineer at Example Corp since 2020
+- Built a billing pipeline handling two million invoices per month
+
+Education
+B.S. Computer Science, State University, 2018
+"""
+
+LATEX = "\\documentclass{article}\n\\begin{document}\nJane Doe\n\\end{document}\n"
+MARKDOWN = "# Jane Doe\n"
+
+
+def _pdf(text=RESUME_TEXT):
+    doc = fitz.open()
+    doc.new_page().insert_textbox(fitz.Rect(72, 72, 523, 770), text, fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture(autouse=True)
+def no_redis():
+    pdf_cache._memory.clear()
+    with (
+        patch("services.pdf_cache.get_redis", side_effect=Exception("no redis")),
+        patch("services.cache.get_redis", side_effect=Exception("no redis")),
+    ):
+        yield
+    pdf_cache._memory.clear()
+
+
+@pytest.fixture
+def redis():
+    server = fakeredis.FakeAsyncRedis()
+    with (
+        patch("services.pdf_cache.get_redis", return_value=server),
+        patch("services.cache.get_redis", return_value=server),
+    ):
+        yield server
+
+
+@pytest.fixture
+def client():
+    from core.deps import require_user_or_demo
+    from core.limiter import limiter
+    from main import app
+
+    limiter.reset()
+    app.dependency_overrides[require_user_or_demo] = lambda: {"id": "u1"}
+    yield TestClient(app)
+    app.dependency_overrides.pop(require_user_or_demo, None)
+
+
+@pytest.fixture
+def sidecar():
+    pdf = _pdf()
+    client = MagicMock()
+    client.post = AsyncMock(
+        return_value=MagicMock(status_code=200, content=pdf, headers={})
+    )
+    with patch("services.latex_compiler.get_http_client", return_value=client):
+        yield client, pdf
+
+
+def _compile(client, query="", headers=None):
+    return client.post(
+        "/ats/check/compile" + query,
+        json={"markdown_content": MARKDOWN, "latex_content": LATEX},
+        headers=headers or {},
+    )
+
+
+def test_json_report_matches_upload_check(client, sidecar, redis):
+    _, pdf = sidecar
+    body = _compile(client).json()
+    uploaded = client.post(
+        "/ats/check", files={"file": ("resume.pdf", pdf, "application/pdf")}
+    ).json()
+
+    assert body["filename"] == "Jane_Doe.pdf"
+    assert body["pdf_key"] == pdf_key(LATEX)
+    assert [c["id"] for c in body["report"]["checks"]] == [
+        c["id"] for c in uploaded["checks"]
+    ]
+    assert body["report"]["summary"] == uploaded["summary"]
+
+    fetched = client.get(f"/export-resume/pdf/{body['pdf_key']}")
+    assert fetched.status_code == 200
+    assert fetched.content == pdf
+
+
+def test_pdf_key_is_null_without_the_shared_cache(client, sidecar):
+    # Only this worker's memory holds the PDF; a GET on another would 404.
+    body = _compile(client).json()
+
+    assert body["pdf_key"] is None
+    assert body["report"]["summary"]
+
+
+def test_pdf_key_is_null_for_an_uncached_pdf(client, sidecar, redis, monkeypatch):
+    monkeypatch.setattr(pdf_cache, "MAX_ENTRY_BYTES", 1024)
+    assert _compile(client).json()["pdf_key"] is None
+
+
+def test_multipart_carries_report_then_pdf(client, sidecar):
+    _, pdf = sidecar
+    resp = _compile(client, "?cost=cheap", headers={"Accept": "multipart/mixed"})
+
+    assert resp.headers["content-type"].startswith("multipart/mixed")
+    message = email.message_from_bytes(
+        b"Content-Type: "
+        + resp.headers["content-type"].encode()
+        + b"\r\n\r\n"
+        + resp.content
+    )
+    report_part, pdf_part = message.get_payload()
+    report = json.loads(report_part.get_payload(decode=True))
+    expensive = {c.id for c in registry.REGISTRY if c.cost == registry.EXPENSIVE}
+    ids = {c["id"] for c in report["checks"]}
+    assert ids and not ids & expensive
+    assert pdf_part.get_content_type() == "application/pdf"
+    assert pdf_part.get_payload(decode=True) == pdf
+
+
+def test_recompile_is_served_from_both_caches(client, sidecar):
+    sidecar_client, _ = sidecar
+    with patch("ats.router.battery.analyze", wraps=battery.analyze) as analyze:
+        first = _compile(client).json()
+        second = _compile(client).json()
+
+    assert sidecar_client.post.await_count == 1
+    assert analyze.call_count == 1
+    assert first["report"]["summary"] == second["report"]["summary"]
+
+
+def test_expired_pdf_key_is_404(client):
+    assert client.get(f"/export-resume/pdf/{'0' * 64}").status_code == 404
+    assert client.get("/export-resume/pdf/not-a-key").status_code == 422
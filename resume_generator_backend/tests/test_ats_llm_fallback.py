@@ -4,15 +4,18 @@ Unit tests exercise the double-sampling merge rules with a mocked client;
 endpoint tests cover auth, demo mode, and the no-LLM-needed happy path.
 """
 
+import asyncio
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import fitz
 import pytest
 from fastapi.testclient import TestClient
 
+from ats import llm_fallback
 from ats.extraction import FieldResult
 from ats.llm_fallback import resolve_low_confidence
+from services import llm_cache
 
 RESUME_TEXT = """jane doe
 somewhere in the city
@@ -33,12 +36,29 @@ def _mock_llm(*replies) -> MagicMock:
     """Client whose successive create() calls return the given payloads.
     A dict is JSON-encoded; an Exception instance/class is raised."""
     client = MagicMock()
-    client.chat.completions.create.side_effect = [
-        r if isinstance(r, Exception) else _completion(json.dumps(r)) for r in replies
-    ]
+    client.chat.completions.create = AsyncMock(
+        side_effect=[
+            r if isinstance(r, Exception) else _completion(json.dumps(r))
+            for r in replies
+        ]
+    )
     return client
 
 
+@pytest.fixture(autouse=True)
+def fresh_llm_cache():
+    llm_cache._memory.clear()
+    for name in llm_cache._counters:
+        llm_cache._counters[name] = 0
+    no_redis = Exception("no redis")
+    with (
+        patch("services.cache.get_redis", side_effect=no_redis),
+        patch("services.llm_cache.get_redis", side_effect=no_redis),
+    ):
+        yield
+    llm_cache._memory.clear()
+
+
 def all_high_rules():
     return {
         "email": FieldResult(value="jane@x.com"),
@@ -52,7 +72,7 @@ def all_high_rules():
 
 async def test_no_low_confidence_fields_makes_no_llm_call():
     rules = all_high_rules()
-    with patch("ats.llm_fallback._get_client") as mock_get_client:
+    with patch("ats.llm_fallback._get_async_client") as mock_get_client:
         result = await resolve_low_confidence(RESUME_TEXT, rules)
 
     assert result == rules
@@ -65,7 +85,7 @@ async def test_agreeing_samples_resolve_to_medium_llm():
         "name": FieldResult(value=None, method="heuristic", confidence="low"),
     }
     llm = _mock_llm({"name": "Jane Doe"}, {"name": "  JANE DOE "})
-    with patch("ats.llm_fallback._get_client", return_value=llm):
+    with patch("ats.llm_fallback._get_async_client", return_value=llm):
         result = await resolve_low_confidence(RESUME_TEXT, rules)
 
     assert result["name"].value == "Jane Doe"
@@ -81,7 +101,7 @@ async def test_agreeing_samples_resolve_to_medium_llm():
 async def test_disagreeing_samples_resolve_to_low_with_flag():
     rules = {"name": FieldResult(value=None, method="heuristic", confidence="low")}
     llm = _mock_llm({"name": "Jane Doe"}, {"name": "Janet Doerr"})
-    with patch("ats.llm_fallback._get_client", return_value=llm):
+    with patch("ats.llm_fallback._get_async_client", return_value=llm):
         result = await resolve_low_confidence(RESUME_TEXT, rules)
 
     assert result["name"].value == "Jane Doe"  # run1 wins
@@ -93,7 +113,7 @@ async def test_disagreeing_samples_resolve_to_low_with_flag():
 async def test_run1_invalid_email_marks_field_failed():
     rules = {"email": FieldResult(value=None, confidence="low")}
     llm = _mock_llm({"email": "not-an-email"}, {"email": "jane@x.com"})
-    with patch("ats.llm_fallback._get_client", return_value=llm):
+    with patch("ats.llm_fallback._get_async_client", return_value=llm):
         result = await resolve_low_confidence(RESUME_TEXT, rules)
 
     assert result["email"].value is None
@@ -110,7 +130,7 @@ async def test_one_bad_field_does_not_discard_others():
         {"email": "not-an-email", "name": "Jane Doe"},
         {"email": "also-bad", "name": "Jane Doe"},
     )
-    with patch("ats.llm_fallback._get_client", return_value=llm):
+    with patch("ats.llm_fallback._get_async_client", return_value=llm):
         result = await resolve_low_confidence(RESUME_TEXT, rules)
 
     assert result["email"].failed is True
@@ -123,7 +143,7 @@ async def test_llm_disagreeing_with_rules_candidate_keeps_rules_value():
         "name": FieldResult(value="Jane Doe", method="heuristic", confidence="low")
     }
     llm = _mock_llm({"name": "Janet Doerr"}, {"name": "Janet Doerr"})
-    with patch("ats.llm_fallback._get_client", return_value=llm):
+    with patch("ats.llm_fallback._get_async_client", return_value=llm):
         result = await resolve_low_confidence(RESUME_TEXT, rules)
 
     assert result["name"].value == "Jane Doe"
@@ -135,10 +155,117 @@ async def test_llm_disagreeing_with_rules_candidate_keeps_rules_value():
 async def test_both_calls_raising_returns_rules_unchanged():
     rules = {"name": FieldResult(value=None, method="heuristic", confidence="low")}
     client = MagicMock()
-    client.chat.completions.create.side_effect = RuntimeError("provider down")
-    with patch("ats.llm_fallback._get_client", return_value=client):
+    client.chat.completions.create = AsyncMock(side_effect=RuntimeError("down"))
+    with patch("ats.llm_fallback._get_async_client", return_value=client):
+        result = await resolve_low_confidence(RESUME_TEXT, rules)
+
+    assert result == rules
+
+
+async def test_samples_are_cached_per_text_and_fields():
+    rules = {"name": FieldResult(value=None, method="heuristic", confidence="low")}
+    llm = _mock_llm({"name": "Jane Doe"}, {"name": "Jane Doe"})
+    with patch("ats.llm_fallback._get_async_client", return_value=llm):
+        first = await resolve_low_confidence(RESUME_TEXT, rules)
+        second = await resolve_low_confidence(RESUME_TEXT, rules)
+
+    assert first == second
+    assert llm.chat.completions.create.call_count == 2
+    assert llm_cache.stats()["memory_hits"] == 1
+
+
+async def test_cached_samples_expire_from_memory_after_the_ttl():
+    # The samples are the resume's personal fields; PRIVACY.md promises
+    # they go after LLM_CACHE_TTL, and the memory tier has no Redis expiry.
+    rules = {"name": FieldResult(value=None, method="heuristic", confidence="low")}
+    llm = _mock_llm(*[{"name": "Jane Doe"}] * 4)
+    with (
+        patch("ats.llm_fallback._get_async_client", return_value=llm),
+        patch("services.llm_cache.time") as clock,
+    ):
+        clock.time.return_value = 1_000_000.0
+        await resolve_low_confidence(RESUME_TEXT, rules)
+        clock.time.return_value += llm_cache.LLM_CACHE_TTL - 1
+        await resolve_low_confidence(RESUME_TEXT, rules)
+        assert llm.chat.completions.create.call_count == 2
+        clock.time.return_value += 1
+        await resolve_low_confidence(RESUME_TEXT, rules)
+
+    assert llm.chat.completions.create.call_count == 4
+    assert llm_cache.stats()["memory_hits"] == 1
+
+
+async def test_partial_samples_are_not_cached():
+    rules = {"name": FieldResult(value=None, method="heuristic", confidence="low")}
+    llm = _mock_llm(
+        {"name": "Jane Doe"},
+        RuntimeError("down"),
+        RuntimeError("down"),
+        {"name": "Jane Doe"},
+        {"name": "Jane Doe"},
+    )
+    with patch("ats.llm_fallback._get_async_client", return_value=llm):
+        partial = await resolve_low_confidence(RESUME_TEXT, rules)
+        full = await resolve_low_confidence(RESUME_TEXT, rules)
+
+    assert partial["name"].confidence == "low"
+    assert full["name"].confidence == "medium"
+    assert llm_cache.stats()["stores"] == 1
+
+
+def _scripted_llm(*replies):
+    """Async client whose calls await each reply's (delay, payload) in
+    turn, recording how many calls were in flight at once."""
+    client = MagicMock()
+    state = {"in_flight": 0, "peak": 0}
+    queue = list(replies)
+
+    async def create(**kwargs):
+        delay, payload = queue.pop(0)
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            state["in_flight"] -= 1
+        return _completion(json.dumps(payload))
+
+    client.chat.completions.create = create
+    return client, state
+
+
+async def test_samples_are_requested_concurrently():
+    rules = {"name": FieldResult(value=None, method="heuristic", confidence="low")}
+    llm, state = _scripted_llm(
+        (0.05, {"name": "Jane Doe"}), (0.05, {"name": "Jane Doe"})
+    )
+    with patch("ats.llm_fallback._get_async_client", return_value=llm):
         result = await resolve_low_confidence(RESUME_TEXT, rules)
 
+    assert state["peak"] == 2
+    assert result["name"].confidence == "medium"
+
+
+async def test_slow_second_sample_is_dropped_after_grace(monkeypatch):
+    monkeypatch.setattr(llm_fallback, "SECOND_SAMPLE_GRACE_S", 0.05)
+    rules = {"name": FieldResult(value=None, method="heuristic", confidence="low")}
+    llm, state = _scripted_llm((60, {"name": "Janet"}), (0, {"name": "Jane Doe"}))
+    with patch("ats.llm_fallback._get_async_client", return_value=llm):
+        result = await asyncio.wait_for(resolve_low_confidence(RESUME_TEXT, rules), 5)
+
+    # The fast sample stands alone: kept, but not corroborated.
+    assert result["name"].value == "Jane Doe"
+    assert result["name"].confidence == "low"
+    assert state["in_flight"] == 0  # the slow call was cancelled
+
+
+async def test_all_samples_timing_out_returns_rules(monkeypatch):
+    monkeypatch.setattr(llm_fallback, "SAMPLE_TIMEOUT_S", 0.05)
+    rules = {"name": FieldResult(value=None, method="heuristic", confidence="low")}
+    llm, _ = _scripted_llm((60, {"name": "Jane"}), (60, {"name": "Jane"}))
+    with patch("ats.llm_fallback._get_async_client", return_value=llm):
+        result = await asyncio.wait_for(resolve_low_confidence(RESUME_TEXT, rules), 5)
+
     assert result == rules
 
 
@@ -147,7 +274,7 @@ async def test_demo_merges_canned_resolution_without_client():
         "email": FieldResult(value="jane@x.com"),
         "name": FieldResult(value=None, method="heuristic", confidence="low"),
     }
-    with patch("ats.llm_fallback._get_client") as mock_get_client:
+    with patch("ats.llm_fallback._get_async_client") as mock_get_client:
         result = await resolve_low_confidence(RESUME_TEXT, rules, demo=True)
 
     assert result["name"].value == "Jane Doe"
@@ -221,7 +348,7 @@ def test_extract_demo_mode_returns_extracted(monkeypatch):
         "worked on backend services and internal tooling for several years,\n"
         "shipping features across the stack with a small product team.\n"
     )
-    with patch("ats.llm_fallback._get_client") as mock_get_client:
+    with patch("ats.llm_fallback._get_async_client") as mock_get_client:
         resp = post_file(demo_client, pdf)
 
     assert resp.status_code == 200
@@ -240,7 +367,7 @@ def test_extract_clean_pdf_needs_no_llm(monkeypatch):
 
     limiter.reset()
     demo_client = TestClient(app)
-    with patch("ats.llm_fallback._get_client") as mock_get_client:
+    with patch("ats.llm_fallback._get_async_client") as mock_get_client:
         resp = post_file(demo_client, make_pdf(CLEAN_RESUME_TEXT))
 
     assert resp.status_code == 200
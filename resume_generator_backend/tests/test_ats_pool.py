@@ -0,0 +1,111 @@
+"""Tests for the ATS worker pool (ats/pool.py) with real worker processes.
+
+The rest of the suite runs the battery inline (ATS_POOL_WORKERS=0, see
+conftest); these tests start a one-worker spawn pool.
+"""
+
+import asyncio
+import time
+
+import fitz
+import pytest
+from fastapi import HTTPException
+
+from ats import battery, pool
+
+
+def _burn(seconds):
+    """Spin on the CPU — picklable stand-in for a pathological PDF."""
+    deadline = time.process_time() + seconds
+    while time.process_time() < deadline:
+        pass
+    return "done"
+
+
+def _pdf(text):
+    doc = fitz.open()
+    doc.new_page().insert_textbox(fitz.Rect(72, 72, 523, 770), text, fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _without_timings(report):
+    checks = [
+        {k: v for k, v in check.items() if k != "duration_ms"}
+        for check in report["checks"]
+    ]
+    return {**report, "checks": checks, "timings": None}
+
+
+@pytest.fixture
+def one_worker(monkeypatch):
+    monkeypatch.setenv("ATS_POOL_WORKERS", "1")
+    monkeypatch.setenv("ATS_POOL_QUEUE_DEPTH", "1")
+    monkeypatch.setenv("ATS_JOB_CPU_SECONDS", "1")
+    yield
+    pool.shutdown_pool()
+
+
+async def test_worker_report_matches_inline(one_worker):
+    data = _pdf(
+        "Jane Doe\njane@example.com | +1 555-123-4567\n\nExperience\n"
+        "Software Engineer at Example Corp since 2020\n"
+        "- Built a billing pipeline handling 2M invoices per month\n"
+        "\nEducation\nB.S. Computer Science, 2018\n"
+    )
+    remote = await pool.run(battery.run_check, "cv.pdf", data, "pdf")
+    local = battery.run_check("cv.pdf", data, "pdf")
+    assert _without_timings(remote) == _without_timings(local)
+
+
+async def test_cpu_budget_exceeded_is_422_and_worker_survives(one_worker):
+    with pytest.raises(HTTPException) as exc:
+        await pool.run(_burn, 5)
+    assert exc.value.status_code == 422
+    assert await pool.run(_burn, 0) == "done"
+
+
+async def test_full_queue_is_refused_with_503(one_worker):
+    running = [asyncio.create_task(pool.run(_burn, 0.5)) for _ in range(2)]
+    await asyncio.sleep(0)  # both admitted: one running, one queued
+    with pytest.raises(HTTPException) as exc:
+        await pool.run(_burn, 0)
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"]
+    assert await asyncio.gather(*running) == ["done", "done"]
+
+
+def _count(n):
+    for i in range(n):
+        yield {"i": i}
+
+
+async def test_stream_relays_items_in_order(one_worker):
+    items = [item async for item in pool.stream(_count, 50)]
+    assert items == [{"i": i} for i in range(50)]
+    assert pool.stats()["inflight"] == 0
+
+
+async def test_stream_battery_matches_inline(one_worker):
+    data = _pdf("Jane Doe\njane@example.com\n\nExperience\n- Built things\n")
+    events = [
+        event async for event in pool.stream(battery.stream_analysis, data, "pdf")
+    ]
+    assert [name for name, _ in events][-1] == "analysis"
+    remote = events[-1][1]
+    local = battery.analyze(data, "pdf")
+    assert [c["id"] for c in remote["checks"]] == [c["id"] for c in local["checks"]]
+    assert remote["extracted"] == local["extracted"]
+
+
+async def test_stream_budget_exceeded_is_422(one_worker):
+    with pytest.raises(HTTPException) as exc:
+        async for _ in pool.stream(_burn_then_yield, 5):
+            pass
+    assert exc.value.status_code == 422
+    assert pool.stats()["inflight"] == 0
+
+
+def _burn_then_yield(seconds):
+    yield _burn(seconds)
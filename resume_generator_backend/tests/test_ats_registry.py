@@ -0,0 +1,117 @@
+"""Tests for the ATS check registry (ats/registry.py): declared metadata,
+per-check timing and the /ats/check selection filters."""
+
+from unittest.mock import patch
+
+import fitz
+import pytest
+from fastapi.testclient import TestClient
+
+from ats import battery, registry
+
+RESUME_TEXT = """Jane Doe
+jane.doe@example.com | +1 555-123-4567
+
+Experience
+Software Engineer at Example Corp since 2020
+- Built a billing pipeline handling two million invoices per month
+- Led a team of 4 engineers to migrate 30 services
+
+Education
+B.S. Computer Science, State University, 2018
+"""
+
+
+def _pdf(text=RESUME_TEXT):
+    doc = fitz.open()
+    doc.new_page().insert_textbox(fitz.Rect(72, 72, 523, 770), text, fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def client():
+    from core.limiter import limiter
+    from main import app
+
+    limiter.reset()
+    return TestClient(app)
+
+
+def _check(client, query="", data=None):
+    return client.post(
+        "/ats/check" + query,
+        files={"file": ("jane-doe-resume.pdf", data or _pdf(), "application/pdf")},
+    )
+
+
+def test_declared_category_matches_every_result():
+    report = battery.run_check("cv.pdf", _pdf(), "pdf")
+    declared = {check.id: check.category for check in registry.specs("pdf", None)} | {
+        check.id: check.category for check in registry.specs(None, None, True)
+    }
+
+    assert {c["id"] for c in report["checks"]} <= set(declared)
+    for result in report["checks"]:
+        assert result["category"] == declared[result["id"]], result["id"]
+        assert result["duration_ms"] >= 0
+    assert {"plumber_text", "layout", "stats"} <= set(report["timings"]["inputs_ms"])
+
+
+def test_variants_share_metadata():
+    declared = {}
+    for check in registry.REGISTRY:
+        meta = declared.setdefault(check.id, (check.category, check.cost))
+        assert meta == (check.category, check.cost), check.id
+
+
+def test_cheap_subset_skips_expensive_inputs(client):
+    resp = _check(client, "?cost=cheap")
+    body = resp.json()
+
+    assert resp.status_code == 200
+    expensive = {c.id for c in registry.REGISTRY if c.cost == registry.EXPENSIVE}
+    ids = {c["id"] for c in body["checks"]}
+    assert ids and not ids & expensive
+    assert "layout" not in body["timings"]["inputs_ms"]
+    assert "margin_contact" not in body["timings"]["inputs_ms"]
+
+
+def test_filters_intersect(client):
+    body = _check(
+        client, "?categories=contact,file&checks=contact-info,filename,tables"
+    )
+    ids = [c["id"] for c in body.json()["checks"]]
+    assert ids == ["contact-info", "filename"]
+
+
+def test_unknown_filter_is_422(client):
+    resp = _check(client, "?categories=contact,vibes")
+    assert resp.status_code == 422
+    assert "vibes" in resp.json()["detail"]
+
+
+def test_cached_full_analysis_serves_any_subset(client):
+    data = _pdf()
+    with patch("ats.router.battery.analyze", wraps=battery.analyze) as analyze:
+        full = _check(client, data=data).json()
+        subset = _check(client, "?categories=contact", data=data).json()
+
+    assert analyze.call_count == 1
+    assert [c["id"] for c in subset["checks"]] == [
+        c["id"] for c in full["checks"] if c["category"] == "contact"
+    ]
+
+
+def test_list_checks(client):
+    body = client.get("/ats/checks").json()
+    assert {c["id"] for c in body["checks"]} == set(registry.CHECK_IDS)
+    assert set(body["categories"]) == {
+        "extraction",
+        "layout",
+        "typography",
+        "contact",
+        "content",
+        "file",
+    }
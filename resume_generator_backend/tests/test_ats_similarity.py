@@ -0,0 +1,134 @@
+"""Tests for the fast difflib ratio (ats/similarity.py).
+
+It must equal difflib's default-autojunk ratio — the value the agreement
+thresholds were calibrated on — on extraction pairs of the kinds the
+agreement check sees (both extractors of generated PDFs, plus glued,
+truncated and reordered variants of a multi-page text) and on random
+strings.
+"""
+
+import difflib
+import random
+
+import fitz
+import pytest
+
+from ats import similarity
+from ats.checks import _normalize
+from ats.document import PdfDocument
+from ats.extractors import extract_pdf_pdfplumber, extract_pdf_pymupdf
+
+PAGE_TEXT = """Jane Doe
+jane.doe@example.com | +1 555-123-4567 | github.com/janedoe
+
+Experience
+Senior Software Engineer, Example Corp, 2021 - Present
+- Built an event-driven billing pipeline handling 2M invoices per month
+- Cut p95 API latency by 40% by coalescing duplicate upstream requests
+
+Education
+B.S. Computer Science, State University, 2018
+
+Skills
+Python, Go, TypeScript, PostgreSQL, Redis, Kafka, Docker, Kubernetes
+"""
+LEFT = "Skills\nPython\nJavaScript\nSQL\nDocker\nKubernetes\nAWS\nTerraform\n"
+RIGHT = (
+    "Experience\nSoftware Engineer at TechCorp since 2020\n"
+    "Built microservices processing many requests daily\n"
+    "Led migration from monolith to services\n"
+)
+
+
+def _pdf(blocks, pages=1):
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        for rect, text in blocks:
+            page.insert_textbox(fitz.Rect(*rect), text, fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _extractions(data):
+    with PdfDocument(data) as doc:
+        return (
+            _normalize(extract_pdf_pdfplumber(doc)),
+            _normalize(extract_pdf_pymupdf(doc)),
+        )
+
+
+def _reference(a, b):
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+THREE_PAGES = _normalize(PAGE_TEXT * 3)
+HALF = len(THREE_PAGES) // 2
+
+FIXTURES = {
+    "single-column": lambda: _extractions(_pdf([((72, 72, 523, 770), PAGE_TEXT)])),
+    "two-column": lambda: _extractions(
+        _pdf([((40, 150, 250, 800), LEFT), ((330, 150, 560, 800), RIGHT)])
+    ),
+    "two-column-3-pages": lambda: _extractions(
+        _pdf([((40, 150, 250, 800), LEFT * 2), ((330, 150, 560, 800), RIGHT * 2)], 3)
+    ),
+    "glued": lambda: (THREE_PAGES, THREE_PAGES.replace(" ", "")),
+    "truncated": lambda: (THREE_PAGES, THREE_PAGES[:HALF]),
+    "reordered": lambda: (
+        THREE_PAGES,
+        THREE_PAGES[HALF:] + " " + THREE_PAGES[:HALF],
+    ),
+}
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_ratio_equals_difflib(name):
+    a, b = FIXTURES[name]()
+    assert len(b) >= similarity.AUTOJUNK_MIN_LEN  # autojunk engaged
+    assert similarity.ratio(a, b) == _reference(a, b)
+
+
+@pytest.mark.parametrize(
+    ("a", "b"),
+    [
+        ("a b c d e f g h i j", "abcdefghij"),
+        ("software engineer", "softwareengineer"),
+        ("python, go, sql", "go, python, sql"),
+        ("", "anything"),
+    ],
+)
+def test_small_inputs_equal_difflib(a, b):
+    assert similarity.ratio(a, b) == _reference(a, b)
+
+
+@pytest.mark.parametrize("alphabet", ["ab", "abc d", "abcdefghij ", "aaaaaaaaab"])
+def test_random_edits_equal_difflib(alphabet):
+    rng = random.Random(alphabet)
+    for _ in range(150):
+        a = "".join(rng.choice(alphabet) for _ in range(rng.choice([20, 250, 600])))
+        b = list(a)
+        for _ in range(rng.randint(1, len(a) // 5)):
+            spot = rng.randrange(len(b))
+            if rng.random() < 0.5:
+                del b[spot]
+            else:
+                b.insert(spot, rng.choice(alphabet))
+        b = "".join(b)
+        assert similarity.ratio(a, b) == _reference(a, b), (a, b)
+
+
+def test_edge_cases():
+    assert similarity.ratio("", "") == 1.0
+    assert similarity.ratio(THREE_PAGES, THREE_PAGES) == 1.0
+    assert similarity.ratio(THREE_PAGES, "x" * 500) == 0.0
+
+
+def test_keyword_stuffing_stays_fast():
+    """A 5 MB-cap-scale stuffed text: every character is popular, so, as
+    in difflib, only common prefixes match."""
+    words = ["python", "java", "kubernetes", "aws", "react", "sql"]
+    stuffed = " ".join(words[i * 7 % 6] for i in range(40_000))
+    edited = stuffed.replace("react", "reactjs", 500)
+    assert similarity.ratio(stuffed, edited) == _reference(stuffed, edited)
@@ -0,0 +1,109 @@
+"""Tests for POST /ats/check/stream: one SSE event per check, cheap checks
+first, then a summary matching /ats/check."""
+
+import json
+from unittest.mock import patch
+
+import fitz
+import pytest
+from fastapi.testclient import TestClient
+
+from ats import battery, registry
+
+RESUME_TEXT = """Jane Doe
+jane.doe@example.com | +1 555-123-4567
+
+Experience
+Software Engineer at Example Corp since 2020
+- Built a billing pipeline handling two million invoices per month
+
+Education
+B.S. Computer Science, State University, 2018
+"""
+
+
+def _pdf(text=RESUME_TEXT):
+    doc = fitz.open()
+    page = doc.new_page()
+    if text:
+        page.insert_textbox(fitz.Rect(72, 72, 523, 770), text, fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def client():
+    from core.limiter import limiter
+    from main import app
+
+    limiter.reset()
+    return TestClient(app)
+
+
+def _post(client, path, data, filename="jane-doe-resume.pdf"):
+    return client.post(path, files={"file": (filename, data, "application/pdf")})
+
+
+def _events(resp):
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    return [
+        json.loads(line[len("data: ") :])
+        for line in resp.text.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def test_stream_matches_report_cheap_checks_first(client):
+    data = _pdf()
+    events = _events(_post(client, "/ats/check/stream", data))
+    report = _post(client, "/ats/check", data).json()
+
+    checks = [e["check"] for e in events[:-1]]
+    assert all(e["event"] == "check" for e in events[:-1])
+    summary = events[-1]
+    assert summary["event"] == "summary"
+    assert summary["order"] == [c["id"] for c in report["checks"]]
+    assert summary["summary"] == report["summary"]
+    assert summary["extracted"] == report["extracted"]
+
+    costs = [registry.stream_position(check)[0] for check in checks]
+    assert costs == sorted(costs)  # every cheap check before any expensive one
+    assert sorted(c["id"] for c in checks) == sorted(summary["order"])
+
+
+def test_stream_reuses_and_fills_the_cache(client):
+    data = _pdf()
+    with (
+        patch("ats.router.battery.stream_analysis", wraps=battery.stream_analysis) as s,
+        patch("ats.router.battery.analyze", wraps=battery.analyze) as analyze,
+    ):
+        first = _events(_post(client, "/ats/check/stream", data))
+        second = _events(_post(client, "/ats/check/stream", data))
+        _post(client, "/ats/check", data)
+
+    assert s.call_count == 1
+    assert analyze.call_count == 0
+    assert [e.get("check", {}).get("id") for e in first] == [
+        e.get("check", {}).get("id") for e in second
+    ]
+
+
+def test_stream_filters(client):
+    events = _events(_post(client, "/ats/check/stream?checks=filename", _pdf()))
+    assert [e["check"]["id"] for e in events[:-1]] == ["filename"]
+    assert events[-1]["order"] == ["filename"]
+
+
+def test_stream_scanned_pdf(client):
+    events = _events(_post(client, "/ats/check/stream", _pdf(text="")))
+    assert [e["check"]["id"] for e in events[:-1]] == ["scanned-pdf"]
+    assert events[-1]["summary"]["failed"] == 1
+
+
+def test_stream_parse_failure_is_an_error_event(client):
+    events = _events(_post(client, "/ats/check/stream", b"%PDF-1.7 not really"))
+    assert events == [
+        {"event": "error", "content": events[0]["content"]},
+    ]
+    assert "Could not parse" in events[0]["content"]
@@ -2,6 +2,8 @@
 hyperlink-only contact, margin-contact detection, section synonyms,
 skills extraction, and informational writing tips."""
 
+import re
+
 import fitz
 import pytest
 from fastapi.testclient import TestClient
@@ -14,7 +16,14 @@ from ats.checks import (
     writing_tips,
 )
 from ats.extraction import extract_fields_rules, find_sections
-from ats.skills import ROLE_KEYWORDS, TAXONOMY, extract_skills
+from ats.skills import (
+    ROLE_KEYWORDS,
+    TAXONOMY,
+    SkillMatch,
+    SkillMatcher,
+    extract_skills,
+    find_skills,
+)
 
 # Single-letter words: removing the spaces drops the sequence ratio well
 # below the pass threshold, mimicking a kerning-broken extraction.
@@ -89,6 +98,20 @@ def test_agreement_glued_reason_names_word_counts():
     assert "standard font" in check["fix"]
 
 
+def test_full_length_glued_extraction_fails_with_the_glued_reason():
+    # A real one-page resume whose second extraction lost every space.
+    doc = fitz.open()
+    doc.new_page().insert_textbox(fitz.Rect(72, 72, 523, 770), BODY_TEXT * 2)
+    spaced = doc[0].get_text()
+    doc.close()
+    glued = spaced.replace(" ", "")
+    assert len(" ".join(spaced.split())) > 200  # difflib's autojunk engaged
+
+    check = extraction_agreement(spaced, glued, glued=detect_glued(spaced, glued))
+    assert check["status"] == "fail"
+    assert "without word spacing" in check["reason"]
+
+
 def test_agreement_not_glued_keeps_generic_reason():
     check = extraction_agreement(SPACED_TEXT, GLUED_TEXT, glued=False)
     assert "ratio" in check["reason"]
@@ -245,6 +268,42 @@ def test_extract_skills_word_boundaries():
     assert extract_skills("JavaScript only") == ["JavaScript"]
 
 
+def test_find_skills_reports_spans():
+    text = "Shipped C++ and c++17 code; Node.js, Tailwind CSS."
+    assert find_skills(text) == [
+        SkillMatch("C++", 8, 11),
+        SkillMatch("Node.js", 28, 35),
+        SkillMatch("Tailwind CSS", 37, 49),
+        SkillMatch("CSS", 46, 49),
+    ]
+
+
+def test_matcher_reports_terms_sharing_a_start():
+    matcher = SkillMatcher(["React", "React Native", "Native"])
+    assert [m.term for m in matcher.find("react native apps")] == [
+        "React",
+        "React Native",
+        "Native",
+    ]
+    assert matcher.extract("React Nativescript") == ["React"]
+
+
+def test_matcher_agrees_with_per_term_regex():
+    text = (
+        "JAVA, javascript; C#/.NET c++11 CI/CD a/b testing REST APIs "
+        "Scikit-learn_x node.js Power BI, power  bi, GoogleAnalytics, sql\n"
+        "Spring Boot3 Hugging Face-based UI/UX Next.js."
+    )
+    expected = [
+        term
+        for term in TAXONOMY
+        if re.search(
+            r"(?<![\w+#])" + re.escape(term) + r"(?![\w+#])", text, re.IGNORECASE
+        )
+    ]
+    assert extract_skills(text) == expected
+
+
 def test_skills_field_in_extraction():
     result = extract_fields_rules("Skills\nPython, SQL, Docker\n")["skills"]
     assert result.value == ["Docker", "Python", "SQL"]
@@ -0,0 +1,58 @@
+"""Tests for the app-lifetime outbound client registry (services.http_clients)."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services import http_clients
+
+
+@pytest.fixture(autouse=True)
+async def fresh_registry():
+    await http_clients.close_http_clients()
+    yield
+    await http_clients.close_http_clients()
+
+
+async def test_same_client_is_reused_per_integration():
+    first = http_clients.get_http_client("github")
+    assert http_clients.get_http_client("github") is first
+    assert http_clients.get_http_client("orcid") is not first
+
+
+async def test_closed_client_is_rebuilt():
+    first = http_clients.get_http_client("github")
+    await first.aclose()
+    assert http_clients.get_http_client("github") is not first
+
+
+async def test_policy_timeout_applies():
+    client = http_clients.get_http_client("latex")
+    assert client.timeout.read == http_clients.POLICIES["latex"].timeout
+
+
+async def test_pool_stats_counts_idle_and_active_per_host():
+    http_clients.get_http_client("github")
+    idle = MagicMock(_origin=MagicMock(host=b"api.github.com"))
+    idle.is_idle.return_value = True
+    active = MagicMock(_origin=MagicMock(host=b"api.github.com"))
+    active.is_idle.return_value = False
+    active.is_closed.return_value = False
+    pool = http_clients._clients["github"]._transport._pool
+    with patch.object(type(pool), "connections", [idle, active]):
+        stats = http_clients.pool_stats()
+
+    assert stats["github"]["hosts"] == {"api.github.com": {"active": 1, "idle": 1}}
+    assert stats["github"]["max_connections"] == 10
+
+
+def test_lifespan_opens_and_closes_every_client():
+    from main import app
+
+    with TestClient(app) as client:
+        assert set(http_clients._clients) == set(http_clients.POLICIES)
+        resp = client.get("/health/pools")
+        assert resp.status_code == 200
+        assert set(resp.json()["pools"]) == set(http_clients.POLICIES)
+    assert http_clients._clients == {}
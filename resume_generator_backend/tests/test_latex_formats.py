@@ -0,0 +1,189 @@
+"""Tests for latex-service's preamble formats: which preambles get one, and
+that no format holds the resume owner's details. Tectonic is faked; the
+speedup itself is measured by scripts/bench_latex_formats.py."""
+
+import importlib.util
+import re
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.latex_compiler import md_to_latex
+
+REPO = Path(__file__).resolve().parents[2]
+_PLACEHOLDER_RE = re.compile(r"\{\{([A-Z0-9_]+)\}\}")
+
+_spec = importlib.util.spec_from_file_location(
+    "latex_service_main", REPO / "latex-service" / "main.py"
+)
+latex_service = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(latex_service)
+
+
+def _fill(template: str, person: str) -> str:
+    return _PLACEHOLDER_RE.sub(lambda m: f"{person} {m.group(1).lower()}", template)
+
+
+def _moderncv(person: str) -> str:
+    text = (REPO / "templates" / "moderncv-classic.tex").read_text(encoding="utf-8")
+    return _fill(text, person)
+
+
+@pytest.fixture(autouse=True)
+def fresh_formats(tmp_path, monkeypatch):
+    monkeypatch.setattr(latex_service, "FORMAT_DIR", tmp_path)
+    state = (latex_service._formats, latex_service._sightings, latex_service._rebuilt)
+    for entries in state:
+        entries.clear()
+    yield
+    for entries in state:
+        entries.clear()
+
+
+def test_format_preambles_are_the_shipped_ones():
+    docs = [md_to_latex("# Jane Doe\n\n## Skills\nPython")]
+    for path in sorted((REPO / "templates").glob("*.tex")):
+        docs.append(_fill(path.read_text(encoding="utf-8"), "Jane Doe"))
+
+    keys = {latex_service._split_preamble(doc)[0] for doc in docs}
+    assert keys == latex_service.FORMAT_PREAMBLES
+
+
+def test_personal_lines_are_kept_out_of_the_key_and_preamble():
+    jane = latex_service._split_preamble(_moderncv("Jane Doe"))
+    john = latex_service._split_preamble(_moderncv("John Roe"))
+
+    assert jane[0] == john[0]
+    assert "Jane" not in jane[1] and "\\moderncvstyle{classic}" in jane[1]
+    personal, body = jane[2].split("\\begin{document}")
+    assert "\\name{Jane Doe first_name}" in personal
+    assert "\\email{Jane Doe email}" in personal
+    assert "Jane Doe" in body  # the resume itself, typeset after the format
+
+
+async def test_own_preamble_never_gets_a_format():
+    latex = "\\documentclass{article}\n\\usepackage{mine}\n\\begin{document}x"
+    with patch.object(
+        latex_service, "_tectonic", AsyncMock(return_value=(b"%PDF", ""))
+    ):
+        for _ in range(latex_service.FORMAT_BUILD_AFTER + 1):
+            pdf, _, mode, due = await latex_service._compile(latex)
+            assert (pdf, mode, due) == (b"%PDF", "cold", None)
+    assert not latex_service._sightings
+
+
+async def test_shipped_preamble_format_holds_no_personal_data(tmp_path):
+    tectonic = AsyncMock(return_value=(b"%PDF", ""))
+    sources = []
+
+    async def dump(args, cwd):
+        source = Path(args[0])
+        sources.append(source.read_text(encoding="utf-8"))
+        source.with_suffix(".fmt").write_bytes(b"fmt")
+        return ""
+
+    with (
+        patch.object(latex_service, "_tectonic", tectonic),
+        patch.object(latex_service, "_run_tectonic", dump),
+    ):
+        for _ in range(latex_service.FORMAT_BUILD_AFTER):
+            _, _, mode, due = await latex_service._compile(_moderncv("Jane Doe"))
+        assert mode == "cold" and due is not None
+        await latex_service._build_format(due[0], due[1])
+
+        _, _, mode, _ = await latex_service._compile(_moderncv("John Roe"))
+
+    assert "Jane" not in sources[0] and "\\moderncvcolor{blue}" in sources[0]
+    assert mode == "warm"
+    warm_source, fmt = tectonic.call_args.args
+    assert fmt == tmp_path / f"{due[0]}.fmt"
+    assert warm_source.startswith("\\name{John Roe first_name}")
+    assert "\\documentclass" not in warm_source
+
+
+class FakeTectonic:
+    """Stands in for _run_tectonic: dumps formats, and typesets unless
+    `warm_fails` — reading the --format file first, as Tectonic would."""
+
+    def __init__(self, warm_fails=False, dump_fails=False):
+        self.warm_fails = warm_fails
+        self.dump_fails = dump_fails
+        self.warm_formats = []
+
+    async def __call__(self, args, cwd, timeout=None):
+        source = Path(args[0])
+        if "--outfmt" in args:
+            if not self.dump_fails:
+                source.with_suffix(".fmt").write_bytes(b"fmt")
+            return ""
+        if "--format" in args:
+            self.warm_formats.append((Path(cwd) / args[-1]).read_bytes())
+            if self.warm_fails:
+                return "format failed"
+        source.with_suffix(".pdf").write_bytes(b"%PDF")
+        return ""
+
+
+async def _warm_up(tectonic, latex):
+    with patch.object(latex_service, "_run_tectonic", tectonic):
+        for _ in range(latex_service.FORMAT_BUILD_AFTER):
+            _, _, _, due = await latex_service._compile(latex)
+        await latex_service._build_format(due[0], due[1])
+    return due[0]
+
+
+async def test_format_evicted_mid_compile_is_still_read():
+    tectonic = FakeTectonic()
+    latex = _moderncv("Jane Doe")
+    key = await _warm_up(tectonic, latex)
+
+    async def evict_then_compile(args, cwd, timeout=None):
+        latex_service._drop_format(key)  # another worker's build evicts it
+        return await tectonic(args, cwd, timeout)
+
+    with patch.object(latex_service, "_run_tectonic", evict_then_compile):
+        pdf, _, mode, _ = await latex_service._compile(latex)
+
+    assert (pdf, mode) == (b"%PDF", "warm")
+    assert tectonic.warm_formats == [b"fmt"]  # the hard link kept the file
+
+
+async def test_evicted_format_is_rebuilt_not_marked_unsupported():
+    tectonic = FakeTectonic()
+    latex = _moderncv("Jane Doe")
+    key = await _warm_up(tectonic, latex)
+    latex_service._drop_format(key)  # LRU eviction
+
+    with patch.object(latex_service, "_run_tectonic", tectonic):
+        _, _, mode, due = await latex_service._compile(latex)
+
+    assert mode == "cold" and due is not None
+    assert latex_service._sightings[key] != latex_service._UNSUPPORTED
+
+
+async def test_failing_format_is_rebuilt_once_then_unsupported():
+    tectonic = FakeTectonic(warm_fails=True)
+    latex = _moderncv("Jane Doe")
+    key = await _warm_up(tectonic, latex)
+
+    with patch.object(latex_service, "_run_tectonic", tectonic):
+        _, _, mode, due = await latex_service._compile(latex)
+        assert mode == "cold" and due is not None  # rebuild once
+        assert latex_service._sightings[key] != latex_service._UNSUPPORTED
+        await latex_service._build_format(due[0], due[1])
+
+        pdf, _, mode, due = await latex_service._compile(latex)
+
+    assert (pdf, mode, due) == (b"%PDF", "cold", None)
+    assert latex_service._sightings[key] == latex_service._UNSUPPORTED
+    assert key not in latex_service._formats
+
+
+async def test_failed_build_marks_the_preamble_unsupported():
+    tectonic = FakeTectonic(dump_fails=True)
+    latex = _moderncv("Jane Doe")
+    key = await _warm_up(tectonic, latex)
+
+    assert key not in latex_service._formats
+    assert latex_service._sightings[key] == latex_service._UNSUPPORTED
@@ -0,0 +1,96 @@
+"""Tests for latex-service's compile queue: a compile waits at most
+COMPILE_QUEUE_TIMEOUT for a worker, and one request's Tectonic runs share
+COMPILE_TIMEOUT, so the sidecar answers inside the backend's timeout."""
+
+import asyncio
+import importlib.util
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from services.http_clients import POLICIES
+
+REPO = Path(__file__).resolve().parents[2]
+
+_spec = importlib.util.spec_from_file_location(
+    "latex_service_queue", REPO / "latex-service" / "main.py"
+)
+latex_service = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(latex_service)
+
+DOC = "\\documentclass{article}\n\\begin{document}x"
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    queue = asyncio.Queue()
+    monkeypatch.setattr(latex_service, "_queue", queue)
+    monkeypatch.setattr(latex_service, "_admitted", 0)
+    return queue
+
+
+def test_queue_wait_and_compile_fit_the_backend_timeout():
+    budget = latex_service.COMPILE_QUEUE_TIMEOUT + latex_service.COMPILE_TIMEOUT
+    assert budget < POLICIES["latex"].timeout
+
+
+async def test_compile_waiting_past_the_queue_timeout_gets_a_503(queue, monkeypatch):
+    monkeypatch.setattr(latex_service, "COMPILE_QUEUE_TIMEOUT", 0.05)
+    tectonic = AsyncMock(return_value=(b"%PDF", ""))
+
+    with pytest.raises(HTTPException) as refused:
+        await latex_service.compile(latex_service.CompileRequest(latex=DOC))
+    assert refused.value.status_code == 503
+    assert refused.value.headers["Retry-After"] == "5"
+
+    # The worker that finally reaches it skips it instead of compiling.
+    with patch.object(latex_service, "_tectonic", tectonic):
+        worker = asyncio.ensure_future(latex_service._worker(queue))
+        await queue.join()
+        worker.cancel()
+    tectonic.assert_not_awaited()
+    assert latex_service._admitted == 0
+
+
+async def test_compile_started_in_time_is_not_cut_off(queue, monkeypatch):
+    monkeypatch.setattr(latex_service, "COMPILE_QUEUE_TIMEOUT", 0.05)
+
+    async def slow_compile(latex, fmt=None, timeout=None):
+        await asyncio.sleep(0.2)  # longer than the queue timeout
+        return b"%PDF", ""
+
+    with patch.object(latex_service, "_tectonic", slow_compile):
+        worker = asyncio.ensure_future(latex_service._worker(queue))
+        response = await latex_service.compile(latex_service.CompileRequest(latex=DOC))
+        worker.cancel()
+    assert response.body == b"%PDF"
+
+
+async def test_fallback_compile_gets_what_the_warm_one_left(monkeypatch):
+    monkeypatch.setattr(latex_service, "COMPILE_TIMEOUT", 10.0)
+    latex = "\\documentclass{article}\n\\begin{document}x"
+    key = latex_service._split_preamble(latex)[0]
+    timeouts = []
+
+    async def tectonic(source, fmt=None, timeout=latex_service.COMPILE_TIMEOUT):
+        timeouts.append(timeout)
+        if fmt is not None:
+            clock.monotonic.return_value += 7.0  # the warm run burns 7 s, then fails
+            return None, "format failed"
+        return b"%PDF", ""
+
+    with (
+        patch.object(latex_service, "FORMAT_PREAMBLES", {key}),
+        patch.dict(latex_service._formats, {key: Path("unused.fmt")}),
+        patch.object(latex_service, "_drop_format"),
+        patch.object(latex_service, "_tectonic", tectonic),
+        patch.object(latex_service, "time") as clock,
+    ):
+        clock.monotonic.return_value = 100.0
+        pdf, _, mode, _ = await latex_service._compile(latex)
+    latex_service._rebuilt.discard(key)
+
+    assert (pdf, mode) == (b"%PDF", "cold")
+    assert timeouts[1] == pytest.approx(3.0)
@@ -8,8 +8,8 @@ import pytest
 from fastapi import HTTPException
 
 
-def _async_client_returning(response=None, error=None):
-    """Mock httpx.AsyncClient context manager."""
+def _http_client_returning(response=None, error=None):
+    """Mock shared httpx client (services.http_clients.get_http_client)."""
     client = MagicMock()
     if error:
         client.get = AsyncMock(side_effect=error)
@@ -17,10 +17,7 @@ def _async_client_returning(response=None, error=None):
     else:
         client.get = AsyncMock(return_value=response)
         client.post = AsyncMock(return_value=response)
-    cm = MagicMock()
-    cm.__aenter__ = AsyncMock(return_value=client)
-    cm.__aexit__ = AsyncMock(return_value=False)
-    return cm
+    return client
 
 
 @pytest.fixture(autouse=True)
@@ -31,8 +28,8 @@ def no_redis():
     `from services.cache import get_redis` binds a local reference.
     """
     with (
-        patch("services.github.get_redis", side_effect=Exception("no redis")),
-        patch("services.linkedin.get_redis", side_effect=Exception("no redis")),
+        patch("services.profile_cache.get_redis", side_effect=Exception("no redis")),
+        patch("services.singleflight.get_redis", side_effect=Exception("no redis")),
     ):
         yield
 
@@ -41,7 +38,9 @@ async def test_github_readme_fetch_ok():
     from services.github import fetch_github_readme
 
     resp = MagicMock(status_code=200, text="# My README")
-    with patch("httpx.AsyncClient", return_value=_async_client_returning(resp)):
+    with patch(
+        "services.github.get_http_client", return_value=_http_client_returning(resp)
+    ):
         assert await fetch_github_readme("octocat") == "# My README"
 
 
@@ -49,7 +48,9 @@ async def test_github_readme_fetch_404_returns_empty():
     from services.github import fetch_github_readme
 
     resp = MagicMock(status_code=404, text="nope")
-    with patch("httpx.AsyncClient", return_value=_async_client_returning(resp)):
+    with patch(
+        "services.github.get_http_client", return_value=_http_client_returning(resp)
+    ):
         assert await fetch_github_readme("ghost") == ""
 
 
@@ -57,21 +58,41 @@ async def test_github_readme_network_error_returns_empty():
     from services.github import fetch_github_readme
 
     with patch(
-        "httpx.AsyncClient",
-        return_value=_async_client_returning(error=httpx.ConnectError("down")),
+        "services.github.get_http_client",
+        return_value=_http_client_returning(error=httpx.ConnectError("down")),
     ):
         assert await fetch_github_readme("octocat") == ""
 
 
+def _async_llm(create):
+    """Mock AsyncOpenAI client whose completions.create is `create`."""
+    client = MagicMock()
+    client.chat.completions.create = create
+    return client
+
+
+def _stream_of(*tokens):
+    """Async iterator of streaming chunks, one token per chunk, then usage."""
+
+    async def stream():
+        for token in tokens:
+            chunk = MagicMock(usage=None)
+            chunk.choices = [MagicMock(delta=MagicMock(content=token))]
+            yield chunk
+        yield MagicMock(choices=[], usage=MagicMock(prompt_tokens=1))
+
+    return stream()
+
+
 async def test_generation_api_error_becomes_500():
     from services.genrate_resume import generate_resume_content
 
-    with patch("services.genrate_resume._get_client") as mock_client:
-        mock_client.return_value.chat.completions.create.side_effect = Exception(
-            "quota exceeded"
-        )
-        with pytest.raises(HTTPException) as exc:
-            await generate_resume_content("prompt")
+    llm = _async_llm(AsyncMock(side_effect=Exception("quota exceeded")))
+    with (
+        patch("services.genrate_resume._get_async_client", return_value=llm),
+        pytest.raises(HTTPException) as exc,
+    ):
+        await generate_resume_content("prompt")
     assert exc.value.status_code == 500
 
 
@@ -80,20 +101,50 @@ async def test_generation_short_output_rejected():
 
     completion = MagicMock()
     completion.choices = [MagicMock(message=MagicMock(content="too short"))]
-    with patch("services.genrate_resume._get_client") as mock_client:
-        mock_client.return_value.chat.completions.create.return_value = completion
-        with pytest.raises(HTTPException) as exc:
-            await generate_resume_content("prompt")
+    llm = _async_llm(AsyncMock(return_value=completion))
+    with (
+        patch("services.genrate_resume._get_async_client", return_value=llm),
+        pytest.raises(HTTPException) as exc,
+    ):
+        await generate_resume_content("prompt")
     assert exc.value.status_code == 500
 
 
+async def test_generation_stream_yields_tokens_from_async_client():
+    from services.genrate_resume import generate_resume_stream
+
+    body = "Jane Doe, software engineer. " * 5
+    tokens = ["\\documentclass{article}\\begin{document}", body, "\\end{document}"]
+    llm = _async_llm(AsyncMock(return_value=_stream_of(*tokens)))
+    with patch("services.genrate_resume._get_async_client", return_value=llm):
+        received = [token async for token in generate_resume_stream("prompt")]
+
+    assert received == tokens
+    assert llm.chat.completions.create.call_args.kwargs["stream"] is True
+
+
+async def test_rotated_api_key_reuses_the_connection_pool(monkeypatch):
+    from services import genrate_resume
+
+    monkeypatch.setattr(genrate_resume, "_async_client", None)
+    monkeypatch.setenv("OPENROUTER_API_KEY", "old-key")
+    old = genrate_resume._get_async_client()
+    monkeypatch.setenv("OPENROUTER_API_KEY", "new-key")
+    new = genrate_resume._get_async_client()
+
+    assert new.api_key == "new-key"
+    assert new._client is old._client  # one pool, nothing left unclosed
+    assert genrate_resume._get_async_client() is new
+    await genrate_resume.close_async_client()
+
+
 async def test_sidecar_down_returns_503():
     from services.latex_compiler import compile_latex_pdf
 
     with (
         patch(
-            "httpx.AsyncClient",
-            return_value=_async_client_returning(error=httpx.ConnectError("refused")),
+            "services.latex_compiler.get_http_client",
+            return_value=_http_client_returning(error=httpx.ConnectError("refused")),
         ),
         pytest.raises(HTTPException) as exc,
     ):
@@ -103,6 +154,24 @@ async def test_sidecar_down_returns_503():
     assert exc.value.status_code == 503
 
 
+async def test_sidecar_queue_full_returns_503_with_retry_after():
+    from services.latex_compiler import compile_latex_pdf
+
+    busy = MagicMock(status_code=503, text="full", headers={"Retry-After": "5"})
+    client = MagicMock()
+    client.post = AsyncMock(return_value=busy)
+    with (
+        patch("services.latex_compiler.get_http_client", return_value=client),
+        patch("services.pdf_cache.get_redis", side_effect=RuntimeError("no redis")),
+        pytest.raises(HTTPException) as exc,
+    ):
+        await compile_latex_pdf(
+            "\\documentclass{article}\\begin{document}busy\\end{document}"
+        )
+    assert exc.value.status_code == 503
+    assert exc.value.headers == {"Retry-After": "5"}
+
+
 async def test_linkedin_no_token_returns_empty(monkeypatch):
     from services.linkedin import fetch_linkedin_profile
 
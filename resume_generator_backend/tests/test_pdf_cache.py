@@ -0,0 +1,123 @@
+"""Tests for the content-addressed compiled-PDF cache (services.pdf_cache)."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+
+from services import pdf_cache
+from services.cache import MemoryLRU
+from services.latex_compiler import compile_latex_pdf
+
+LATEX = "\\documentclass{article}\n\\begin{document}\nHello\n\\end{document}\n"
+PDF = b"%PDF-1.7 fake"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    pdf_cache._memory.clear()
+    for name in pdf_cache._counters:
+        pdf_cache._counters[name] = 0
+    no_redis = Exception("no redis")
+    with (
+        patch("services.pdf_cache.get_redis", side_effect=no_redis),
+        patch("services.cache.get_redis", side_effect=no_redis),
+    ):
+        yield
+    pdf_cache._memory.clear()
+
+
+def _sidecar(status_code=200, content=PDF, headers=None):
+    client = MagicMock()
+    client.post = AsyncMock(
+        return_value=MagicMock(
+            status_code=status_code, content=content, text="err", headers=headers or {}
+        )
+    )
+    return client
+
+
+def test_key_ignores_line_endings_and_trailing_whitespace():
+    messy = LATEX.replace("\n", "  \r\n") + "\n\n"
+    assert pdf_cache.cache_key(messy) == pdf_cache.cache_key(LATEX)
+
+
+def test_key_keeps_control_space_and_content_changes():
+    assert pdf_cache.cache_key("a\\ \nb") != pdf_cache.cache_key("a\\\nb")
+    assert pdf_cache.cache_key(LATEX) != pdf_cache.cache_key(LATEX + "x")
+
+
+async def test_identical_latex_compiles_once():
+    sidecar = _sidecar()
+    with patch("services.latex_compiler.get_http_client", return_value=sidecar):
+        first = await compile_latex_pdf(LATEX)
+        second = await compile_latex_pdf(LATEX.replace("\n", "\r\n"))
+
+    assert first == second == PDF
+    assert sidecar.post.await_count == 1
+    stats = pdf_cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+async def test_failed_compile_is_not_cached():
+    sidecar = _sidecar(status_code=500)
+    with (
+        patch("services.latex_compiler.get_http_client", return_value=sidecar),
+        pytest.raises(RuntimeError),
+    ):
+        await compile_latex_pdf(LATEX)
+    assert pdf_cache.stats()["memory"]["entries"] == 0
+
+
+async def test_redis_tier_hit_refills_memory():
+    redis = fakeredis.FakeAsyncRedis()
+    key = pdf_cache.cache_key(LATEX)
+    await redis.set("pdf:" + key, PDF, ex=600)
+    with patch("services.pdf_cache.get_redis", return_value=redis):
+        assert await pdf_cache.get_pdf(key) == PDF
+        await redis.delete("pdf:" + key)
+        assert await pdf_cache.get_pdf(key) == PDF  # from memory
+
+    assert pdf_cache.stats()["redis_hits"] == 1
+    assert pdf_cache.stats()["memory_hits"] == 1
+
+
+async def test_memory_copy_expires_after_the_cache_ttl():
+    # PRIVACY.md publishes PDF_CACHE_TTL; a quiet worker must not outlive it.
+    with patch("services.cache.time") as clock:
+        clock.monotonic.return_value = 1000.0
+        await pdf_cache.put_pdf("k", PDF)
+        clock.monotonic.return_value += pdf_cache.PDF_CACHE_TTL - 1
+        assert await pdf_cache.get_pdf("k") == PDF
+        clock.monotonic.return_value += 1
+        assert await pdf_cache.get_pdf("k") is None
+    assert pdf_cache.stats()["memory"]["entries"] == 0
+
+
+async def test_promoted_copy_keeps_the_remaining_redis_ttl():
+    redis = fakeredis.FakeAsyncRedis()
+    await redis.set("pdf:k", PDF, ex=60)
+    with (
+        patch("services.pdf_cache.get_redis", return_value=redis),
+        patch("services.cache.time") as clock,
+    ):
+        clock.monotonic.return_value = 1000.0
+        assert await pdf_cache.get_pdf("k") == PDF
+        await redis.delete("pdf:k")
+        clock.monotonic.return_value += 60
+        assert await pdf_cache.get_pdf("k") is None
+
+
+def test_memory_lru_evicts_least_recently_used_by_bytes():
+    lru = MemoryLRU(max_bytes=10)
+    lru.set("a", b"aaaa", 4)
+    lru.set("b", b"bbbb", 4)
+    lru.get("a")  # touch: "b" is now least recently used
+    lru.set("c", b"cccc", 4)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == b"aaaa"
+    assert lru.get("c") == b"cccc"
+    assert lru.stats()["bytes"] == 8
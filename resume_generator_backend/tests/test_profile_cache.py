@@ -0,0 +1,147 @@
+"""Tests for services.profile_cache: fresh hits, stale-while-revalidate,
+stale fallback when the upstream fails, per-source TTLs (fakeredis)."""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+
+from services import profile_cache, singleflight
+
+KEY = "profile:github:octocat"
+
+
+@pytest.fixture(autouse=True)
+def redis():
+    for counters in (profile_cache._counters, singleflight._counters):
+        for name in counters:
+            counters[name] = 0
+    server = fakeredis.FakeAsyncRedis()
+    with (
+        patch("services.profile_cache.get_redis", return_value=server),
+        patch("services.singleflight.get_redis", return_value=server),
+    ):
+        yield server
+
+
+async def _store(redis, data, age, **extra):
+    envelope = {"fetched_at": time.time() - age, "data": data, **extra}
+    await redis.set(KEY, json.dumps(envelope), ex=86400)
+
+
+async def _refreshed():
+    await asyncio.gather(*profile_cache._refreshes)
+
+
+async def test_miss_fetches_and_stores_an_envelope(redis):
+    fetch = AsyncMock(return_value="# Hello")
+
+    assert await profile_cache.cached_fetch("github", "octocat", fetch) == "# Hello"
+
+    envelope = json.loads(await redis.get(KEY))
+    assert envelope["data"] == "# Hello"
+    assert time.time() - envelope["fetched_at"] < 5
+    hard_ttl = profile_cache.FRESHNESS["github"].hard_ttl
+    assert hard_ttl - 5 < await redis.ttl(KEY) <= hard_ttl
+
+
+async def test_empty_result_is_not_stored(redis):
+    fetch = AsyncMock(return_value="")
+    assert await profile_cache.cached_fetch("github", "octocat", fetch) == ""
+    assert await redis.get(KEY) is None
+
+
+async def test_fresh_entry_is_served_without_fetching(redis):
+    await _store(redis, "# Cached", age=60)
+    fetch = AsyncMock(return_value="# New")
+
+    assert await profile_cache.cached_fetch("github", "octocat", fetch) == "# Cached"
+    await _refreshed()
+    fetch.assert_not_awaited()
+    assert profile_cache.stats()["fresh_hits"] == 1
+
+
+async def test_stale_entry_is_served_then_refreshed_once(redis):
+    await _store(redis, "# Old", age=45 * 60)
+
+    async def slow_new():
+        await asyncio.sleep(0.05)
+        return "# New"
+
+    fetch = AsyncMock(side_effect=slow_new)
+
+    served = await asyncio.gather(
+        *(profile_cache.cached_fetch("github", "octocat", fetch) for _ in range(3))
+    )
+    await _refreshed()
+
+    assert served == ["# Old"] * 3
+    fetch.assert_awaited_once()
+    assert json.loads(await redis.get(KEY))["data"] == "# New"
+    assert await profile_cache.cached_fetch("github", "octocat", fetch) == "# New"
+    assert profile_cache.stats()["stale_hits"] == 3
+
+
+async def test_failed_refresh_keeps_the_stale_copy_and_backs_off(redis):
+    await _store(redis, "# Old", age=45 * 60)
+    fetch = AsyncMock(return_value="")  # the fetchers' "upstream failed"
+
+    assert await profile_cache.cached_fetch("github", "octocat", fetch) == "# Old"
+    await _refreshed()
+    assert await profile_cache.cached_fetch("github", "octocat", fetch) == "# Old"
+    await _refreshed()
+
+    fetch.assert_awaited_once()  # the second stale hit is inside RETRY_AFTER
+    envelope = json.loads(await redis.get(KEY))
+    assert envelope["data"] == "# Old"
+    assert envelope["retry_at"] > time.time()
+    assert profile_cache.stats()["failed_refreshes"] == 1
+
+
+async def test_refresh_exception_is_a_failed_refresh(redis):
+    await _store(redis, "# Old", age=45 * 60)
+    fetch = AsyncMock(side_effect=RuntimeError("upstream down"))
+
+    assert await profile_cache.cached_fetch("github", "octocat", fetch) == "# Old"
+    await _refreshed()
+    assert json.loads(await redis.get(KEY))["data"] == "# Old"
+
+
+async def test_entry_past_its_hard_ttl_is_a_miss(redis):
+    await _store(redis, "# Expired", age=2 * 3600)  # Redis expiry set longer
+    fetch = AsyncMock(return_value="# New")
+
+    assert await profile_cache.cached_fetch("github", "octocat", fetch) == "# New"
+    fetch.assert_awaited_once()
+
+
+def test_ttls_are_configurable_per_source(monkeypatch):
+    monkeypatch.setenv("LINKEDIN_CACHE_SOFT_TTL", "600")
+    monkeypatch.setenv("LINKEDIN_CACHE_HARD_TTL", "7200")
+    assert profile_cache._freshness("linkedin", 43200, 86400) == (
+        profile_cache.Freshness(soft_ttl=600, hard_ttl=7200)
+    )
+    assert profile_cache._freshness("orcid", 43200, 86400).hard_ttl == 86400
+
+
+async def test_stale_linkedin_profile_outlives_a_failed_refresh(redis, monkeypatch):
+    from services.linkedin import fetch_linkedin_profile
+
+    monkeypatch.setenv("APIFY_API_TOKEN", "token")
+    url = "https://linkedin.com/in/x"
+    envelope = {"fetched_at": time.time() - 18 * 3600, "data": {"name": "X"}}
+    await redis.set(f"profile:linkedin:{url}", json.dumps(envelope))
+    apify = MagicMock()
+    apify.post = AsyncMock(return_value=MagicMock(status_code=500, text="down"))
+
+    with patch("services.linkedin.get_http_client", return_value=apify):
+        assert await fetch_linkedin_profile(url) == {"name": "X"}
+        await _refreshed()
+
+    apify.post.assert_awaited_once()  # the background refresh, which failed
+    assert json.loads(await redis.get(f"profile:linkedin:{url}"))["data"] == {
+        "name": "X"
+    }
@@ -10,8 +10,8 @@ from fastapi.testclient import TestClient
 from services.prompt import build_user_prompt
 
 
-def _async_client_returning(response=None, error=None, responses=None):
-    """Mock httpx.AsyncClient context manager.
+def _http_client_returning(response=None, error=None, responses=None):
+    """Mock shared httpx client (services.http_clients.get_http_client).
 
     `responses` is a list consumed one per GET — for fetchers that hit
     several endpoints on one client.
@@ -25,10 +25,7 @@ def _async_client_returning(response=None, error=None, responses=None):
     else:
         client.get = AsyncMock(return_value=response)
         client.post = AsyncMock(return_value=response)
-    cm = MagicMock()
-    cm.__aenter__ = AsyncMock(return_value=client)
-    cm.__aexit__ = AsyncMock(return_value=False)
-    return cm
+    return client
 
 
 def _json_response(payload, status_code=200):
@@ -45,8 +42,8 @@ def no_redis():
     `from services.cache import get_redis` binds a local reference.
     """
     with (
-        patch("services.huggingface.get_redis", side_effect=Exception("no redis")),
-        patch("services.orcid.get_redis", side_effect=Exception("no redis")),
+        patch("services.profile_cache.get_redis", side_effect=Exception("no redis")),
+        patch("services.singleflight.get_redis", side_effect=Exception("no redis")),
     ):
         yield
 
@@ -64,14 +61,14 @@ async def test_hf_happy_path_shapes_items_and_omits_empty_sections():
     datasets = [{"id": "acme/corpus", "downloads": 55, "likes": 2}]
     spaces = []  # spaces endpoint returns an empty list → key omitted
 
-    cm = _async_client_returning(
+    client = _http_client_returning(
         responses=[
             _json_response(models),
             _json_response(datasets),
             _json_response(spaces),
         ]
     )
-    with patch("httpx.AsyncClient", return_value=cm):
+    with patch("services.huggingface.get_http_client", return_value=client):
         data = await fetch_huggingface_profile("acme")
 
     assert data == {
@@ -88,10 +85,10 @@ async def test_hf_spaces_have_no_downloads_field():
     from services.huggingface import fetch_huggingface_profile
 
     spaces = [{"id": "acme/demo-space", "likes": 9}]
-    cm = _async_client_returning(
+    client = _http_client_returning(
         responses=[_json_response([]), _json_response([]), _json_response(spaces)]
     )
-    with patch("httpx.AsyncClient", return_value=cm):
+    with patch("services.huggingface.get_http_client", return_value=client):
         data = await fetch_huggingface_profile("acme")
 
     assert data == {"spaces": [{"id": "acme/demo-space", "downloads": 0, "likes": 9}]}
@@ -101,10 +98,10 @@ async def test_hf_all_empty_returns_empty_dict():
     # A nonexistent user returns empty lists (not 404) on every endpoint
     from services.huggingface import fetch_huggingface_profile
 
-    cm = _async_client_returning(
+    client = _http_client_returning(
         responses=[_json_response([]), _json_response([]), _json_response([])]
     )
-    with patch("httpx.AsyncClient", return_value=cm):
+    with patch("services.huggingface.get_http_client", return_value=client):
         assert await fetch_huggingface_profile("ghost") == {}
 
 
@@ -112,8 +109,8 @@ async def test_hf_network_error_returns_empty_dict():
     from services.huggingface import fetch_huggingface_profile
 
     with patch(
-        "httpx.AsyncClient",
-        return_value=_async_client_returning(error=httpx.ConnectError("down")),
+        "services.huggingface.get_http_client",
+        return_value=_http_client_returning(error=httpx.ConnectError("down")),
     ):
         assert await fetch_huggingface_profile("acme") == {}
 
@@ -121,28 +118,26 @@ async def test_hf_network_error_returns_empty_dict():
 async def test_hf_blank_username_skips_http_entirely():
     from services.huggingface import fetch_huggingface_profile
 
-    with patch("httpx.AsyncClient") as client_cls:
+    with patch("services.huggingface.get_http_client") as get_client:
         assert await fetch_huggingface_profile("") == {}
         assert await fetch_huggingface_profile("   ") == {}
-    client_cls.assert_not_called()
+    get_client.assert_not_called()
 
 
 async def test_hf_pasted_profile_url_is_stripped_to_username():
     from services.huggingface import fetch_huggingface_profile
 
-    cm = _async_client_returning(
+    client = _http_client_returning(
         responses=[
             _json_response([{"id": "acme/m", "downloads": 1, "likes": 0}]),
             _json_response([]),
             _json_response([]),
         ]
     )
-    with patch("httpx.AsyncClient", return_value=cm):
+    with patch("services.huggingface.get_http_client", return_value=client):
         data = await fetch_huggingface_profile("https://huggingface.co/acme/")
 
-    called_urls = [
-        call.args[0] for call in cm.__aenter__.return_value.get.call_args_list
-    ]
+    called_urls = [call.args[0] for call in client.get.call_args_list]
     assert all("author=acme" in url for url in called_urls)
     assert data["models"][0]["id"] == "acme/m"
 
@@ -258,7 +253,9 @@ async def test_orcid_happy_path_extracts_name_works_employments():
     from services.orcid import fetch_orcid_profile
 
     resp = _json_response(_orcid_record())
-    with patch("httpx.AsyncClient", return_value=_async_client_returning(resp)):
+    with patch(
+        "services.orcid.get_http_client", return_value=_http_client_returning(resp)
+    ):
         data = await fetch_orcid_profile("0000-0002-1825-0097")
 
     assert data["name"] == "Josiah Carberry"
@@ -319,7 +316,9 @@ async def test_orcid_works_capped_at_15_and_employments_at_5():
     resp = _json_response(
         _orcid_record(works_groups=works, employment_groups=employments)
     )
-    with patch("httpx.AsyncClient", return_value=_async_client_returning(resp)):
+    with patch(
+        "services.orcid.get_http_client", return_value=_http_client_returning(resp)
+    ):
         data = await fetch_orcid_profile("0000-0002-1825-0097")
 
     assert len(data["works"]) == 15
@@ -330,21 +329,21 @@ async def test_orcid_works_capped_at_15_and_employments_at_5():
 async def test_orcid_invalid_id_skips_http_entirely():
     from services.orcid import fetch_orcid_profile
 
-    with patch("httpx.AsyncClient") as client_cls:
+    with patch("services.orcid.get_http_client") as get_client:
         assert await fetch_orcid_profile("not-an-orcid") == {}
         assert await fetch_orcid_profile("") == {}
-    client_cls.assert_not_called()
+    get_client.assert_not_called()
 
 
 async def test_orcid_url_form_and_lowercase_x_normalized():
     from services.orcid import fetch_orcid_profile
 
     resp = _json_response(_orcid_record())
-    cm = _async_client_returning(resp)
-    with patch("httpx.AsyncClient", return_value=cm):
+    client = _http_client_returning(resp)
+    with patch("services.orcid.get_http_client", return_value=client):
         data = await fetch_orcid_profile("https://orcid.org/0000-0002-1825-009x")
 
-    called_url = cm.__aenter__.return_value.get.call_args.args[0]
+    called_url = client.get.call_args.args[0]
     assert called_url == "https://pub.orcid.org/v3.0/0000-0002-1825-009X/record"
     assert data["name"] == "Josiah Carberry"
 
@@ -353,7 +352,9 @@ async def test_orcid_404_returns_empty_dict():
     from services.orcid import fetch_orcid_profile
 
     resp = MagicMock(status_code=404)
-    with patch("httpx.AsyncClient", return_value=_async_client_returning(resp)):
+    with patch(
+        "services.orcid.get_http_client", return_value=_http_client_returning(resp)
+    ):
         assert await fetch_orcid_profile("0000-0002-1825-0097") == {}
 
 
@@ -383,7 +384,9 @@ async def test_orcid_record_without_name_works_or_employments_is_empty():
         },
     }
     resp = _json_response(bare)
-    with patch("httpx.AsyncClient", return_value=_async_client_returning(resp)):
+    with patch(
+        "services.orcid.get_http_client", return_value=_http_client_returning(resp)
+    ):
         assert await fetch_orcid_profile("0000-0002-1825-0097") == {}
 
 
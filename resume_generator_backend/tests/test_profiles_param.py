@@ -1,15 +1,19 @@
 """Tests for the composable profile-source rows: the `profiles` request
-param, scalar/profiles normalization, and the multi-fetch pipeline loop."""
+param, scalar/profiles normalization, and the concurrent multi-fetch stage."""
 
+import asyncio
 import json
+import time
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from core.event_types import Events
 from routers.generation import _normalize_profiles
 from schemas.resume import ProfileRef
-from services.pipeline import ResumePipeline
+from services.events import bus
+from services.pipeline import FETCH_CONCURRENCY, ResumePipeline
 
 
 @pytest.fixture
@@ -302,3 +306,143 @@ async def test_pipeline_run_stream_accepts_profiles():
     assert tokens == ["tok1", "tok2"]
     gh.assert_awaited_once_with("streamer")
     assert "--- GitHub Profile README: streamer ---" in captured["prompt"]
+
+
+async def test_pipeline_fetches_rows_concurrently_in_input_order():
+    pipe = ResumePipeline()
+    in_flight = 0
+    peak = 0
+
+    async def slow_readme(username):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # First row finishes last, so completion order != input order.
+        await asyncio.sleep(0.05 if username == "first" else 0.01)
+        in_flight -= 1
+        return f"readme of {username}"
+
+    events = []
+
+    def on_fetched(data):
+        events.append(data["id"])
+
+    bus.subscribe(Events.README_FETCHED, on_fetched)
+    gh_p, li_p, hf_p, oc_p = _fetch_patches()
+    try:
+        with gh_p as gh, li_p, hf_p, oc_p:
+            gh.side_effect = slow_readme
+            github_readmes, *_ = await pipe._fetch_profiles(
+                [("github", "first"), ("github", "second"), ("github", "third")]
+            )
+    finally:
+        bus.unsubscribe(Events.README_FETCHED, on_fetched)
+
+    assert peak == 3
+    assert [name for name, _ in github_readmes] == ["first", "second", "third"]
+    # One event per source, published as each fetch completes.
+    assert sorted(events) == ["first", "second", "third"]
+    assert events[-1] == "first"
+
+
+async def test_pipeline_caps_concurrent_fetches():
+    pipe = ResumePipeline()
+    in_flight = 0
+    peak = 0
+
+    async def slow_readme(username):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "readme"
+
+    gh_p, li_p, hf_p, oc_p = _fetch_patches()
+    with gh_p as gh, li_p, hf_p, oc_p:
+        gh.side_effect = slow_readme
+        await pipe._fetch_profiles([("github", f"user{i}") for i in range(10)])
+
+    assert gh.await_count == 10
+    assert peak == FETCH_CONCURRENCY
+
+
+async def test_pipeline_failing_fetcher_does_not_sink_other_rows():
+    pipe = ResumePipeline()
+    gh_p, li_p, hf_p, oc_p = _fetch_patches()
+    with gh_p as gh, li_p as li, hf_p, oc_p:
+        gh.return_value = "readme"
+        li.side_effect = RuntimeError("apify exploded")
+        github_readmes, linkedin_profiles, _, _ = await pipe._fetch_profiles(
+            [("linkedin", "https://linkedin.com/in/x"), ("github", "octo")]
+        )
+
+    assert github_readmes == [("octo", "readme")]
+    assert linkedin_profiles == []
+
+
+async def test_pipeline_fetch_deadline_builds_prompt_from_partial_results():
+    pipe = ResumePipeline()
+
+    async def stuck_linkedin(url):
+        await asyncio.sleep(30)  # Apify polling, far past the budget
+        return {"fullname": "Never Arrives"}
+
+    dropped_events = []
+    bus.subscribe(Events.PROFILES_DROPPED, dropped_events.append)
+    gh_p, li_p, hf_p, oc_p = _fetch_patches()
+    try:
+        with (
+            gh_p as gh,
+            li_p as li,
+            hf_p,
+            oc_p,
+            patch(
+                "services.pipeline.generate_resume_content", new_callable=AsyncMock
+            ) as gen,
+        ):
+            gh.return_value = "fast readme"
+            li.side_effect = stuck_linkedin
+            gen.return_value = "RESUME"
+
+            started = time.monotonic()
+            await pipe.run(
+                profiles=[
+                    {"type": "linkedin", "value": "https://linkedin.com/in/slow"},
+                    {"type": "github", "value": "quick"},
+                ],
+                demo=False,
+                fetch_deadline=0.1,
+            )
+            elapsed = time.monotonic() - started
+    finally:
+        bus.unsubscribe(Events.PROFILES_DROPPED, dropped_events.append)
+
+    assert elapsed < 5
+    user_prompt = gen.await_args.args[0]
+    assert "fast readme" in user_prompt
+    assert "Never Arrives" not in user_prompt
+    assert dropped_events == [
+        {
+            "deadline": 0.1,
+            "sources": [{"source": "linkedin", "id": "https://linkedin.com/in/slow"}],
+        }
+    ]
+
+
+async def test_pipeline_no_dropped_event_when_every_source_beats_deadline():
+    pipe = ResumePipeline()
+    dropped_events = []
+    bus.subscribe(Events.PROFILES_DROPPED, dropped_events.append)
+    gh_p, li_p, hf_p, oc_p = _fetch_patches()
+    try:
+        with gh_p as gh, li_p, hf_p, oc_p:
+            gh.return_value = "readme"
+            github_readmes, *_ = await pipe._fetch_profiles(
+                [("github", "octo")], deadline=5
+            )
+    finally:
+        bus.unsubscribe(Events.PROFILES_DROPPED, dropped_events.append)
+
+    assert github_readmes == [("octo", "readme")]
+    assert dropped_events == []
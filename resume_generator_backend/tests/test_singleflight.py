@@ -0,0 +1,136 @@
+"""Tests for services.singleflight: concurrent misses for one key share a
+single upstream fetch, in-process and across workers (fakeredis)."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+
+from services import singleflight
+
+
+@pytest.fixture(autouse=True)
+def fresh_counters():
+    for name in singleflight._counters:
+        singleflight._counters[name] = 0
+    yield
+    singleflight._inflight.clear()
+
+
+@pytest.fixture
+def redis():
+    server = fakeredis.FakeAsyncRedis()
+    with patch("services.singleflight.get_redis", return_value=server):
+        yield server
+
+
+def _slow_fetch(value, delay=0.05):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return fetch, calls
+
+
+async def test_concurrent_callers_share_one_fetch_without_redis():
+    fetch, calls = _slow_fetch({"name": "octocat"})
+    with patch("services.singleflight.get_redis", side_effect=Exception("down")):
+        results = await asyncio.gather(
+            *(singleflight.run("github:octocat", fetch) for _ in range(10))
+        )
+
+    assert results == [{"name": "octocat"}] * 10
+    assert len(calls) == 1
+    stats = singleflight.stats()
+    assert (stats["fetches"], stats["joined"], stats["inflight"]) == (1, 9, 0)
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_fetch():
+    fetch, calls = _slow_fetch("readme")
+    with patch("services.singleflight.get_redis", side_effect=Exception("down")):
+        first = asyncio.ensure_future(singleflight.run("github:x", fetch))
+        second = asyncio.ensure_future(singleflight.run("github:x", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "readme"
+    assert len(calls) == 1
+
+
+async def test_workers_share_one_fetch_through_redis(redis):
+    # Two workers: each runs its own flight; only the lock holder fetches.
+    fetch, calls = _slow_fetch({"headline": "Engineer"}, delay=0.2)
+    results = await asyncio.gather(
+        singleflight._fetch_shared("linkedin:u", fetch, 5),
+        singleflight._fetch_shared("linkedin:u", fetch, 5),
+    )
+
+    assert results == [{"headline": "Engineer"}] * 2
+    assert len(calls) == 1
+    assert singleflight.stats()["remote_results"] == 1
+    assert await redis.get("singleflight:lock:linkedin:u") is None
+
+
+async def test_late_waiter_reads_the_kept_result(redis):
+    fetch, calls = _slow_fetch("readme")
+    assert await singleflight._fetch_shared("github:y", fetch, 5) == "readme"
+    await redis.set("singleflight:lock:github:y", "other-worker")
+
+    assert await singleflight._fetch_shared("github:y", fetch, 5) == "readme"
+    assert len(calls) == 1
+
+
+async def test_dead_holder_times_out_and_fetches_itself(redis):
+    await redis.set("singleflight:lock:orcid:z", "killed-worker")
+    fetch, calls = _slow_fetch({"name": "Z"})
+
+    assert await singleflight._fetch_shared("orcid:z", fetch, 0.3) == {"name": "Z"}
+    assert len(calls) == 1
+    assert singleflight.stats()["remote_timeouts"] == 1
+
+
+async def test_failed_holder_fails_its_waiters_without_refetching(redis):
+    async def broken():
+        await asyncio.sleep(0.1)
+        raise RuntimeError("upstream down")
+
+    fetch, calls = _slow_fetch({"name": "W"})
+    holder = asyncio.ensure_future(singleflight._fetch_shared("hf:w", broken, 5))
+    await asyncio.sleep(0.01)
+    waiters = await asyncio.gather(
+        *(singleflight._fetch_shared("hf:w", fetch, 5) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    with pytest.raises(RuntimeError):
+        await holder
+    assert all(isinstance(w, singleflight.HolderFailed) for w in waiters)
+    assert "upstream down" in str(waiters[0])
+    assert calls == []
+    assert singleflight.stats()["remote_failures"] == 3
+    assert await redis.get("singleflight:lock:hf:w") is None
+
+
+async def test_concurrent_github_misses_make_one_request():
+    from services.github import fetch_github_readme
+
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        return MagicMock(status_code=200, text="# Hi")
+
+    client = MagicMock()
+    client.get = AsyncMock(side_effect=slow_get)
+    with (
+        patch("services.profile_cache.get_redis", side_effect=Exception("no redis")),
+        patch("services.singleflight.get_redis", side_effect=Exception("no redis")),
+        patch("services.github.get_http_client", return_value=client),
+    ):
+        results = await asyncio.gather(
+            *(fetch_github_readme("octocat") for _ in range(5))
+        )
+
+    assert results == ["# Hi"] * 5
+    assert client.get.await_count == 1